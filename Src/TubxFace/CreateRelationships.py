@@ -4,113 +4,108 @@
 '''
 
 from maya import cmds
+import maya.OpenMaya as om
 
-def createRelationships(RelationShipList, mainMesh, otherMesh):
+import MeshTopology
+reload(MeshTopology)
+from TubxFaceCore import RelationshipHashing
+reload(RelationshipHashing)
+
+def getBorderPositions(mesh):
+  """
+  This function gets the border vertices of a mesh and the positions they are in
+  Args:
+    mesh: The mesh to get the border vertices of
+
+  Returns: The list of border vertex indices and the list of their [x, y, z] positions
+
+  """
+  # The border vertices come from the topology cache, and their positions from a single query
+  topology = MeshTopology.getTopology(mesh)
+  if len(topology.borderVertices) == 0:
+    return [], []
+  positions = MeshTopology.getPositions(mesh)
+  return topology.borderVertices.tolist(), positions[topology.borderVertices].tolist()
+
+def createRelationships(RelationShipList, mainMesh, otherMesh, registeredChildren = None, borders = None):
   """
   This functions takes the main mesh and another mesh and compare matching vertices.
   If a vertex of the mainMesh is the same as the otherMesh, we add it to the RelationShipList
-  The vertex of the mainMesh becomes the child
+  The vertex of the mainMesh becomes the child. Each relationship is stored as [(childMesh, childIndex), (parentMesh, parentIndex)]
   Args:
     RelationShipList: The list to store all the vertex relationships
     mainMesh: The main mesh is the mesh we want to check matching vertex with
     otherMesh: The other mesh to check against the main mesh
+    registeredChildren: The set of child vertices already in the RelationShipList. It is updated with the new children.
+                        If not given, it is made from the RelationShipList
+    borders: The border vertices and positions of each mesh, keyed by the mesh name. If not given, they are read from the scene
   """
+  if registeredChildren is None:
+    registeredChildren = set(relationship[0] for relationship in RelationShipList)
 
-  # We first get a list of border edges the mainMesh has
-  cmds.select(mainMesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  MainBorderEdges = cmds.ls(sl=True)
-  MainBorderEdges = cmds.filterExpand(MainBorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # We then convert these edges to vertices
-  MainBorderVert = cmds.polyListComponentConversion(fe=True, tv=True)
-  MainBorderVert = cmds.filterExpand(MainBorderVert, ex=True, sm=31)
-
-  # With the vertices that we got, we get the position they are in
-  MainBorderPosition = []
-
-  for vert in MainBorderVert:
-    position = cmds.xform(vert, q=True, t=True, ws=True)
-    #Remove Maya's annoying exponential which is basically 0
-    if "e" in str(position[0]):
-      position[0] = 0.0
-    if "e" in str(position[1]):
-      position[1] = 0.0
-    if "e" in str(position[2]):
-      position[2] = 0.0
-    MainBorderPosition.append([vert, position])
-
-
-  # We then get a list of the border edges of the other mesh
-  cmds.select(otherMesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  OtherBorderEdges = cmds.ls(sl=True)
-  OtherBorderEdges = cmds.filterExpand(OtherBorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # We then convert these edges to vertices
-  OtherBorderVert = cmds.polyListComponentConversion(fe=True, tv=True)
-  OtherBorderVert = cmds.filterExpand(OtherBorderVert, ex=True, sm=31)
-
-  # With the vertices that we got, we get the position they are in
-  OtherBorderPosition = []
-
-  for vert in OtherBorderVert:
-    position = cmds.xform(vert, q=True, t=True, ws=True)
-    # Remove Maya's annoying exponential which is basically 0
-    if "e" in str(position[0]):
-      position[0] = 0.0
-    if "e" in str(position[1]):
-      position[1] = 0.0
-    if "e" in str(position[2]):
-      position[2] = 0.0
-    OtherBorderPosition.append([vert, position])
+  if borders is None:
+    MainBorderVert, MainBorderPosition = getBorderPositions(mainMesh)
+    OtherBorderVert, OtherBorderPosition = getBorderPositions(otherMesh)
+  else:
+    MainBorderVert, MainBorderPosition = borders[mainMesh]
+    OtherBorderVert, OtherBorderPosition = borders[otherMesh]
 
+  # We put the positions of the other mesh into a grid, so each vertex of the main mesh only looks at the few
+  # vertices around it. Comparing within a tolerance also takes care of Maya's tiny values which are basically 0
+  OtherCells = RelationshipHashing.hashPositions(OtherBorderVert, OtherBorderPosition)
 
   # We then compare the positions. If they match, we get the matching vertices and create a relationship
-  MatchVertices = []
-  for i in range(0, len(MainBorderPosition)):
-    similar = 0
-    for j in range(0, len(OtherBorderPosition)):
-      if MainBorderPosition[i][1] == OtherBorderPosition[j][1]:
-        if checkUniqueChild(RelationShipList, MainBorderPosition[i][0]) == 1:
-          MatchVertices.append([MainBorderPosition[i][0], OtherBorderPosition[j][0]])
-
-  for i in MatchVertices:
-    RelationShipList.append(i)
+  for vert, position in zip(MainBorderVert, MainBorderPosition):
+    child = (mainMesh, vert)
+    if child in registeredChildren:
+      continue
+    match = RelationshipHashing.findMatchingVertex(OtherCells, position)
+    if match is not None:
+      RelationShipList.append([child, (otherMesh, match)])
+      registeredChildren.add(child)
 
 def findRelationships(RelationShipList):
   """
   This function allows the child vertices to find the parent vertices
   Args:
-    RelationShipList: The relationship list
+    RelationShipList: The relationship list of [(childMesh, childIndex), (parentMesh, parentIndex)]
   """
-  for i in RelationShipList:
-    getPos = cmds.xform(i[1], q=True, t=True, ws=True)
-    cmds.xform(i[0], t=getPos, ws=True)
-
-def checkUniqueChild(RelationShipList, child):
+  # We read the points of every mesh once, move the children in memory and write each changed mesh back once.
+  # The relationships are still applied in order, so a parent that was moved as a child before passes on its new position
+  meshPoints = {}
+  changedMeshes = set()
+  for child, parent in RelationShipList:
+    # A vertex that is its own parent does not move
+    if child == parent:
+      continue
+    for mesh in (child[0], parent[0]):
+      if mesh not in meshPoints:
+        meshPoints[mesh] = getMeshPoints(mesh)
+    meshPoints[child[0]].set(meshPoints[parent[0]][parent[1]], child[1])
+    changedMeshes.add(child[0])
+
+  for mesh in changedMeshes:
+    MeshTopology.getMeshFn(mesh).setPoints(meshPoints[mesh], om.MSpace.kWorld)
+
+def getMeshPoints(mesh):
   """
-  This function checks if the child vertex has been registered before in the relationship list
+  This function reads the world positions of all the vertices of a mesh in one call
   Args:
-    RelationShipList: The relationship list to check
-    child: The child to check
+    mesh: The name of the mesh
+
+  Returns: The MPointArray of vertex positions
 
-  Returns: Returns 1 of unique and 0 if not.
   """
-  if not RelationShipList:
-    return 1
-  for i in RelationShipList:
-    if i[0] == child:
-      return 0
-  return 1
-
-def meshRelationships(Objects):
+  points = om.MPointArray()
+  MeshTopology.getMeshFn(mesh).getPoints(points, om.MSpace.kWorld)
+  return points
+
+def meshRelationships(Objects, borders = None):
   """
   This function checks through the objects in the scene and creates the relationship list
   Args:
     Objects: The mesh parts of the face mesh
+    borders: The border vertices and positions of each mesh part, keyed by the part name. If not given, they are read from the scene
 
   Returns: The relationship List
 
@@ -130,6 +125,8 @@ def meshRelationships(Objects):
 
   # Create the relationshipList
   relationshipList = []
+  # The child vertices that already have a parent
+  registeredChildren = set()
 
   for forehead in Objects:
     if "TubxForehead_geo_" in forehead:
@@ -139,95 +136,95 @@ def meshRelationships(Objects):
     if "TubxNoseBridge_geo_" in noseBridge:
       noseBridgeVariable.append(noseBridge)
       for forehead in foreheadVariable:
-        createRelationships(relationshipList, noseBridge, forehead)
+        createRelationships(relationshipList, noseBridge, forehead, registeredChildren, borders)
 
   for eye in Objects:
     if "TubxEye_geo_" in eye:
       eyeVariable.append(eye)
       for forehead in foreheadVariable:
-        createRelationships(relationshipList, eye, forehead)
+        createRelationships(relationshipList, eye, forehead, registeredChildren, borders)
       for noseBridge in noseBridgeVariable:
-        createRelationships(relationshipList, eye, noseBridge)
+        createRelationships(relationshipList, eye, noseBridge, registeredChildren, borders)
 
   for nose in Objects:
     if "TubxNose_geo_" in nose:
       noseVariable.append(nose)
       for noseBridge in noseBridgeVariable:
-        createRelationships(relationshipList, nose, noseBridge)
+        createRelationships(relationshipList, nose, noseBridge, registeredChildren, borders)
 
   for mouthLoop in Objects:
     if "TubxMouthLoop_geo_" in mouthLoop:
       mouthLoopVariable.append(mouthLoop)
       for nose in noseVariable:
-        createRelationships(relationshipList, mouthLoop, nose)
+        createRelationships(relationshipList, mouthLoop, nose, registeredChildren, borders)
 
   for mouth in Objects:
     if "TubxMouth_geo_" in mouth:
       mouthVariable.append(mouth)
       for mouthLoop in mouthLoopVariable:
-        createRelationships(relationshipList, mouth, mouthLoop)
+        createRelationships(relationshipList, mouth, mouthLoop, registeredChildren, borders)
 
   for cheek in Objects:
     if "TubxCheek_geo_" in cheek:
       cheekVariable.append(cheek)
       for mouthLoop in mouthLoopVariable:
-        createRelationships(relationshipList, cheek, mouthLoop)
+        createRelationships(relationshipList, cheek, mouthLoop, registeredChildren, borders)
 
   for chin in Objects:
     if "TubxChin_geo_" in chin:
       chinVariable.append(chin)
       for mouthLoop in mouthLoopVariable:
-        createRelationships(relationshipList, chin, mouthLoop)
+        createRelationships(relationshipList, chin, mouthLoop, registeredChildren, borders)
       for cheek in cheekVariable:
-        createRelationships(relationshipList, chin, cheek)
+        createRelationships(relationshipList, chin, cheek, registeredChildren, borders)
 
   for ear in Objects:
     if "TubxEar_geo_" in ear:
       earVariable.append(ear)
       for forehead in foreheadVariable:
-        createRelationships(relationshipList, ear, forehead)
+        createRelationships(relationshipList, ear, forehead, registeredChildren, borders)
       for cheek in cheekVariable:
-        createRelationships(relationshipList, ear, cheek)
+        createRelationships(relationshipList, ear, cheek, registeredChildren, borders)
 
   for backhead in Objects:
     if "TubxBackHead_geo_" in backhead:
       backHeadVariable.append(backhead)
       for forehead in foreheadVariable:
-        createRelationships(relationshipList, backhead, forehead)
+        createRelationships(relationshipList, backhead, forehead, registeredChildren, borders)
       for ear in earVariable:
-        createRelationships(relationshipList, backhead, ear)
+        createRelationships(relationshipList, backhead, ear, registeredChildren, borders)
 
   for lowerbackhead in Objects:
     if "TubxLowerBackHead_geo_" in lowerbackhead:
       lowerBackHeadVariable.append(lowerbackhead)
       for ear in earVariable:
-        createRelationships(relationshipList, lowerbackhead, ear)
+        createRelationships(relationshipList, lowerbackhead, ear, registeredChildren, borders)
       for backhead in backHeadVariable:
-        createRelationships(relationshipList, lowerbackhead, backhead)
+        createRelationships(relationshipList, lowerbackhead, backhead, registeredChildren, borders)
 
   for default in Objects:
     for forehead in foreheadVariable:
-      createRelationships(relationshipList, default, forehead)
+      createRelationships(relationshipList, default, forehead, registeredChildren, borders)
     for noseBridge in noseBridgeVariable:
-      createRelationships(relationshipList, default, noseBridge)
+      createRelationships(relationshipList, default, noseBridge, registeredChildren, borders)
     for nose in noseVariable:
-      createRelationships(relationshipList,default,nose)
+      createRelationships(relationshipList, default, nose, registeredChildren, borders)
     for eye in eyeVariable:
-      createRelationships(relationshipList, default, eye)
+      createRelationships(relationshipList, default, eye, registeredChildren, borders)
     for mouthLoop in mouthLoopVariable:
-      createRelationships(relationshipList, default, mouthLoop)
+      createRelationships(relationshipList, default, mouthLoop, registeredChildren, borders)
     for mouth in mouthVariable:
-      createRelationships(relationshipList, default, mouth)
+      createRelationships(relationshipList, default, mouth, registeredChildren, borders)
     for cheek in cheekVariable:
-      createRelationships(relationshipList, default, cheek)
+      createRelationships(relationshipList, default, cheek, registeredChildren, borders)
     for chin in chinVariable:
-      createRelationships(relationshipList, default, chin)
+      createRelationships(relationshipList, default, chin, registeredChildren, borders)
     for ear in earVariable:
-      createRelationships(relationshipList, default, ear)
+      createRelationships(relationshipList, default, ear, registeredChildren, borders)
     for backhead in backHeadVariable:
-      createRelationships(relationshipList, default, backhead)
+      createRelationships(relationshipList, default, backhead, registeredChildren, borders)
     for lowerbackhead in lowerBackHeadVariable:
-      createRelationships(relationshipList, default, lowerbackhead)
+      createRelationships(relationshipList, default, lowerbackhead, registeredChildren, borders)
 
   return relationshipList
 
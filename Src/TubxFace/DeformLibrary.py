@@ -5,10 +5,15 @@
 
 from maya import cmds
 import math
+import numpy as np
 import maya.mel as mel
 
 import CreateRelationships
 reload(CreateRelationships)
+from TubxFaceCore import ScanResult
+reload(ScanResult)
+from TubxFaceCore import CurveAlignment
+reload(CurveAlignment)
 
 def reverseName(locatorGroup, name):
   """
@@ -61,23 +66,6 @@ def getDistance(currentPos, deformPos):
   distance = math.sqrt(distance)
   return distance
 
-def bubblesort(list, indexlist):
-  """
-  This function bubblesorts a list and alters a reference indexlist at the same time
-  Args:
-    list: The list to bubblesort the results with
-    indexlist: The indexlist which gets bubblesorted according to the list
-  """
-  for i in range(len(list)-1, 0, -1):
-    for j in range(i):
-      if list[j] > list[j+1]:
-        temp = list[j]
-        tempIndex = indexlist[j]
-        list[j] = list[j+1]
-        indexlist[j] = indexlist[j+1]
-        list[j+1] = temp
-        indexlist[j+1] = tempIndex
-
 def getLocators(locatorGroup):
   """
   This function separates out the locators into its separate groups depending on which
@@ -142,94 +130,51 @@ def grpLocators(points, index, coordName, coordGrpName):
   CurrentGroup = cmds.group(n=coordGrpName)
   return CurrentGroup
 
-def crossProduct (centerPoint, pointA, pointB):
+def getDeformGroups(scanData, name, points, coordGrpName):
   """
-  The cross product between 2D vectors is used to check if a rotation is clockwise or anti-clockwise
+  This function splits the deformation points of a body part into its separate groups of points
   Args:
-    centerPoint: The center point of the points to check. This represents the origin
-    pointA: The point it start out
-    pointB: The point it end up
+    scanData: The locator group of the scan, or the ScanResult of the scan
+    name: The name of the body part
+    points: The number of points representing each group
+    coordGrpName: The name of the group of coordinates when the scan is a locator group
 
-  Returns: A boolean depending on whether it is clockwise or anti-clockwise.
-  """
+  Returns: The list of locator groups, or the list of (points, 3) arrays for a ScanResult
 
-  # To check a circle direction, we use the cross product between the centerPoint to A and centerPoint to B
-  a = centerPoint
-  b = pointA
-  c = pointB
+  """
+  if isinstance(scanData, ScanResult.ScanResult):
+    allPoints = scanData.getPoints(name)
+    return [allPoints[i:i + points] for i in range(0, len(allPoints) - points + 1, points)]
 
-  u = [(b[0] - a[0]), (b[1] - a[1]), (b[2] - a[2])]
-  v = [(c[0] - a[0]), (c[1] - a[1]), (c[2] - a[2])]
+  coordName = "%s_Coord" % name
+  locators = [locator for locator in cmds.listRelatives(scanData) if coordName in locator]
+  return [grpLocators(points, i, coordName, coordGrpName) for i in range(0, len(locators), points)]
 
-  #CrossProduct = (u[1] * v[2] - u[2] * v[1]) + (u[2] * v[0] - u[0] * v[2]) + (u[0] * v[1] - u[1] * v[0])
-  #print "3DCross is ", CrossProduct
+def getDeformPositions(DeformLocatorsGrp):
+  """
+  This function reads the positions of the deformation points once so the deformation works on plain data
+  Args:
+    DeformLocatorsGrp: The group of deformation locators, or an (N, 3) array of deformation points
 
-  # We use the 2D Cross Product to get the clockwise or anti-clockwise direction
-  CrossProduct = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
-  #print "2DCross is ", CrossProduct
+  Returns: The list of [x, y, z] positions
 
-  if CrossProduct > 0:
-    return 0
-  elif CrossProduct < 0:
-    return 1
-  elif CrossProduct == 0:
-    print "circular direction cross product is zero. Vectors are parallel"
-    return
+  """
+  if isinstance(DeformLocatorsGrp, basestring):
+    return [cmds.xform(locator, q=True, t=True, ws=True) for locator in cmds.listRelatives(DeformLocatorsGrp)]
+  return [[float(position[0]), float(position[1]), float(position[2])] for position in DeformLocatorsGrp]
 
-def checkCircularClockwise(CtrlCurve,DeformLocatorsGrp, points):
+def getCurvePoints(CtrlCurve, points):
   """
-  This function is a combination of various functions
-  It takes in the ctrls and locators and check whether they are in the same direction using the
-  crossProduct function. If they are not, it would reverse the deformation points using the
-  reverseName function.
+  This function reads the positions of the edit points of a control curve in one query
   Args:
     CtrlCurve: The control curve
-    DeformLocatorsGrp: The deformation points
-    points: The number of points that represents a body part
+    points: The number of edit points to read
 
-  Returns: A list of the corrected deform locators
+  Returns: The (points, 3) array of edit point positions
 
   """
-  # We first have to analyse the control curve
-  controlPosList = []
-  for i in range(0, points):
-    ctrlPos = cmds.xform("%s.ep[%s]" % (CtrlCurve, i), q=True, t=True)
-    controlPosList.append([i, ctrlPos])
-
-  # We then get the middle X value of the curve
-  cmds.xform(CtrlCurve, cp=True)
-  middlePoint = cmds.xform(CtrlCurve, rp=True, q=True)
-
-  # We check if the ctrl curve is moving clockwise or anti-clockwise
-  CtrlClockwise = crossProduct(middlePoint, controlPosList[0][1], controlPosList[1][1])
-
-  # We repeat the process for the DeformLocators
-  # We first analyse the deform locators
-  DeformLocators = cmds.listRelatives(DeformLocatorsGrp)
-  # This is to get the name in case we have to reverse the direction of the controls
-  nameCoord = DeformLocators[0].rstrip('0123456789')
-  deformPosList = []
-  for i in range(0, points):
-    deformPos = cmds.xform(DeformLocators[i], q=True, t=True)
-    deformPosList.append([i, deformPos])
-  # We then get the middle X value of the locators
-  cmds.xform(DeformLocatorsGrp, cp=True)
-  middlePoint = cmds.xform(DeformLocatorsGrp, rp=True, q=True)
-
-  # We check if the deform curve is moving clockwise or anti-clockwise
-  DeformClockwise = crossProduct(middlePoint, deformPosList[0][1], deformPosList[1][1])
-
-  print "CtrlClockwise is %s and DeformClockwise is %s" % (CtrlClockwise,DeformClockwise)
-
-
-  # If the deform points are not in the same direction and the ctrl points, we reverse the deform
-  if DeformClockwise != CtrlClockwise:
-    print "Circle Control and deformation are going in opposite direction"
-    print "Reversing Deformations"
-    DeformLocators = reverseName(DeformLocatorsGrp, nameCoord)
-
-  # After this stage, the deformation locators are in the correct direction. So we return the DeformationLocators
-  return DeformLocators
+  positions = cmds.xform("%s.ep[0:%s]" % (CtrlCurve, points - 1), q=True, t=True, ws=True)
+  return np.array(positions, dtype=np.float64).reshape((-1, 3))
 
 def getCircularStartPoints(CtrlCurve,DeformLocatorsGrp, points):
   """
@@ -237,96 +182,16 @@ def getCircularStartPoints(CtrlCurve,DeformLocatorsGrp, points):
   for circular shapes
   Args:
     CtrlCurve: The control curve
-    DeformLocatorsGrp: The deformation points
+    DeformLocatorsGrp: The deformation points, as a locator group or an (N, 3) array
     points: The number of points that represents a body part
 
-  Returns: The control start point, the deformation start point, the revised locator list
+  Returns: The control start point, the deformation start point, the revised deform positions
 
   """
-  DeformLocators = cmds.listRelatives(DeformLocatorsGrp)
-  print "Before ", CtrlCurve
-  print DeformLocators
-  # We first check and if necessary rearrange the deform locators to match the control curve direction
-  DeformLocators = checkCircularClockwise(CtrlCurve, DeformLocatorsGrp, points)
-  print "After ", CtrlCurve
-  print DeformLocators
-
-  # We then analyse the control curve
-  controlPosList = []
-  for i in range(0, points):
-    ctrlPos = cmds.xform("%s.ep[%s]" % (CtrlCurve, i), q=True, t=True)
-    controlPosList.append([i, ctrlPos])
-
-  # We then get the middle X value of the curve
-  cmds.xform(CtrlCurve, cp=True)
-  middlePoint = cmds.xform(CtrlCurve, rp=True, q=True)
-  midX = middlePoint[0]
-
-  # Using the information we gathered from the ep pos, we find points closest to midX
-  closestMidX = []
-  closestMidIndex = []
-  for i in range(0, points):
-    distance = math.fabs(controlPosList[i][1][0] - midX)
-    closestMidX.append(distance)
-    closestMidIndex.append(controlPosList[i][0])
-  bubblesort(closestMidX, closestMidIndex)
-
-  # With the information we have, we find which points are above and which points are below
-  YValueList = []
-  YValueIndex = []
-  for i in range(0, points / 2):
-    YValueList.append(controlPosList[closestMidIndex[i]][1][1])
-    YValueIndex.append(closestMidIndex[i])
-  bubblesort(YValueList, YValueIndex)
-
-  # Lastly, as we know its direction of movement, we compare the bottom 2 points to see which is further on the left
-  if YValueIndex[0] == points - 1:
-    controlStart = YValueIndex[0]
-  elif YValueIndex[1] == points - 1:
-    controlStart = YValueIndex[1]
-  elif YValueIndex[0] < YValueIndex[1]:
-    controlStart = YValueIndex[0]
-  elif YValueIndex[1] < YValueIndex[0]:
-    controlStart = YValueIndex[1]
-
-  # We repeat the process for the DeformLocators
-  # We first analyse the deform locators
-  deformPosList = []
-  for i in range(0, points):
-    deformPos = cmds.xform(DeformLocators[i], q=True, t=True)
-    deformPosList.append([i, deformPos])
-  # We then get the middle X value of the locators
-  cmds.xform(DeformLocatorsGrp, cp=True)
-  middlePoint = cmds.xform(DeformLocatorsGrp, rp=True, q=True)
-  midX = middlePoint[0]
-
-
-  # Using the information we gathered from the locator pos, we find points closest to midX
-  closestMidX = []
-  closestMidIndex = []
-  for i in range(0, points):
-    distance = math.fabs(deformPosList[i][1][0] - midX)
-    closestMidX.append(distance)
-    closestMidIndex.append(deformPosList[i][0])
-  bubblesort(closestMidX, closestMidIndex)
-  # With the information we have, we find which points are above and which points are below
-  YValueList = []
-  YValueIndex = []
-  for i in range(0, points / 2):
-    YValueList.append(deformPosList[closestMidIndex[i]][1][1])
-    YValueIndex.append(closestMidIndex[i])
-  bubblesort(YValueList, YValueIndex)
-  # Lastly, as we know it moves in an anti-clockwise fashion, we compare the bottom 2 locators to see which is further on the left
-  if YValueIndex[0] == points - 1:
-    deformStart = YValueIndex[0]
-  elif YValueIndex[1] == points - 1:
-    deformStart = YValueIndex[1]
-  elif YValueIndex[0] < YValueIndex[1]:
-    deformStart = YValueIndex[0]
-  elif YValueIndex[1] < YValueIndex[0]:
-    deformStart = YValueIndex[1]
-
-  return controlStart, deformStart, DeformLocators
+  controlRing = getCurvePoints(CtrlCurve, points)
+  DeformPositions = getDeformPositions(DeformLocatorsGrp)[:points]
+  deformRing, deformStart = CurveAlignment.alignRings(controlRing, DeformPositions)
+  return 0, deformStart, deformRing.tolist()
 
 def deformEye(CtrlCurve, DeformLocatorsGrp, points):
   """
@@ -355,7 +220,7 @@ def deformEye(CtrlCurve, DeformLocatorsGrp, points):
       break
 
     print "Control move from %s.ep[%s] to %s" % (CtrlCurve, controlStart, DeformLocators[deformStart])
-    toMove = cmds.xform(DeformLocators[deformStart], q=True, t=True, ws=True)
+    toMove = DeformLocators[deformStart]
     cmds.xform("%s.ep[%s]" % (CtrlCurve,controlStart), t = toMove, ws=True)
 
     controlStart +=1
@@ -388,7 +253,7 @@ def deformEar(CtrlCurve, DeformLocatorsGrp):
       print "There is a coding error in the deform library deform Ear"
       break
 
-    toMove = cmds.xform(DeformLocators[deformStart], q=True, t=True, ws=True)
+    toMove = DeformLocators[deformStart]
     cmds.xform("%s.ep[%s]" % (CtrlCurve, controlStart), t=toMove, ws=True)
 
     controlStart += 1
@@ -418,7 +283,7 @@ def deformMouth(CtrlCurve, DeformLocatorsGrp, points):
       print "There is a coding error in the deform library deform Mouth"
       break
 
-    toMove = cmds.xform(DeformLocators[deformStart], q=True, t=True, ws=True)
+    toMove = DeformLocators[deformStart]
     cmds.xform("%s.ep[%s]" % (CtrlCurve,controlStart), t = toMove, ws=True)
 
     controlStart +=1
@@ -488,7 +353,7 @@ def deformMouthLoop(CtrlCurve, DeformLocatorsGrp, points):
       print "There is a coding error in the deform library deform MouthLoop"
       break
 
-    toMove = cmds.xform(DeformLocators[deformStart], q=True, t=True, ws=True)
+    toMove = DeformLocators[deformStart]
     cmds.xform("%s.ep[%s]" % (CtrlCurve, controlStart), t=toMove, ws=True)
 
     controlStart += 1
@@ -519,7 +384,7 @@ def deformNose(CtrlCurve, DeformLocatorsGrp, points):
       print "There is a coding error in the deform library deform Nose"
       break
 
-    toMove = cmds.xform(DeformLocators[deformStart], q=True, t=True, ws=True)
+    toMove = DeformLocators[deformStart]
     cmds.xform("%s.ep[%s]" % (CtrlCurve, controlStart), t=toMove, ws=True)
 
     controlStart += 1
@@ -550,7 +415,7 @@ def deformNoseBridge(CtrlCurve, DeformLocatorsGrp, points):
       print "There is a coding error in the deform library deform NoseBridge"
       break
 
-    toMove = cmds.xform(DeformLocators[deformStart], q=True, t=True, ws=True)
+    toMove = DeformLocators[deformStart]
     cmds.xform("%s.ep[%s]" % (CtrlCurve, controlStart), t=toMove, ws=True)
 
     controlStart += 1
@@ -591,7 +456,7 @@ def deformEyebrow(CtrlCurve, DeformLocatorsGrp, points):
     weightList = [1.0, 1.0, 1.0, 1.0, 0.7, 0.5, 0.3, 0.0,
                   0.0, 0.3, 0.5, 0.7, 1.0, 1.0, 1.0, 1.0]
 
-    toMove = cmds.xform(DeformLocators[deformStart], q=True, t=True, ws=True)
+    toMove = DeformLocators[deformStart]
     currentPos = cmds.xform("%s.ep[%s]" % (CtrlCurve, controlStart), q=True, t=True, ws=True)
     #using linear interpolation x = (t)(x1) + (1-t)(x2)
     t = weightList[controlStart]
@@ -604,68 +469,89 @@ def deformEyebrow(CtrlCurve, DeformLocatorsGrp, points):
     controlStart += 1
     deformStart += 1
 
-def deformSideProfile(points = 4):
+def deformProfileCurves(ProfileCurves, DeformPositions, points, optimal):
+  """
+  This function moves the edit points of the profile curves to the closest profile deformation points.
+  No two edit points of the same curve move to the same deformation point
+  Args:
+    ProfileCurves: The list of profile curves
+    DeformPositions: The list of [x, y, z] profile deformation positions
+    points: the number of points to deform
+    optimal: If set, the edit points of each curve are matched together for the lowest summed distance.
+             Otherwise each edit point takes the closest deformation point left, in order
+  """
+  targetPoints = np.array(DeformPositions, dtype=np.float64).reshape((-1, 3))
+  for curve in ProfileCurves:
+    curvePoints = getCurvePoints(curve, points)
+    if optimal:
+      matches = CurveAlignment.matchPointsOptimal(curvePoints, targetPoints)
+    else:
+      matches = CurveAlignment.matchPointsGreedy(curvePoints, targetPoints)
+    for ep in range(0, points):
+      # Now we transform the ep to that position
+      if matches[ep] < 0:
+        cmds.error("No profile position was detected")
+        return
+      cmds.xform("%s.ep[%s]" % (curve, ep), t=DeformPositions[matches[ep]], ws=True)
+
+def deformSideProfile(points = 4, DeformPositions = None, optimal = 0):
   """
   This function deforms the side profile
   Args:
     points: the number of points to deform
+    DeformPositions: The positions of the side profile deformation points. If not given, they are read from the
+                     side profile locators
+    optimal: If set, the edit points of each curve are matched for the lowest summed distance instead of one at a time
   """
   # The profile curve deforms slightly differently
   # We get a list of all the available profile curves and match the points to the closest point in the profile deformation points
   ### Note: Try to pass by variable next time. For now, remember to add a clean up function
-  try:
-    cmds.select("SideProfile_Coord*")
-  except ValueError:
-    return
-  coordGrpName = "SideProfileCoordGrp#"
-  # As there can only be one side profile
-  CurrentGroup = cmds.group(n=coordGrpName)
+  if DeformPositions is None:
+    try:
+      cmds.select("SideProfile_Coord*")
+    except ValueError:
+      return
+    coordGrpName = "SideProfileCoordGrp#"
+    # As there can only be one side profile
+    CurrentGroup = cmds.group(n=coordGrpName)
+    DeformPositions = getDeformPositions(CurrentGroup)
+  else:
+    DeformPositions = getDeformPositions(DeformPositions)
+    if not DeformPositions:
+      return
 
   cmds.select("*_ProfileCurve")
   ProfileCurves = cmds.ls(sl=True)
 
-  for curve in ProfileCurves:
-    # Create a duplicate list of locators
-    DeformLocators = cmds.listRelatives(CurrentGroup)
-    # As each curve has 4 points by default, we go through each of them and find the closest deform point
-    for ep in range(0, points):
-      shortestDist = 99999
-      transformPos = []
-      deformToRemove = 0
-      currentPos = cmds.xform("%s.ep[%s]" % (curve, ep), t=True, q=True, ws=True)
-      for deformPoint in DeformLocators:
-        deformPos = cmds.xform(deformPoint, t=True, q=True, ws=True)
-        distance = getDistance(currentPos, deformPos)
-        if distance < shortestDist:
-          shortestDist = distance
-          transformPos = deformPos
-          deformToRemove = deformPoint
-      # Now we transform the ep to that position
-      if not transformPos:
-        cmds.error("No profile position was detected")
-        return
-      cmds.xform("%s.ep[%s]" % (curve, ep), t=transformPos, ws=True)
-      # We then remove that locator from the list. So that the same curve will not find the same point
-      DeformLocators.remove(deformToRemove)
+  deformProfileCurves(ProfileCurves, DeformPositions, points, optimal)
 
-def deformFrontProfile(points = 6):
+def deformFrontProfile(points = 6, DeformPositions = None, optimal = 0):
   """
   This function deforms the side profile
   Args:
     points: the number of points to deform
+    DeformPositions: The positions of the front profile deformation points. If not given, they are read from the
+                     front profile locators
+    optimal: If set, the edit points of each curve are matched for the lowest summed distance instead of one at a time
   """
   # The profile curve deforms slightly differently
   # We get a list of all the available profile curves and match the points to the closest point in the profile deformation points
   ### Note: Try to pass by variable next time. For now, remember to add a clean up function
 
-  try:
-    cmds.select("FrontProfile_Coord*")
-  except ValueError:
-    return
+  if DeformPositions is None:
+    try:
+      cmds.select("FrontProfile_Coord*")
+    except ValueError:
+      return
 
-  coordGrpName = "FrontProfileCoordGrp#"
-  # As there can only be one side profile
-  CurrentGroup = cmds.group(n=coordGrpName)
+    coordGrpName = "FrontProfileCoordGrp#"
+    # As there can only be one side profile
+    CurrentGroup = cmds.group(n=coordGrpName)
+    DeformPositions = getDeformPositions(CurrentGroup)
+  else:
+    DeformPositions = getDeformPositions(DeformPositions)
+    if not DeformPositions:
+      return
 
   cmds.select("*_FtProfileCurve*")
   ProfileCurves = cmds.ls(sl=True)
@@ -676,30 +562,7 @@ def deformFrontProfile(points = 6):
 
   ProfileCurves = TempCurves
 
-  for curve in ProfileCurves:
-    # Create a duplicate list of locators
-    DeformLocators = cmds.listRelatives(CurrentGroup)
-    # As each curve has 6 points by default, we go through each of them and find the closest deform point
-    for ep in range(0, points):
-      shortestDist = 99999
-      transformPos = []
-      deformToRemove = 0
-      currentPos = cmds.xform("%s.ep[%s]" % (curve, ep), t=True, q=True, ws=True)
-      for deformPoint in DeformLocators:
-        deformPos = cmds.xform(deformPoint, t=True, q=True, ws=True)
-        distance = getDistance(currentPos, deformPos)
-        if distance < shortestDist:
-          shortestDist = distance
-          transformPos = deformPos
-          deformToRemove = deformPoint
-      # Now we transform the ep to that position
-      if not transformPos:
-        cmds.error("No profile position was detected")
-        return
-      #print "Transforming %s.ep[%s]" % (curve, ep)
-      cmds.xform("%s.ep[%s]" % (curve, ep), t=transformPos, ws=True)
-      # We then remove that locator from the list. So that the same curve will not find the same point
-      DeformLocators.remove(deformToRemove)
+  deformProfileCurves(ProfileCurves, DeformPositions, points, optimal)
 
 def matchLineDirection(points, CtrlCurve, DeformLocatorsGrp):
   """
@@ -709,10 +572,10 @@ def matchLineDirection(points, CtrlCurve, DeformLocatorsGrp):
     CtrlCurve: The control curves
     DeformLocatorsGrp: The deformation points
 
-  Returns: The deformation locators
+  Returns: The deformation positions
 
   """
-  DeformLocators = cmds.listRelatives(DeformLocatorsGrp)
+  DeformLocators = getDeformPositions(DeformLocatorsGrp)
   # Since the ctrl curve is a line, we check if the index 0 of the ctrl curve and the last index is on the left or on the right
   ctrlPosStart = cmds.xform("%s.ep[0]" % CtrlCurve, q=True, t=True)
   ctrlPosEnd = cmds.xform("%s.ep[%s]" % (CtrlCurve, points - 1), q=True, t=True)
@@ -724,10 +587,9 @@ def matchLineDirection(points, CtrlCurve, DeformLocatorsGrp):
     # The curve is anticlockwise
     ctrlClockwise = 0
 
-  # We then do the same check for the deformation locators
-  nameCoord = DeformLocators[0].rstrip('0123456789')
-  deformPosStart = cmds.xform("%s1" % nameCoord, q=True, t=True)
-  deformPosEnd = cmds.xform("%s%s" % (nameCoord,points), q=True, t=True)
+  # We then do the same check for the deformation points
+  deformPosStart = DeformLocators[0]
+  deformPosEnd = DeformLocators[points - 1]
   deformClockwise = -1
   if deformPosStart[0] > deformPosEnd[0]:
     # The curve is clockwise
@@ -741,7 +603,7 @@ def matchLineDirection(points, CtrlCurve, DeformLocatorsGrp):
   if ctrlClockwise != deformClockwise:
     print "Control and deformation are going in opposite direction"
     print "Reversing Deformations"
-    DeformLocators = reverseName(DeformLocatorsGrp, nameCoord)
+    DeformLocators = DeformLocators[::-1]
 
   return DeformLocators
 
@@ -753,10 +615,10 @@ def matchVerticalLineDirection(points, CtrlCurve, DeformLocatorsGrp):
     CtrlCurve: The control curve
     DeformLocatorsGrp: The deformation points
 
-  Returns: The deformation locators
+  Returns: The deformation positions
 
   """
-  DeformLocators = cmds.listRelatives(DeformLocatorsGrp)
+  DeformLocators = getDeformPositions(DeformLocatorsGrp)
   # Since the ctrl curve is a line, we check if the index 0 of the ctrl curve and the index 16 is on top or bottom
   ctrlPosStart = cmds.xform("%s.ep[0]" % CtrlCurve, q=True, t=True)
   ctrlPosEnd = cmds.xform("%s.ep[%s]" % (CtrlCurve, points - 1), q=True, t=True)
@@ -768,12 +630,9 @@ def matchVerticalLineDirection(points, CtrlCurve, DeformLocatorsGrp):
     # The curve starts from bottom and goes to top
     ctrlTop = 0
 
-  # We then do the same check for the deformation locators
-  nameCoord = DeformLocators[0].rstrip('0123456789')
-  startNum = DeformLocators[0][len(nameCoord):]
-  print "startNum is %s" % startNum
-  deformPosStart = cmds.xform("%s%s" % (nameCoord, startNum), q=True, t=True)
-  deformPosEnd = cmds.xform("%s%s" % (nameCoord, (int(startNum) + points-1)), q=True, t=True)
+  # We then do the same check for the deformation points
+  deformPosStart = DeformLocators[0]
+  deformPosEnd = DeformLocators[points - 1]
   deformTop = -1
   if deformPosStart[1] > deformPosEnd[1]:
     # The deform points start from top and goes to bottom
@@ -787,7 +646,7 @@ def matchVerticalLineDirection(points, CtrlCurve, DeformLocatorsGrp):
   if ctrlTop != deformTop:
     print "Control and deformation are going in opposite direction"
     print "Reversing Deformations"
-    DeformLocators = reverseName(DeformLocatorsGrp, nameCoord)
+    DeformLocators = DeformLocators[::-1]
 
   return DeformLocators
 
@@ -820,16 +679,18 @@ def cleanUpforEdit2(locatorGroup, Objects, relationshipList, mesh):
   """
   This function is to clean up the mesh and average the inside vertices after deformation.
   Args:
-    locatorGroup: The locator group to delete
+    locatorGroup: The locator group to delete, or the ScanResult the mesh was deformed to
     Objects: The objects to clean up
     relationshipList: The relationship list to attach the child back to the parent
     mesh: The initial mesh to delete
   """
 
-  # We first delete the locators
-  cmds.delete(locatorGroup)
+  # We first delete the locators. A scan kept in memory has no locators to delete
+  if not isinstance(locatorGroup, ScanResult.ScanResult):
+    cmds.delete(locatorGroup)
   # We also delete the initial mesh
-  cmds.delete(mesh)
+  if cmds.objExists(mesh):
+    cmds.delete(mesh)
 
   # We then delete the objects history so that the curves no longer influence the object
   for i in Objects:
@@ -907,31 +768,26 @@ def deformGeoToImage(locatorGroup, resolutionList):
   """
   This function deforms the geometry to the image
   Args:
-    locatorGroup: The locators of the 2D Scan points
+    locatorGroup: The locators of the 2D Scan points, or the ScanResult of the scan to deform to
+                  without going through locators
     resolutionList: The resolutionList contains points for the resolution of the control
                       resolutionList = [eye, mouth, mouthloop, nose, eyebrow, nosebridge]
 
   """
-  eyeLocators, earLocators, mouthLocators, mouthLoopLocators, noseLocators, \
-  noseBridgeLocators, eyebrowLocators, sideLocators, frontLocators = getLocators(locatorGroup)
 
   count = 1
   points = resolutionList[0]
-  coordName = "Eye_Coord"
   coordGrpName = "EyeCoordGrp#"
   curveName = "EyeCurve"
-  for i in range(0, len(eyeLocators), points):
-    CurrentGroup = grpLocators(points, i, coordName, coordGrpName)
+  for CurrentGroup in getDeformGroups(locatorGroup, "Eye", points, coordGrpName):
     deformEye("%s%s" % (curveName,count), CurrentGroup, points)
     count+=1
 
   count = 1
   points = resolutionList[1]
-  coordName = "Mouth_Coord"
   coordGrpName = "MouthCoordGrp#"
   curveName = "InnerMouthCurve"
-  for i in range(0, len(mouthLocators), points):
-    CurrentGroup = grpLocators(points, i, coordName, coordGrpName)
+  for CurrentGroup in getDeformGroups(locatorGroup, "Mouth", points, coordGrpName):
     deformMouth("%s%s" % (curveName,count), CurrentGroup, points)
     count+=1
 
@@ -957,63 +813,51 @@ def deformGeoToImage(locatorGroup, resolutionList):
 
   count = 1
   points = resolutionList[2]
-  coordName = "MouthLoop_Coord"
   coordGrpName = "MouthLoopCoordGrp#"
   curveName = "MouthLoopCurve"
-  for i in range(0, len(mouthLoopLocators), points):
-    CurrentGroup = grpLocators(points, i, coordName, coordGrpName)
+  for CurrentGroup in getDeformGroups(locatorGroup, "MouthLoop", points, coordGrpName):
     deformMouthLoop("%s%s" % (curveName, count), CurrentGroup, points)
     count += 1
 
   count = 1
   points = resolutionList[3]
-  coordName = "Nose_Coord"
   coordGrpName = "NoseCoordGrp#"
   curveName = "NoseCurve"
-  for i in range(0, len(noseLocators), points):
-    CurrentGroup = grpLocators(points, i, coordName, coordGrpName)
+  for CurrentGroup in getDeformGroups(locatorGroup, "Nose", points, coordGrpName):
     deformNose("%s%s" % (curveName, count), CurrentGroup, points)
     count += 1
 
   count = 1
   points = resolutionList[4]
-  coordName = "Eyebrow_Coord"
   coordGrpName = "EyebrowCoordGrp#"
   curveName = "LowerForeheadCurve"
-  for i in range(0, len(eyebrowLocators), points):
-    CurrentGroup = grpLocators(points, i, coordName, coordGrpName)
+  for CurrentGroup in getDeformGroups(locatorGroup, "Eyebrow", points, coordGrpName):
     deformEyebrow("%s%s" % (curveName, count), CurrentGroup, points)
     count += 1
 
   count = 1
   points = 5
-  coordName = "Ear_Coord"
   coordGrpName = "EarCoordGrp#"
   curveName = "EarCurve"
-  for i in range(0, len(earLocators), points):
-    CurrentGroup = grpLocators(points, i, coordName, coordGrpName)
+  for CurrentGroup in getDeformGroups(locatorGroup, "Ear", points, coordGrpName):
     deformEar("%s%s" % (curveName, count), CurrentGroup)
     count += 1
 
   #The nose bridge is a unique case as the curves are seperated but the deformation points are not
   points = resolutionList[5]
-  coordName = "NoseBridge_Coord"
   rtcount = 1
   lfcount = 1
-  rtcoordGrpName = "NoseBridgeRtCoordGrp#"
-  lfcoordGrpName = "NoseBridgeLfCoordGrp#"
+  coordGrpName = "NoseBridgeCoordGrp#"
   rtcurveName = "RtNoseBridgeCurve"
   lfcurveName = "LfNoseBridgeCurve"
   alternate = 0
 
-  for i in range(0, len(noseBridgeLocators), points):
+  for CurrentGroup in getDeformGroups(locatorGroup, "NoseBridge", points, coordGrpName):
     if alternate%2 == 0:
-      CurrentGroup = grpLocators(points, i, coordName, rtcoordGrpName)
       deformNoseBridge("%s%s" % (rtcurveName, rtcount), CurrentGroup, points)
       rtcount +=1
 
     elif alternate%2 == 1:
-      CurrentGroup = grpLocators(points, i, coordName, lfcoordGrpName)
       deformNoseBridge("%s%s" % (lfcurveName, lfcount), CurrentGroup, points)
       lfcount+=1
 
@@ -1021,8 +865,12 @@ def deformGeoToImage(locatorGroup, resolutionList):
 
   # The profile curve deforms slightly differently
   # We get a list of all the available profile curves and match the points to the closest point in the profile deformation points
-  ### Note: Try to pass by variable next time. For now, remember to add a clean up function
-  deformSideProfile()
-  deformFrontProfile()
+  # A scan kept in memory passes its profile points straight in rather than through the profile locators
+  if isinstance(locatorGroup, ScanResult.ScanResult):
+    deformSideProfile(DeformPositions = locatorGroup.getPoints("SideProfile"))
+    deformFrontProfile(DeformPositions = locatorGroup.getPoints("FrontProfile"))
+  else:
+    deformSideProfile()
+    deformFrontProfile()
 
 
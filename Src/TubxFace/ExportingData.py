@@ -3,8 +3,20 @@ This script allows the user to export and import required data for the library
 '''
 
 from maya import cmds
+import maya.OpenMaya as om
 import os
 import json
+import numpy as np
+import MeshTopology
+reload(MeshTopology)
+import LibraryGeneration
+reload(LibraryGeneration)
+import CreateRelationships
+reload(CreateRelationships)
+from TubxFaceCore import MeshPayload
+reload(MeshPayload)
+from TubxFaceCore import PartSegmentation
+reload(PartSegmentation)
 
 '''
 #This are just testing directory paths and thus are commented out
@@ -19,6 +31,350 @@ import json
 #print DIRECTORY
 '''
 
+# The catalog file in the library directory. It stores the information of every library mesh together
+# with the time stamps and sizes of its files, so find only reads the JSON files that changed
+CatalogFile = "TubxCatalog.json"
+CatalogVersion = 1
+
+def getFileStamp(path):
+  """
+  This function gets the modified time and size of a file
+  Args:
+    path: The path of the file
+
+  Returns: The [mtime, size] list
+
+  """
+  status = os.stat(path)
+  return [status.st_mtime, status.st_size]
+
+def readCatalog(directory):
+  """
+  This function reads the catalog of the library
+  Args:
+    directory: The library directory
+
+  Returns: The dictionary of catalog entries keyed by the library name. It is empty if there is no usable catalog
+
+  """
+  catalogPath = os.path.join(directory, CatalogFile)
+  if not os.path.exists(catalogPath):
+    return {}
+  try:
+    with open(catalogPath, 'r') as f:
+      catalog = json.load(f)
+  except (IOError, ValueError):
+    print "The library catalog could not be read, it will be built again"
+    return {}
+  if not isinstance(catalog, dict) or catalog.get('version') != CatalogVersion:
+    return {}
+  return catalog.get('entries', {})
+
+def writeCatalog(directory, entries):
+  """
+  This function writes the catalog of the library. It is written to a temporary file first,
+  so nobody reading the library at the same time sees half a catalog
+  Args:
+    directory: The library directory
+    entries: The dictionary of catalog entries keyed by the library name
+  """
+  catalogPath = os.path.join(directory, CatalogFile)
+  temporaryPath = "%s.tmp" % catalogPath
+  try:
+    with open(temporaryPath, 'w') as f:
+      json.dump({'version': CatalogVersion, 'entries': entries}, f, indent=4)
+    if os.path.exists(catalogPath):
+      os.remove(catalogPath)
+    os.rename(temporaryPath, catalogPath)
+  except (IOError, OSError):
+    # The library still works without a catalog, find just reads every JSON file
+    print "The library catalog could not be written to %s" % catalogPath
+
+# The extension of the binary mesh payload saved next to the .ma file
+PayloadExtension = "tubxmesh"
+
+# The shaders that mark the mesh parts, in the order their part labels are numbered
+ShadingList = ['TubxEye', 'TubxNoseBridge', 'TubxNose', 'TubxMouth', 'TubxMouthLoop', 'TubxForehead',
+               'TubxEar', 'TubxBackHead', 'TubxLowerBackHead', 'TubxCheek', 'TubxChin', 'TubxDefault']
+
+def getFaceParts(mesh, faceCount):
+  """
+  This function labels every face of a mesh with the mesh part shader it is assigned to
+  Args:
+    mesh: The name of the mesh
+    faceCount: The number of faces of the mesh
+
+  Returns: The array of indices into ShadingList for every face, -1 for faces without a part shader
+
+  """
+  meshNames = set([mesh] + (cmds.listRelatives(mesh, shapes=True) or []))
+  faceParts = np.full(faceCount, -1, dtype=np.int32)
+  for part in range(0, len(ShadingList)):
+    shadingGroup = "%sSG" % ShadingList[part]
+    if not cmds.objExists(shadingGroup):
+      continue
+    for member in cmds.ls(cmds.sets(shadingGroup, q=True) or [], flatten=True):
+      node, _, component = member.partition(".")
+      if node not in meshNames:
+        continue
+      if not component:
+        # The whole mesh is assigned to the shader
+        faceParts[:] = part
+      elif component.startswith("f["):
+        faceParts[int(component[2:-1])] = part
+  return faceParts
+
+def getMeshArrays(mesh):
+  """
+  This function reads a mesh into the arrays of the mesh payload
+  Args:
+    mesh: The name of the mesh
+
+  Returns: The dictionary of arrays keyed by their name
+
+  """
+  meshFn = MeshTopology.getMeshFn(mesh)
+
+  points = om.MPointArray()
+  meshFn.getPoints(points, om.MSpace.kObject)
+  faceCounts = om.MIntArray()
+  faceConnects = om.MIntArray()
+  meshFn.getVertices(faceCounts, faceConnects)
+  us = om.MFloatArray()
+  vs = om.MFloatArray()
+  meshFn.getUVs(us, vs)
+  uvCounts = om.MIntArray()
+  uvIds = om.MIntArray()
+  meshFn.getAssignedUVs(uvCounts, uvIds)
+
+  # The hard edges are stored by their vertices, as the edge indices are only known once the mesh is created
+  edgeVertices = MeshTopology.MeshTopology(mesh).edgeVertices
+  hardEdges = [i for i in range(0, len(edgeVertices)) if not meshFn.isEdgeSmooth(i)]
+
+  return {'points': np.array([[points[i].x, points[i].y, points[i].z] for i in range(0, points.length())], dtype=np.float32).reshape((-1, 3)),
+          'faceCounts': np.array(list(faceCounts), dtype=np.int32),
+          'faceConnects': np.array(list(faceConnects), dtype=np.int32),
+          'us': np.array(list(us), dtype=np.float32),
+          'vs': np.array(list(vs), dtype=np.float32),
+          'uvCounts': np.array(list(uvCounts), dtype=np.int32),
+          'uvIds': np.array(list(uvIds), dtype=np.int32),
+          'faceParts': getFaceParts(mesh, meshFn.numPolygons()),
+          'hardEdges': edgeVertices[hardEdges].astype(np.int32).reshape((-1, 2))}
+
+def getFaceRanges(mesh, faces):
+  """
+  This function turns a sorted list of face indices into as few face ranges as possible
+  Args:
+    mesh: The name of the mesh
+    faces: The sorted array of face indices
+
+  Returns: The list of "mesh.f[start:end]" names
+
+  """
+  # A new range starts wherever a face does not follow on from the one before
+  starts = np.flatnonzero(np.r_[True, np.diff(faces) != 1])
+  ends = np.r_[starts[1:], len(faces)] - 1
+  return ["%s.f[%s:%s]" % (mesh, faces[start], faces[end]) for start, end in zip(starts, ends)]
+
+# The arrays every mesh payload has, besides the part arrays
+MeshArrays = ['points', 'faceCounts', 'faceConnects', 'us', 'vs', 'uvCounts', 'uvIds', 'hardEdges']
+
+def checkMeshArrays(arrays):
+  """
+  This function checks that the mesh arrays are all there and fit together, so nothing is created in the scene
+  from arrays that would fail halfway through
+  Args:
+    arrays: The dictionary of arrays keyed by their name
+
+  """
+  missing = [name for name in MeshArrays if name not in arrays]
+  if missing:
+    raise ValueError("The mesh payload has no %s arrays" % ", ".join(missing))
+  points = arrays['points']
+  faceCounts = arrays['faceCounts']
+  faceConnects = arrays['faceConnects']
+  if points.ndim != 2 or points.shape[1] != 3:
+    raise ValueError("The mesh payload points are not 3D points")
+  if faceCounts.sum() != len(faceConnects) or (len(faceCounts) and faceCounts.min() < 3):
+    raise ValueError("The mesh payload arrays do not match")
+  if len(faceConnects) and (faceConnects.min() < 0 or faceConnects.max() >= len(points)):
+    raise ValueError("The mesh payload faces use vertices that do not exist")
+  uvIds = arrays['uvIds']
+  if len(arrays['us']) != len(arrays['vs']):
+    raise ValueError("The mesh payload UVs do not match")
+  if len(uvIds):
+    if len(arrays['uvCounts']) != len(faceCounts) or arrays['uvCounts'].sum() != len(uvIds):
+      raise ValueError("The mesh payload UVs do not match its faces")
+    if uvIds.min() < 0 or uvIds.max() >= len(arrays['us']):
+      raise ValueError("The mesh payload faces use UVs that do not exist")
+  hardEdges = arrays['hardEdges']
+  if hardEdges.size % 2 or (hardEdges.size and (hardEdges.min() < 0 or hardEdges.max() >= len(points))):
+    raise ValueError("The mesh payload hard edges use vertices that do not exist")
+
+def deleteCreatedNodes(nodes):
+  """
+  This function deletes the nodes of a mesh that could not be finished, before the error is passed on
+  Args:
+    nodes: The list of node names
+  """
+  nodes = [node for node in nodes if node and cmds.objExists(node)]
+  if nodes:
+    cmds.delete(nodes)
+
+def createMesh(name, arrays):
+  """
+  This function creates a mesh from mesh arrays, with its UVs and edge smoothing.
+  If anything fails once the mesh is created, the mesh is deleted again before the error is passed on
+  Args:
+    name: The name to give the mesh
+    arrays: The dictionary of arrays keyed by their name
+
+  Returns: The name of the created mesh
+
+  """
+  # We check the arrays fit together before anything is created in the scene
+  checkMeshArrays(arrays)
+  points = arrays['points']
+  faceCounts = arrays['faceCounts']
+  faceConnects = arrays['faceConnects']
+
+  pointArray = om.MFloatPointArray()
+  for x, y, z in points.tolist():
+    pointArray.append(om.MFloatPoint(x, y, z))
+  countArray = om.MIntArray()
+  om.MScriptUtil.createIntArrayFromList(faceCounts.tolist(), countArray)
+  connectArray = om.MIntArray()
+  om.MScriptUtil.createIntArrayFromList(faceConnects.tolist(), connectArray)
+  uArray = om.MFloatArray()
+  om.MScriptUtil.createFloatArrayFromList(arrays['us'].tolist(), uArray)
+  vArray = om.MFloatArray()
+  om.MScriptUtil.createFloatArrayFromList(arrays['vs'].tolist(), vArray)
+
+  meshFn = om.MFnMesh()
+  transform = meshFn.create(pointArray.length(), countArray.length(), pointArray, countArray, connectArray, uArray, vArray)
+  mesh = om.MFnDagNode(transform).fullPathName()
+  try:
+    if len(arrays['uvIds']):
+      uvCountArray = om.MIntArray()
+      om.MScriptUtil.createIntArrayFromList(arrays['uvCounts'].tolist(), uvCountArray)
+      uvIdArray = om.MIntArray()
+      om.MScriptUtil.createIntArrayFromList(arrays['uvIds'].tolist(), uvIdArray)
+      meshFn.assignUVs(uvCountArray, uvIdArray)
+
+    # We give the mesh the names it was saved with, the same as importing the .ma would
+    mesh = cmds.rename(mesh, name)
+    shape = cmds.listRelatives(mesh, shapes=True, fullPath=True)[0]
+    cmds.rename(shape, "%sShape" % mesh)
+
+    # We match the hard edges by their vertices
+    edgeVertices = np.sort(MeshTopology.MeshTopology(mesh).edgeVertices, axis=1)
+    hardEdges = np.sort(arrays['hardEdges'].reshape((-1, 2)), axis=1)
+    vertexCount = len(points)
+    isHard = np.in1d(edgeVertices[:, 0] * vertexCount + edgeVertices[:, 1], hardEdges[:, 0] * vertexCount + hardEdges[:, 1])
+    meshFn = MeshTopology.getMeshFn(mesh)
+    for edge in range(0, len(isHard)):
+      meshFn.setEdgeSmoothing(edge, not isHard[edge])
+    meshFn.cleanupEdgeSmoothing()
+    meshFn.updateSurface()
+  except Exception:
+    deleteCreatedNodes([mesh])
+    raise
+  return mesh
+
+def createMeshFromArrays(info, arrays):
+  """
+  This function creates a mesh from the arrays of a mesh payload, with its edge smoothing, UVs and part shaders.
+  If anything fails once the mesh is created, the mesh is deleted again before the error is passed on
+  Args:
+    info: The info dictionary of the payload
+    arrays: The dictionary of arrays keyed by their name
+
+  Returns: The name of the created mesh
+
+  """
+  if not info.get('name'):
+    raise ValueError("The mesh payload has no mesh name")
+  if 'faceParts' not in arrays:
+    raise ValueError("The mesh payload has no faceParts array")
+  faceParts = arrays['faceParts']
+  if len(faceParts) != len(arrays['faceCounts']):
+    raise ValueError("The mesh payload arrays do not match")
+  mesh = createMesh(info['name'], arrays)
+
+  # Finally we assign the part shaders again
+  try:
+    LibraryGeneration.createShaders()
+    cmds.sets(mesh, edit=True, forceElement="initialShadingGroup")
+    for part in range(0, len(ShadingList)):
+      faces = np.flatnonzero(faceParts == part)
+      if len(faces):
+        cmds.sets(getFaceRanges(mesh, faces), edit=True, forceElement="%sSG" % ShadingList[part])
+  except Exception:
+    deleteCreatedNodes([mesh])
+    raise
+  return mesh
+
+def createMeshParts(arrays):
+  """
+  This function creates every mesh part of a mesh payload as a mesh of its own, named the same way
+  LibraryGeneration.seperateMeshParts names them
+  Args:
+    arrays: The dictionary of arrays keyed by their name, with the 'faceShells' and 'shellParts' of the parts
+
+  Returns: The list of mesh parts. If any part fails, the parts created so far are deleted again before the error is passed on
+
+  """
+  shellParts = arrays['shellParts']
+  if len(arrays['faceShells']) != len(arrays['faceCounts']) or (len(shellParts) and shellParts.max() >= len(ShadingList)):
+    raise ValueError("The mesh payload parts do not match")
+  LibraryGeneration.createShaders()
+  names = PartSegmentation.getShellNames(shellParts, ShadingList)
+  Objects = []
+  try:
+    for shell in range(0, len(names)):
+      shellArrays, vertexIds = PartSegmentation.extractShell(arrays, shell)
+      Objects.append(createMesh(names[shell], shellArrays))
+      cmds.sets(Objects[-1], edit=True, forceElement="%sSG" % ShadingList[shellParts[shell]])
+  except Exception:
+    # We delete the parts created so far, so separating the whole mesh afterwards gets the same part names
+    deleteCreatedNodes(Objects)
+    MeshTopology.clearTopology(Objects)
+    raise
+  return Objects
+
+def getPartArrays(arrays):
+  """
+  This function splits the arrays of a mesh into its parts and finds the vertex relationships between the parts,
+  so both can be saved in the payload. The border vertices of each part are found from its arrays,
+  so nothing is created in the scene
+  Args:
+    arrays: The dictionary of arrays keyed by their name
+
+  Returns: The dictionary of the 'faceShells', 'shellParts' and 'relationships' arrays
+
+  """
+  faceShells, shellParts = PartSegmentation.getFaceShells(arrays['faceCounts'], arrays['faceConnects'],
+                                                          arrays['faceParts'], len(arrays['points']))
+  partArrays = {'faceShells': faceShells, 'shellParts': shellParts}
+  meshArrays = dict(arrays)
+  meshArrays.update(partArrays)
+
+  # The parts are named the way createMeshParts names them, which is the naming meshRelationships goes by
+  names = PartSegmentation.getShellNames(shellParts, ShadingList)
+  borders = {}
+  for shell in range(0, len(names)):
+    shellArrays, vertexIds = PartSegmentation.extractShell(meshArrays, shell)
+    borderVertices = PartSegmentation.getBorderVertices(shellArrays['faceCounts'], shellArrays['faceConnects'])
+    borders[names[shell]] = (borderVertices.tolist(), shellArrays['points'][borderVertices].tolist())
+  relationshipList = CreateRelationships.meshRelationships(names, borders)
+
+  # The relationships are stored by the index of the part, as the part names depend on the scene they are created in
+  partIndex = dict((names[i], i) for i in range(0, len(names)))
+  relationships = [[partIndex[child], int(childVertex), partIndex[parent], int(parentVertex)]
+                   for (child, childVertex), (parent, parentVertex) in relationshipList]
+  partArrays['relationships'] = np.array(relationships, dtype=np.int32).reshape((-1, 4))
+  return partArrays
+
 def createDirectory(directory):
   """
   This function creates a directory to store our library if one does not exist
@@ -86,6 +442,19 @@ class TubxLibrary(dict):
       print "No objects to save as nothing is selected. No mesh is active"
       return
 
+    # We also save the mesh as arrays, which load can build the mesh from much faster than importing the .ma
+    # The mesh parts and their relationships are saved with it, so they do not have to be found on every load
+    meshes = cmds.ls(activeMesh)
+    if len(meshes) == 1:
+      payloadPath = os.path.join(directory, "%s.%s" % (name, PayloadExtension))
+      arrays = getMeshArrays(meshes[0])
+      try:
+        arrays.update(getPartArrays(arrays))
+      except (ValueError, KeyError, IndexError) as e:
+        # The mesh is still saved, generateGeometry just separates it in the scene as before
+        print "The mesh parts could not be saved with the mesh: %s" % e
+      MeshPayload.writePayload(payloadPath, arrays, {'name': meshes[0], 'parts': ShadingList})
+
     # Now we save out a screenshot
     # We also add this to the info dictionary
     info['screenshot'] = self.saveScreenshot(name)
@@ -95,10 +464,19 @@ class TubxLibrary(dict):
     with open(userInfoPath, 'w') as f:
       json.dump(info, f, indent=4)
 
-    #Updating the dictionary every time we save
+    #Updating the dictionary and the catalog every time we save
     self[name] = info
+    catalog = readCatalog(directory)
+    catalog[name] = {'info': info,
+                     'stamps': {'ma': getFileStamp(path), 'json': getFileStamp(userInfoPath),
+                                'screenshot': getFileStamp(info['screenshot'])}}
+    writeCatalog(directory, catalog)
 
   def find(self):
+    """
+    This function finds the library meshes in the library directory. The information of each mesh comes from
+    the catalog, and only the JSON files of the meshes whose files changed since are read again
+    """
     directory = self.DIRECTORY
     self.clear()
     if not os.path.exists(directory):
@@ -111,6 +489,9 @@ class TubxLibrary(dict):
     #Seperate and list only the .ma files
     mayaFiles = [f for f in allFiles if f.endswith(".ma")]
 
+    catalog = readCatalog(directory)
+    updatedCatalog = {}
+
     for maFiles in mayaFiles:
       # Split the extension from the file names
       name, ext = os.path.splitext(maFiles)
@@ -119,44 +500,139 @@ class TubxLibrary(dict):
 
       # We then find the corresponding json file
       jsonFile = '%s.json' % name
-      if jsonFile in allFiles:
-        jsonPath = os.path.join(directory, jsonFile)
-
-        # Now we read the json file
-        with open(jsonPath, 'r') as f:
-          info = json.load(f)
-
-      else:
+      if jsonFile not in allFiles:
         print "No json file found, %s is not a complete Tubx file" % name
         continue
+      jsonPath = os.path.join(directory, jsonFile)
 
       # We then find the corresponding jpg file
       screenshot = "%s.jpg" % name
-      if screenshot in allFiles:
-        screenshotPath = os.path.join(directory, screenshot)
-        info["screenshot"] = screenshotPath
-
-      else:
+      if screenshot not in allFiles:
         print "No screenshot file found, %s is not a complete Tubx file" % name
         continue
+      screenshotPath = os.path.join(directory, screenshot)
 
+      # We only read the json file if the catalog does not know the files as they are now
+      stamps = {'ma': getFileStamp(mayaFilePath), 'json': getFileStamp(jsonPath), 'screenshot': getFileStamp(screenshotPath)}
+      entry = catalog.get(name)
+      if entry is None or entry.get('stamps') != stamps:
+        # Now we read the json file
+        with open(jsonPath, 'r') as f:
+          info = json.load(f)
+        info["screenshot"] = screenshotPath
+        entry = {'info': info, 'stamps': stamps}
+      updatedCatalog[name] = entry
 
       # Now we store it as a dictionary, since the class is inherited from a dictionary
-      self[name] = info
+      self[name] = entry['info']
+
+    # The catalog is only written when a mesh was added, changed or removed
+    if updatedCatalog != catalog:
+      writeCatalog(directory, updatedCatalog)
 
-  def load(self, name):
+  def load(self, name, parts = False):
     """
     This function loads the mesh from the library
     Args:
       name: The name of the library mesh
+      parts: If set, only the mesh parts are created when they were saved with the mesh
+
+    Returns: The mesh parts, their relationship list and the ear data if the parts were created. None if the whole mesh was loaded
+
     """
     self.find()
     mayaFile = "%s.ma" % name
     directory = self.DIRECTORY
     loadingPath = os.path.join(directory, mayaFile)
+
+    # We build the mesh from the payload if there is one saved with the .ma, and import the .ma otherwise
+    payload = self.readPayload(name)
+    if payload is not None:
+      payloadInfo, arrays = payload
+      if parts:
+        loadedParts = self.loadParts(name, arrays)
+        if loadedParts is not None:
+          return loadedParts
+      try:
+        createMeshFromArrays(payloadInfo, arrays)
+        return None
+      except (ValueError, KeyError, RuntimeError) as e:
+        print "The mesh payload could not be used, importing the .ma instead: %s" % e
+
     #loadingPath = self[name]['path']
     print "Loading Path is ", loadingPath
     cmds.file(loadingPath, i =True, usingNamespaces = False)
+    return None
+
+  def readPayload(self, name):
+    """
+    This function reads the mesh payload of a library mesh
+    Args:
+      name: The name of the library mesh
+
+    Returns: The info dictionary and the arrays of the payload. None if there is no payload as new as the .ma file
+
+    """
+    directory = self.DIRECTORY
+    loadingPath = os.path.join(directory, "%s.ma" % name)
+    payloadPath = os.path.join(directory, "%s.%s" % (name, PayloadExtension))
+    if not os.path.exists(payloadPath) or not os.path.exists(loadingPath):
+      return None
+    if os.path.getmtime(payloadPath) < os.path.getmtime(loadingPath):
+      return None
+
+    print "Loading Path is ", payloadPath
+    try:
+      payloadInfo, arrays = MeshPayload.readPayload(payloadPath)
+    except (IOError, ValueError) as e:
+      print "The mesh payload could not be read: %s" % e
+      return None
+    if payloadInfo.get('parts') != ShadingList:
+      return None
+    return payloadInfo, arrays
+
+  def loadParts(self, name, arrays):
+    """
+    This function creates the mesh parts of a library mesh from its payload, together with their relationship list,
+    so the mesh does not have to be separated and the relationships do not have to be found again.
+    The ear data is moved from the vertices of the whole mesh to the vertices of the mesh parts
+    Args:
+      name: The name of the library mesh
+      arrays: The arrays of the payload
+
+    Returns: The list of mesh parts, the relationship list and the ear data. None if the payload has no parts saved
+
+    """
+    if 'faceShells' not in arrays or 'relationships' not in arrays:
+      return None
+    relationships = arrays['relationships']
+    if len(relationships) and relationships[:, [0, 2]].max() >= len(arrays['shellParts']):
+      print "The relationships of the payload do not match its mesh parts"
+      return None
+
+    try:
+      Objects = createMeshParts(arrays)
+    except (ValueError, KeyError, IndexError, RuntimeError) as e:
+      print "The mesh parts could not be created from the payload: %s" % e
+      return None
+    relationshipList = [[(Objects[child], childVertex), (Objects[parent], parentVertex)]
+                        for child, childVertex, parent, parentVertex in relationships.tolist()]
+
+    # Each ear is moved onto the part that has all its vertices, an ear part if there is one
+    dataGrp = []
+    for individualEar in self.loadExtraData(name):
+      try:
+        vertices = [int(vertex.rpartition("[")[2].rstrip("]")) for vertex in individualEar]
+      except ValueError:
+        print "The ear data %s are not vertices" % individualEar
+        continue
+      found = PartSegmentation.findVertexShell(arrays, vertices, ShadingList.index('TubxEar'))
+      if found is None:
+        print "The ear vertices %s are not all on one mesh part" % individualEar
+        continue
+      shell, shellVertices = found
+      dataGrp.append(["%s.vtx[%s]" % (Objects[shell], vertex) for vertex in shellVertices])
+    return Objects, relationshipList, dataGrp
 
   def loadExtraData(self, name):
     """
@@ -168,14 +644,17 @@ class TubxLibrary(dict):
 
     """
     directory = self.DIRECTORY
-    allFiles = os.listdir(directory)
-    jsonFile = "%s.json" % name
-    if jsonFile in allFiles:
-      jsonPath = os.path.join(directory, jsonFile)
+    # The information found through the catalog saves us reading the json file again
+    info = self.get(name)
+    if info is None:
+      allFiles = os.listdir(directory)
+      jsonFile = "%s.json" % name
+      if jsonFile in allFiles:
+        jsonPath = os.path.join(directory, jsonFile)
 
-      # Now we read the json file
-      with open(jsonPath, 'r') as f:
-        info = json.load(f)
+        # Now we read the json file
+        with open(jsonPath, 'r') as f:
+          info = json.load(f)
 
     dataGrp = []
     #We check if ear data exists and appends to dataGrp
@@ -6,9 +6,18 @@ It also contains function that creates control curves
 from maya import cmds
 import maya.mel as mel
 import math
+import numpy as np
 
 import CreateRelationships
 reload(CreateRelationships)
+import MeshTopology
+reload(MeshTopology)
+from TubxFaceCore import RelationshipHashing
+reload(RelationshipHashing)
+
+# The distance from x = 0 within which an edge is on the centre line. The old check read the positions as text,
+# where anything under 1e-4 is printed with an exponent and was taken as 0
+CenterTolerance = 1e-4
 
 '''
 User assigns regions for the face parts
@@ -71,6 +80,25 @@ def splitNumberFromName(name):
   number = number[1].split(']')[0]
   return int(number)
 
+def getBorderEdgeKeys(mesh):
+  """
+  This function gets the border edges of a mesh together with a key of where they are.
+  Two edges at the same place have the same key, whichever way round their vertices go
+  Args:
+    mesh: The mesh to work with
+
+  Returns: The list of border edges and the list of their keys
+
+  """
+  topology = MeshTopology.getTopology(mesh)
+  positions = MeshTopology.getPositions(mesh)
+  BorderKeys = []
+  for start, end in topology.borderEdgeVertices.tolist():
+    startKey = RelationshipHashing.getPositionKey(positions[start])
+    endKey = RelationshipHashing.getPositionKey(positions[end])
+    BorderKeys.append((min(startKey, endKey), max(startKey, endKey)))
+  return topology.getBorderEdgeNames(), BorderKeys
+
 def bubblesort(list, indexlist):
   """
   This function bubble sorts a list and together with it, the index list gets sorted as well
@@ -182,23 +210,32 @@ def createShaders():
     cmds.connectAttr("TubxChin.outColor", "TubxChinSG.surfaceShader")
     cmds.setAttr("TubxChin.color", 0.2, 0.5, 0.5, type="double3")
 
-def createMeshAndControl(mesh, resolutionList):
+def createMeshAndControl(mesh, resolutionList, parts = None):
   """
   This function is a combination function. It separates the mesh into
   its parts and creates the controls
   Args:
     mesh: The mesh to separate
     resolutionList: The list that contains the ctrl point resolution
+    parts: The mesh parts and relationship list loaded from the library. If given, the mesh is not separated again
 
   Returns: The relationship list and the separated objects
 
   """
-  # We first separate the mesh into the various parts
-  Objects = seperateMeshParts(mesh)
-  print "Objects Separated"
+  if parts is None:
+    # We first separate the mesh into the various parts
+    Objects = seperateMeshParts(mesh)
+    print "Objects Separated"
+  else:
+    # The parts were already created from the library, so there is no mesh to separate
+    Objects, relationshipList = parts
+
+  # We read the topology of the new parts once, for the relationships and the controls to share
+  MeshTopology.buildTopology(Objects)
 
   # We establish the relationship
-  relationshipList = CreateRelationships.meshRelationships(Objects)
+  if parts is None:
+    relationshipList = CreateRelationships.meshRelationships(Objects)
   print "relationshipList Created"
 
   # We then begin to create the respective controls
@@ -332,41 +369,14 @@ def createEyeControl(mesh, spanNumber = 16):
   Args:
     mesh: The mesh to work with
   """
-  # We grab the border edges
-  cmds.select(mesh)
-  cmds.polySelectConstraint(mode=3, t=0x8000, where=1)
-  borderEdges = cmds.ls(sl=True)
-  borderEdges = cmds.filterExpand(borderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # As the eye has the inner and outer edge loops, we get the 2 separate edge loops
-  EdgeLoops = []
-
-  for i in borderEdges:
-    # Split the number
-    number = splitNumberFromName(i)
-    # Select the number at a given edge loop
-    selection = cmds.polySelect(eb=int(number), q=True)
-    selection = [int(x) for x in selection]
-    selection = list(set(selection))
-    selection.sort()
-
-    # Now we check if the number exist in the EdgeLoops list or not
-    if selection in EdgeLoops:
-      continue
-    else:
-      EdgeLoops.append(selection)
-    # We then check if the number of edge loops detected is already 2
-    if len(EdgeLoops) == 2:
-      break
+  # As the eye has the inner and outer edge loops, we get the 2 separate border loops from the topology cache
+  EdgeLoops = MeshTopology.getTopology(mesh).borderLoops[:2]
 
   BoundingVolume = []
   CurveName = []
   # We select the respective edge loops and convert them to curves
   for i in EdgeLoops:
-    cmds.select(clear = True)
-    for j in i:
-      cmds.select("%s.e[%s]" % (mesh, j), add=True)
+    cmds.select(["%s.e[%s]" % (mesh, j) for j in i], r=True)
     CurveName.append(cmds.polyToCurve(n='EyeTempCurve', form=2, degree=1, ch=False))
     # We then check for the bounding volume
     bboxCurve = cmds.exactWorldBoundingBox()
@@ -398,96 +408,22 @@ def createNoseBridgeControl(mesh, noseMesh, foreheadMesh, spanNumber = 4):
     noseMesh: The nose mesh to check relationship with
     foreheadMesh: The forehead mesh to check relationship with
   """
-  # We first get a list of border edges the NoseMesh has
-  cmds.select(noseMesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  NoseBorderEdges = cmds.ls(sl=True)
-  NoseBorderEdges = cmds.filterExpand(NoseBorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # With the edges that we got, we get the position they are in
-  NoseBorderPosition = []
-  for edge in NoseBorderEdges:
-    transformations = cmds.xform(edge, q=True, t=True, ws=True)
-    if "e" in str(transformations[0]):
-      transformations[0] = 0.0
-    if "e" in str(transformations[3]):
-      transformations[3] = 0.0
-    NoseBorderPosition.append(transformations)
-
-
-  # We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(NoseBorderPosition)):
-    if (NoseBorderPosition[i][3] < NoseBorderPosition[i][0]):
-      Temp0, Temp1, Temp2, Temp3, Temp4, Temp5 = [x for x in NoseBorderPosition[i]]
-      NoseBorderPosition[i] = [Temp3, Temp4, Temp5, Temp0, Temp1, Temp2]
-
-  # We then get a list of border edges the forehead has
-  cmds.select(foreheadMesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  ForeheadBorderEdges = cmds.ls(sl=True)
-  ForeheadBorderEdges = cmds.filterExpand(ForeheadBorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # With the edges that we got, we get the position they are in
-  ForeheadBorderPosition = []
-  for edge in ForeheadBorderEdges:
-    transformations = cmds.xform(edge, q=True, t=True, ws=True)
-    if "e" in str(transformations[0]):
-      transformations[0] = 0.0
-    if "e" in str(transformations[3]):
-      transformations[3] = 0.0
-    ForeheadBorderPosition.append(transformations)
-
-  # We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(ForeheadBorderPosition)):
-    if (ForeheadBorderPosition[i][3] < ForeheadBorderPosition[i][0]):
-      Temp0, Temp1, Temp2, Temp3, Temp4, Temp5 = [x for x in ForeheadBorderPosition[i]]
-      ForeheadBorderPosition[i] = [Temp3, Temp4, Temp5, Temp0, Temp1, Temp2]
-
-  # Lastly we get the border edge of the nosebridge mesh
-  cmds.select(mesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  BorderEdges = cmds.ls(sl=True)
-  BorderEdges = cmds.filterExpand(BorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # With the edges that we got, we get the position they are in
-  BorderPosition = []
-  for edge in BorderEdges:
-    transformations = cmds.xform(edge, q=True, t=True, ws=True)
-    if "e" in str(transformations[0]):
-      transformations[0] = 0.0
-    if "e" in str(transformations[3]):
-      transformations[3] = 0.0
-    BorderPosition.append([edge,transformations])
-
-  # We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(BorderPosition)):
-    if (BorderPosition[i][1][3] < BorderPosition[i][1][0]):
-      Temp0, Temp1, Temp2, Temp3, Temp4, Temp5 = [x for x in BorderPosition[i][1]]
-      BorderPosition[i][1] = [Temp3, Temp4, Temp5, Temp0, Temp1, Temp2]
+  # We get the border edges of the nose bridge and the meshes next to it from the topology cache
+  NoseBorderKeys = set(getBorderEdgeKeys(noseMesh)[1])
+  ForeheadBorderKeys = set(getBorderEdgeKeys(foreheadMesh)[1])
+  BorderEdges, BorderKeys = getBorderEdgeKeys(mesh)
 
   # We compare the positions and remove matching ones
   LfOutsideEdges = []
   RtOutsideEdges = []
-  for i in range(0, len(BorderPosition)):
-    similar = 0
-    for j in range(0, len(NoseBorderPosition)):
-      if BorderPosition[i][1] == NoseBorderPosition[j]:
-        similar = 1
-        break
-    if similar == 0:
-      for j in range(0, len(ForeheadBorderPosition)):
-        if BorderPosition[i][1] == ForeheadBorderPosition[j]:
-          similar = 1
-          break
-    if similar == 0:
-      #We then separate them into left and right side
-      if BorderPosition[i][1][0] > 0 or BorderPosition[i][1][3] > 0:
-        LfOutsideEdges.append(BorderPosition[i][0])
-      else:
-        RtOutsideEdges.append(BorderPosition[i][0])
+  for edge, key in zip(BorderEdges, BorderKeys):
+    if key in NoseBorderKeys or key in ForeheadBorderKeys:
+      continue
+    # We then separate them into left and right side
+    if key[0][0] > 0 or key[1][0] > 0:
+      LfOutsideEdges.append(edge)
+    else:
+      RtOutsideEdges.append(edge)
 
   # We select the outside edges and create the curve
   cmds.select(LfOutsideEdges)
@@ -511,65 +447,15 @@ def createNoseControl(mesh, noseBridgeMesh, spanNumber = 8):
     noseBridgeMesh: The nose bridge mesh to check relationship with
 
   """
-  #We first get a list of border edges the noseBridgeMesh has
-  cmds.select(noseBridgeMesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  NoseBridgeBorderEdges = cmds.ls(sl=True)
-  NoseBridgeBorderEdges = cmds.filterExpand(NoseBridgeBorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  #With the edges that we got, we get the position they are in
-  NoseBridgeBorderPosition = []
-  for edge in NoseBridgeBorderEdges:
-    transformations = cmds.xform(edge, q=True, t=True, ws=True)
-    if "e" in str(transformations[0]):
-      transformations[0] = 0.0
-    if "e" in str(transformations[3]):
-      transformations[3] = 0.0
-    NoseBridgeBorderPosition.append(transformations)
-
-
-  #We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(NoseBridgeBorderPosition)):
-    if (NoseBridgeBorderPosition[i][3] < NoseBridgeBorderPosition[i][0]):
-      Temp0,Temp1,Temp2,Temp3,Temp4,Temp5 = [x for x in NoseBridgeBorderPosition[i]]
-      NoseBridgeBorderPosition[i] = [Temp3,Temp4,Temp5,Temp0,Temp1,Temp2]
-
-  #We then get a list of the border edges of the noseMesh
-  cmds.select(mesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  BorderEdges = cmds.ls(sl=True)
-  BorderEdges = cmds.filterExpand(BorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  #With the edges that we got, we get the position they are in
-  NoseBorderPosition = []
-  for edge in BorderEdges:
-    transformations = cmds.xform(edge, q=True, t=True, ws=True)
-    if "e" in str(transformations[0]):
-      transformations[0] = 0.0
-    if "e" in str(transformations[3]):
-      transformations[3] = 0.0
-    NoseBorderPosition.append([edge,transformations])
-
-  # We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(NoseBorderPosition)):
-    if (NoseBorderPosition[i][1][3] < NoseBorderPosition[i][1][0]):
-      Temp0, Temp1, Temp2, Temp3, Temp4, Temp5 = [x for x in NoseBorderPosition[i][1]]
-      NoseBorderPosition[i][1] = [Temp3, Temp4, Temp5, Temp0, Temp1, Temp2]
-
+  # We get the border edges of the nose and the nose bridge from the topology cache
+  NoseBridgeBorderKeys = set(getBorderEdgeKeys(noseBridgeMesh)[1])
+  BorderEdges, BorderKeys = getBorderEdgeKeys(mesh)
 
   #We then compare the positions and remove matching ones
   NoseOutsideEdges = []
-  for i in range(0,len(NoseBorderPosition)):
-    similar = 0
-    for j in range(0,len(NoseBridgeBorderPosition)):
-      if NoseBorderPosition[i][1] == NoseBridgeBorderPosition[j]:
-        similar = 1
-        break
-    if similar == 0:
-      NoseOutsideEdges.append(NoseBorderPosition[i][0])
-
+  for edge, key in zip(BorderEdges, BorderKeys):
+    if key not in NoseBridgeBorderKeys:
+      NoseOutsideEdges.append(edge)
 
   #We select the outside edges and create the curve
   cmds.select(NoseOutsideEdges)
@@ -589,41 +475,14 @@ def createMouthControl(mesh, spanNumber = 24):
     mesh: The mesh to work with
 
   """
-  # We grab the border edges
-  cmds.select(mesh)
-  cmds.polySelectConstraint(mode=3, t=0x8000, where=1)
-  borderEdges = cmds.ls(sl=True)
-  borderEdges = cmds.filterExpand(borderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # As the mouth has the inner and outer edge loops, we get the 2 separate edge loops
-  EdgeLoops = []
-
-  for i in borderEdges:
-    # Split the number
-    number = splitNumberFromName(i)
-    # Select the number at a given edge loop
-    selection = cmds.polySelect(eb=int(number), q=True)
-    selection = [int(x) for x in selection]
-    selection = list(set(selection))
-    selection.sort()
-
-    # Now we check if the number exist in the EdgeLoops list or not
-    if selection in EdgeLoops:
-      continue
-    else:
-      EdgeLoops.append(selection)
-    # We then check if the number of edge loops detected is already 2
-    if len(EdgeLoops) == 2:
-      break
+  # As the mouth has the inner and outer edge loops, we get the 2 separate border loops from the topology cache
+  EdgeLoops = MeshTopology.getTopology(mesh).borderLoops[:2]
 
   BoundingVolume = []
   CurveName = []
   # We select the respective edge loops and convert them to curves
   for i in EdgeLoops:
-    cmds.select(clear=True)
-    for j in i:
-      cmds.select("%s.e[%s]" % (mesh, j), add=True)
+    cmds.select(["%s.e[%s]" % (mesh, j) for j in i], r=True)
     CurveName.append(cmds.polyToCurve(n='MouthTempCurve', form=2, degree=1, ch=False))
     # We then check for the bounding volume
     bboxCurve = cmds.exactWorldBoundingBox()
@@ -659,69 +518,16 @@ def createMouthLoopControl(mesh, noseMesh, mouthMesh, spanNumber = 16):
     noseMesh: The nose mesh to compare relationship
     mouthMesh: The mouth mesh to compare relationship
   """
-  # We first get a list of border edges the NoseMesh has
-  cmds.select(noseMesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  NoseBorderEdges = cmds.ls(sl=True)
-  NoseBorderEdges = cmds.filterExpand(NoseBorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # With the edges that we got, we get the position they are in
-  NoseBorderPosition = [cmds.xform(edge, q=True, t=True, ws=True) for edge in NoseBorderEdges]
-
-  # We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(NoseBorderPosition)):
-    if (NoseBorderPosition[i][3] < NoseBorderPosition[i][0]):
-      Temp0, Temp1, Temp2, Temp3, Temp4, Temp5 = [x for x in NoseBorderPosition[i]]
-      NoseBorderPosition[i] = [Temp3, Temp4, Temp5, Temp0, Temp1, Temp2]
-
-  # We then get a list of border edges the mouthMesh has
-  cmds.select(mouthMesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  MouthBorderEdges = cmds.ls(sl=True)
-  MouthBorderEdges = cmds.filterExpand(MouthBorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # With the edges that we got, we get the position they are in
-  MouthBorderPosition = [cmds.xform(edge, q=True, t=True, ws=True) for edge in MouthBorderEdges]
-
-  # We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(MouthBorderPosition)):
-    if (MouthBorderPosition[i][3] < MouthBorderPosition[i][0]):
-      Temp0, Temp1, Temp2, Temp3, Temp4, Temp5 = [x for x in MouthBorderPosition[i]]
-      MouthBorderPosition[i] = [Temp3, Temp4, Temp5, Temp0, Temp1, Temp2]
-
-  #Lastly we get the border edge of the mouth loop mesh
-  cmds.select(mesh)
-  cmds.polySelectConstraint(m=3, t=0x8000, w=1)
-  BorderEdges = cmds.ls(sl=True)
-  BorderEdges = cmds.filterExpand(BorderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  # With the edges that we got, we get the position they are in
-  BorderPosition = [[edge, cmds.xform(edge, q=True, t=True, ws=True)] for edge in BorderEdges]
-
-  # We rearrange each position based on the lowest x in case the edge vector points a different way
-  for i in range(0, len(BorderPosition)):
-    if (BorderPosition[i][1][3] < BorderPosition[i][1][0]):
-      Temp0, Temp1, Temp2, Temp3, Temp4, Temp5 = [x for x in BorderPosition[i][1]]
-      BorderPosition[i][1] = [Temp3, Temp4, Temp5, Temp0, Temp1, Temp2]
+  # We get the border edges of the mouth loop and the meshes next to it from the topology cache
+  NoseBorderKeys = set(getBorderEdgeKeys(noseMesh)[1])
+  MouthBorderKeys = set(getBorderEdgeKeys(mouthMesh)[1])
+  BorderEdges, BorderKeys = getBorderEdgeKeys(mesh)
 
   # We compare the positions and remove matching ones
   OutsideEdges = []
-  for i in range(0, len(BorderPosition)):
-    similar = 0
-    for j in range(0, len(NoseBorderPosition)):
-      if BorderPosition[i][1] == NoseBorderPosition[j]:
-        similar = 1
-        break
-    if similar == 0:
-      for j in range(0, len(MouthBorderPosition)):
-        if BorderPosition[i][1] == MouthBorderPosition[j]:
-          similar = 1
-          break
-    if similar == 0:
-      OutsideEdges.append(BorderPosition[i][0])
+  for edge, key in zip(BorderEdges, BorderKeys):
+    if key not in NoseBorderKeys and key not in MouthBorderKeys:
+      OutsideEdges.append(edge)
 
   # We select the outside edges and create the curve
   cmds.select(OutsideEdges)
@@ -740,32 +546,8 @@ def createForeheadControl(mesh, spanNumberEyebrow = 16):
   Args:
     mesh: The mesh to work with
   """
-  # We grab the border edges
-  cmds.select(mesh)
-  cmds.polySelectConstraint(mode=3, t=0x8000, where=1)
-  borderEdges = cmds.ls(sl=True)
-  borderEdges = cmds.filterExpand(borderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  CornerVertices = []
-  # We find the corner vertices. Those are vertices with only 2 connecting edges
-  for i in borderEdges:
-    cmds.select(i)
-    # First we convert the Edges into the 2 vertices
-    EdgeVert = cmds.polyListComponentConversion(fe=True, tv=True)
-    EdgeVert = cmds.filterExpand(EdgeVert, ex=True, sm=31)
-    # We then check from the 2 vertices their respective connecting edges
-    # The corner vertices will only have 2 connecting edges while the rest has 3
-    cmds.select(EdgeVert[0])
-    VertEdge = cleanUp(cmds.polyInfo(ve=True))
-    if len(VertEdge) == 2:
-      CornerVertices.append(EdgeVert[0])
-    cmds.select(EdgeVert[1])
-    VertEdge = cleanUp(cmds.polyInfo(ve=True))
-    if len(VertEdge) == 2:
-      CornerVertices.append(EdgeVert[1])
-
-  CornerVertices = list(set(CornerVertices))
+  # We find the corner vertices from the topology cache. Those are border vertices with only 2 connecting edges
+  CornerVertices = MeshTopology.getTopology(mesh).getCornerVertices()
   if (len(CornerVertices) > 4):
     cmds.warning("There are more then 4 corners at the forehead")
     return
@@ -865,32 +647,8 @@ def createCheekEdgeControl(mesh, spanNumber = 6):
     mesh: The mesh to work with
 
   """
-  # We grab the border edges
-  cmds.select(mesh)
-  cmds.polySelectConstraint(mode=3, t=0x8000, where=1)
-  borderEdges = cmds.ls(sl=True)
-  borderEdges = cmds.filterExpand(borderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  CornerVertices = []
-  # We find the corner vertices. Those are vertices with only 2 connecting edges
-  for i in borderEdges:
-    cmds.select(i)
-    # First we convert the Edges into the 2 vertices
-    EdgeVert = cmds.polyListComponentConversion(fe=True, tv=True)
-    EdgeVert = cmds.filterExpand(EdgeVert, ex=True, sm=31)
-    # We then check from the 2 vertices their respective connecting edges
-    # The corner vertices will only have 2 connecting edges while the rest has 3
-    cmds.select(EdgeVert[0])
-    VertEdge = cleanUp(cmds.polyInfo(ve=True))
-    if len(VertEdge) == 2:
-      CornerVertices.append(EdgeVert[0])
-    cmds.select(EdgeVert[1])
-    VertEdge = cleanUp(cmds.polyInfo(ve=True))
-    if len(VertEdge) == 2:
-      CornerVertices.append(EdgeVert[1])
-
-  CornerVertices = list(set(CornerVertices))
+  # We find the corner vertices from the topology cache. Those are border vertices with only 2 connecting edges
+  CornerVertices = MeshTopology.getTopology(mesh).getCornerVertices()
 
   if (len(CornerVertices) > 4):
     cmds.warning("There are more then 4 corners at the cheek")
@@ -930,32 +688,8 @@ def createChinEdgeControl(mesh, spanNumber = 6):
     mesh: The mesh to work with
 
   """
-  # We grab the border edges
-  cmds.select(mesh)
-  cmds.polySelectConstraint(mode=3, t=0x8000, where=1)
-  borderEdges = cmds.ls(sl=True)
-  borderEdges = cmds.filterExpand(borderEdges, ex=True, sm=32)
-  cmds.polySelectConstraint(dis=True)
-
-  CornerVertices = []
-  # We find the corner vertices. Those are vertices with only 2 connecting edges
-  for i in borderEdges:
-    cmds.select(i)
-    # First we convert the Edges into the 2 vertices
-    EdgeVert = cmds.polyListComponentConversion(fe=True, tv=True)
-    EdgeVert = cmds.filterExpand(EdgeVert, ex=True, sm=31)
-    # We then check from the 2 vertices their respective connecting edges
-    # The corner vertices will only have 2 connecting edges while the rest has 3
-    cmds.select(EdgeVert[0])
-    VertEdge = cleanUp(cmds.polyInfo(ve=True))
-    if len(VertEdge) == 2:
-      CornerVertices.append(EdgeVert[0])
-    cmds.select(EdgeVert[1])
-    VertEdge = cleanUp(cmds.polyInfo(ve=True))
-    if len(VertEdge) == 2:
-      CornerVertices.append(EdgeVert[1])
-
-  CornerVertices = list(set(CornerVertices))
+  # We find the corner vertices from the topology cache. Those are border vertices with only 2 connecting edges
+  CornerVertices = MeshTopology.getTopology(mesh).getCornerVertices()
 
   if (len(CornerVertices) > 4):
     cmds.warning("There are more then 4 corners at the chin")
@@ -1026,49 +760,29 @@ def createProfileControl(meshList, spanNumber = 4):
     meshList: The list of mesh to check if it is part of the side profile
   """
   for mesh in meshList:
-    cmds.select(mesh)
-    NumberOfEdges = cmds.polyEvaluate(edge = True)
-    CenterEdge = []
-
-    for i in range(0, NumberOfEdges):
-      transformations = cmds.xform("%s.e[%s]" % (mesh, i), q=True, t=True, ws=True)
-      if "e" in str(transformations[0]):
-        transformations[0] = 0.0
-      if "e" in str(transformations[3]):
-        transformations[3] = 0.0
+    # We read the positions of the vertices once and take the edges from the topology cache
+    topology = MeshTopology.getTopology(mesh)
+    positions = MeshTopology.getPositions(mesh)
+    EdgeX = positions[topology.edgeVertices, 0]
 
-      if float("%.7f" % transformations[0]) == 0 and float("%.7f" % transformations[3]) == 0:
-        CenterEdge.append("%s.e[%s]" % (mesh, i))
+    # The centre edges have both vertices on x = 0
+    CenterMask = (np.abs(EdgeX) < CenterTolerance).all(axis=1)
+    CenterIndices = np.flatnonzero(CenterMask)
 
     # If there are no middle edges in the geo
-    if len(CenterEdge) == 0:
+    if len(CenterIndices) == 0:
       continue
     else:
-      cmds.select(CenterEdge)
-      CenterEdges = cmds.ls(sl=True)
-      CenterEdges = cmds.filterExpand(CenterEdges, ex=True, sm=32)
-      UniqueVertex = []
-      for edge in CenterEdges:
-        #Now we have to check if the edges are connected or not
-        cmds.select(edge)
-        VerticesSelected = cmds.polyListComponentConversion(fe = True, tv = True)
-        VerticesSelected = cmds.filterExpand(VerticesSelected, ex=True, sm=31)
-        for vertex in VerticesSelected:
-          UniqueVertex.append(vertex)
-
-      Elements = list(set(UniqueVertex))
-      Unique = []
-      for element in Elements:
-        repeat = UniqueVertex.count(element)
-        if repeat == 1:
-          Unique.append(element)
+      CenterEdges = ["%s.e[%s]" % (mesh, edge) for edge in CenterIndices]
+      #Now we have to check if the edges are connected or not
+      #We count the centre edges at each vertex. The ends of the chain only have one
+      VertexCount = np.bincount(topology.edgeVertices[CenterIndices].ravel())
+      Unique = np.flatnonzero(VertexCount == 1)
 
       #Unique has the number of vertices that are not joined by other edges
       #If it is more then 2, that means there is a hole in the geometry
       if len(Unique) == 2:
-        cmds.select(clear = True)
-        for edge in CenterEdges:
-          cmds.select(edge, add=True)
+        cmds.select(CenterEdges, r=True)
         CurrentCurve = cmds.polyToCurve(n='%s_ProfileCurve' % mesh, form=2, degree=1, ch=False)
         # We then rebuild the curve for standardise number of points
         spanNumber = 4
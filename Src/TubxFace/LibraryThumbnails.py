@@ -0,0 +1,83 @@
+'''
+This script loads the screenshots of the library meshes in the background for the library browser.
+The screenshots are scaled down to thumbnails once and kept in a thumbnail cache keyed by their modified time
+'''
+import os
+import hashlib
+import tempfile
+
+# from Qt import QtCore, QtGui
+from PySide import QtCore, QtGui
+
+# The size the screenshots are scaled down to
+ThumbnailSize = 200
+# The directory the thumbnails are cached in
+ThumbnailDirectory = os.path.join(tempfile.gettempdir(), "TubxFaceThumbnails")
+
+def getThumbnailPath(screenshot):
+  """
+  This function gets the path of the cached thumbnail of a screenshot. The path changes whenever the screenshot is saved again
+  Args:
+    screenshot: The path of the screenshot
+
+  Returns: The path of the thumbnail
+
+  """
+  status = os.stat(screenshot)
+  key = "%s|%r|%s" % (os.path.abspath(screenshot), status.st_mtime, status.st_size)
+  return os.path.join(ThumbnailDirectory, "%s.png" % hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+class ThumbnailSignals(QtCore.QObject):
+  """
+  This class holds the signal a ThumbnailLoader sends back, as a QRunnable cannot send signals itself
+  """
+  # The generation of the library list, the name of the library mesh and the QImage of the thumbnail
+  loaded = QtCore.Signal(object, object, object)
+
+class ThumbnailLoader(QtCore.QRunnable):
+  """
+  This class loads the thumbnail of one screenshot on a QThreadPool. It only works with QImage,
+  as QPixmap and QIcon can only be made in the UI thread
+  """
+  def __init__(self, generation, name, screenshot):
+    super(ThumbnailLoader, self).__init__()
+    self.generation = generation
+    self.name = name
+    self.screenshot = screenshot
+    self.signals = ThumbnailSignals()
+    # Set when the library list is filled again before this loader has started
+    self.cancelled = False
+
+  def run(self):
+    if self.cancelled:
+      return
+    try:
+      thumbnailPath = getThumbnailPath(self.screenshot)
+    except OSError:
+      return
+
+    image = QtGui.QImage(thumbnailPath)
+    if image.isNull():
+      image = QtGui.QImage(self.screenshot)
+      if image.isNull():
+        print "The screenshot %s could not be read" % self.screenshot
+        return
+      if image.width() > ThumbnailSize or image.height() > ThumbnailSize:
+        image = image.scaled(ThumbnailSize, ThumbnailSize, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+      # The thumbnail is written to a temporary file first, so another loader never reads half a thumbnail
+      if not os.path.isdir(ThumbnailDirectory):
+        try:
+          os.makedirs(ThumbnailDirectory)
+        except OSError:
+          pass
+      temporaryPath = "%s.%s.tmp.png" % (thumbnailPath, id(self))
+      if image.save(temporaryPath, "PNG"):
+        try:
+          if os.path.exists(thumbnailPath):
+            os.remove(thumbnailPath)
+          os.rename(temporaryPath, thumbnailPath)
+        except OSError:
+          if os.path.exists(temporaryPath):
+            os.remove(temporaryPath)
+
+    self.signals.loaded.emit(self.generation, self.name, image)
@@ -0,0 +1,150 @@
+'''
+This script caches the topology of the mesh parts, so the control curves and the vertex relationships
+do not have to select the border edges of the same mesh again and again
+'''
+from maya import cmds
+import maya.OpenMaya as om
+import numpy as np
+from TubxFaceCore import PartSegmentation
+reload(PartSegmentation)
+
+# The topology of each mesh part, keyed by the mesh name
+TopologyCache = {}
+
+def getMeshFn(mesh):
+  """
+  This function gets the mesh function set of a mesh
+  Args:
+    mesh: The name of the mesh
+
+  Returns: The MFnMesh of the mesh shape
+
+  """
+  selection = om.MSelectionList()
+  selection.add(mesh)
+  dagPath = om.MDagPath()
+  selection.getDagPath(0, dagPath)
+  dagPath.extendToShape()
+  return om.MFnMesh(dagPath)
+
+def getSignature(meshFn):
+  """
+  This function gets the vertex, edge and face count of a mesh. If any of them changes, so has the topology
+  Args:
+    meshFn: The MFnMesh of the mesh
+
+  Returns: The (vertices, edges, faces) tuple
+
+  """
+  return (meshFn.numVertices(), meshFn.numEdges(), meshFn.numPolygons())
+
+class MeshTopology:
+  """
+  This class stores the edges of a mesh part and which of them are on the border
+  """
+  def __init__(self, mesh):
+    self.mesh = mesh
+    meshFn = getMeshFn(mesh)
+    self.signature = getSignature(meshFn)
+    vertexCount, edgeCount, faceCount = self.signature
+
+    # We go through the edges once, storing the 2 vertices of each and whether it is a border edge
+    self.edgeVertices = np.zeros((edgeCount, 2), dtype=np.int64)
+    onBorder = np.zeros(edgeCount, dtype=bool)
+    dagPath = om.MDagPath()
+    meshFn.getPath(dagPath)
+    edgeIt = om.MItMeshEdge(dagPath)
+    while not edgeIt.isDone():
+      index = edgeIt.index()
+      self.edgeVertices[index] = [edgeIt.index(0), edgeIt.index(1)]
+      onBorder[index] = edgeIt.onBoundary()
+      edgeIt.next()
+
+    # The number of edges connected to each vertex
+    self.vertexDegree = np.bincount(self.edgeVertices.ravel(), minlength=vertexCount)
+
+    # The border edges in index order, like the selection Maya gives back
+    self.borderEdges = np.flatnonzero(onBorder)
+    self.borderEdgeVertices = self.edgeVertices[self.borderEdges]
+    self.borderVertices = np.unique(self.borderEdgeVertices)
+
+    # The border edges that are joined through their vertices form a border loop.
+    # The loops are ordered by their lowest edge, each with its edges in index order
+    roots = PartSegmentation.labelConnectedVertices(vertexCount, self.borderEdgeVertices[:, 0], self.borderEdgeVertices[:, 1])
+    edgeRoots = roots[self.borderEdgeVertices[:, 0]]
+    self.borderLoops = []
+    loopIndex = {}
+    for edge, root in zip(self.borderEdges.tolist(), edgeRoots.tolist()):
+      if root not in loopIndex:
+        loopIndex[root] = len(self.borderLoops)
+        self.borderLoops.append([])
+      self.borderLoops[loopIndex[root]].append(edge)
+
+  def getBorderEdgeNames(self):
+    """
+    Get the border edges as component names
+
+    Returns: The list of "mesh.e[index]" names
+
+    """
+    return ["%s.e[%s]" % (self.mesh, edge) for edge in self.borderEdges]
+
+  def getCornerVertices(self):
+    """
+    Get the corners of the border. Those are the border vertices with only 2 connecting edges
+
+    Returns: The list of "mesh.vtx[index]" names
+
+    """
+    corners = self.borderVertices[self.vertexDegree[self.borderVertices] == 2]
+    return ["%s.vtx[%s]" % (self.mesh, vertex) for vertex in corners]
+
+def getTopology(mesh):
+  """
+  This function gets the topology of a mesh from the cache. It is built again if the mesh was not cached
+  or its topology has changed since
+  Args:
+    mesh: The name of the mesh
+
+  Returns: The MeshTopology of the mesh
+
+  """
+  topology = TopologyCache.get(mesh)
+  if topology is None or topology.signature != getSignature(getMeshFn(mesh)):
+    topology = MeshTopology(mesh)
+    TopologyCache[mesh] = topology
+  return topology
+
+def buildTopology(meshes):
+  """
+  This function builds the topology of the mesh parts again. The parts are renamed the same way every time
+  the mesh is separated, so we do not trust the cache for them
+  Args:
+    meshes: The list of mesh names
+  """
+  for mesh in meshes:
+    TopologyCache[mesh] = MeshTopology(mesh)
+
+def clearTopology(meshes = None):
+  """
+  This function removes meshes from the topology cache
+  Args:
+    meshes: The list of mesh names to remove. If not given, the whole cache is cleared
+  """
+  if meshes is None:
+    TopologyCache.clear()
+    return
+  for mesh in meshes:
+    TopologyCache.pop(mesh, None)
+
+def getPositions(mesh):
+  """
+  This function reads the world positions of all the vertices of a mesh in one query
+  Args:
+    mesh: The name of the mesh
+
+  Returns: The (N, 3) array of vertex positions
+
+  """
+  positions = cmds.xform("%s.vtx[*]" % mesh, q=True, t=True, ws=True)
+  return np.array(positions, dtype=np.float64).reshape((-1, 3))
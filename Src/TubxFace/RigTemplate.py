@@ -0,0 +1,184 @@
+'''
+This script keeps the rigged library head of this session as a template. The first time a library mesh is used,
+its mesh parts, control curves, wires and relationship list are exported once the controls are built.
+The later runs with the same library mesh and resolution import the template again instead of separating the
+mesh and building every control again
+'''
+from maya import cmds
+import os
+import time
+import shutil
+import tempfile
+import ExportingData
+reload(ExportingData)
+import LibraryGeneration
+reload(LibraryGeneration)
+import MeshTopology
+reload(MeshTopology)
+
+# The directory the templates of every session are exported to
+TemplateRoot = os.path.join(tempfile.gettempdir(), "TubxFaceRigTemplates")
+# Every session exports to its own directory, so 2 Maya sessions never import or delete each other's templates
+TemplateDirectory = os.path.join(TemplateRoot, str(os.getpid()))
+# The directories of other sessions that have not changed for this many seconds are left over and deleted
+MaxTemplateAge = 2 * 24 * 60 * 60
+# The namespace a template is imported into, before it is moved to the root namespace
+TemplateNamespace = "TubxRigTemplate"
+
+# The template of each library mesh exported this session, keyed by the library name
+RigTemplates = {}
+
+def removeOldSessions():
+  """
+  This function deletes the template directories of other sessions that have not changed for MaxTemplateAge.
+  Those are left over from sessions that did not close the dialog, for example when Maya crashed
+  """
+  if not os.path.isdir(TemplateRoot):
+    return
+  now = time.time()
+  for session in os.listdir(TemplateRoot):
+    directory = os.path.join(TemplateRoot, session)
+    if directory == TemplateDirectory or not os.path.isdir(directory):
+      continue
+    try:
+      # A template that is exported again does not change the time of its directory, so we go by the newest file
+      modified = [os.path.getmtime(directory)]
+      modified += [os.path.getmtime(os.path.join(directory, fileName)) for fileName in os.listdir(directory)]
+      if now - max(modified) > MaxTemplateAge:
+        shutil.rmtree(directory)
+    except OSError:
+      pass
+
+def getTemplateKey(library, name, resolutionList):
+  """
+  This function gets what a template depends on. If any of it changes, the template is built again
+  Args:
+    library: The TubxLibrary the mesh is loaded from
+    name: The name of the library mesh
+    resolutionList: The list that contains the ctrl point resolution
+
+  Returns: The key of the template, None if the library mesh does not exist
+
+  """
+  stamps = []
+  for extension in ["ma", "json", ExportingData.PayloadExtension]:
+    path = os.path.join(library.DIRECTORY, "%s.%s" % (name, extension))
+    if os.path.exists(path):
+      stamps.append(ExportingData.getFileStamp(path))
+    elif extension == "ma":
+      return None
+    else:
+      stamps.append(None)
+  return [name, stamps, list(resolutionList)]
+
+def getSceneRoots():
+  """
+  This function gets the top level nodes of the scene, so the nodes a rig adds can be found afterwards
+
+  Returns: The set of top level nodes
+
+  """
+  return set(cmds.ls(assemblies=True, long=True))
+
+def saveTemplate(library, name, resolutionList, sceneRoots, Objects, relationshipList):
+  """
+  This function exports the rig that was built since sceneRoots were taken as the template of a library mesh
+  Args:
+    library: The TubxLibrary the mesh is loaded from
+    name: The name of the library mesh
+    resolutionList: The list that contains the ctrl point resolution
+    sceneRoots: The top level nodes of the scene before the library mesh was loaded
+    Objects: The mesh parts of the rig
+    relationshipList: The relationship list of the mesh parts
+  """
+  key = getTemplateKey(library, name, resolutionList)
+  if key is None:
+    return
+  rigRoots = [node for node in cmds.ls(assemblies=True, long=True) if node not in sceneRoots]
+  if not rigRoots:
+    return
+
+  if not os.path.isdir(TemplateDirectory):
+    os.makedirs(TemplateDirectory)
+  path = os.path.join(TemplateDirectory, "%s.ma" % name)
+  # The wires and base curves come along with the history of the parts and curves.
+  # The shaders come along too, so the imported parts can be given the same shaders of the scene again
+  cmds.select(rigRoots, replace=True)
+  cmds.file(path, force=True, type="mayaAscii", exportSelected=True, constructionHistory=True, shader=True)
+  cmds.select(clear=True)
+
+  RigTemplates[name] = {'key': key, 'path': path, 'Objects': list(Objects),
+                        'relationshipList': [list(relationship) for relationship in relationshipList]}
+  print "Rig template of %s saved to %s" % (name, path)
+
+def removeTemplate(name):
+  """
+  This function forgets the template of a library mesh and deletes its file
+  Args:
+    name: The name of the library mesh
+  """
+  template = RigTemplates.pop(name, None)
+  if template is not None and os.path.exists(template['path']):
+    os.remove(template['path'])
+
+def clearTemplates():
+  """
+  This function forgets every template and deletes the template directory of this session.
+  The directory also holds the templates exported before the module was reloaded, which RigTemplates no longer knows
+  """
+  RigTemplates.clear()
+  if os.path.isdir(TemplateDirectory):
+    shutil.rmtree(TemplateDirectory, ignore_errors=True)
+  removeOldSessions()
+
+def loadTemplate(library, name, resolutionList):
+  """
+  This function imports the template of a library mesh, if there is one for the library mesh as it is now
+  and the resolution. The imported rig has the same names as the rig the template was saved from
+  Args:
+    library: The TubxLibrary the mesh is loaded from
+    name: The name of the library mesh
+    resolutionList: The list that contains the ctrl point resolution
+
+  Returns: The relationship list and the mesh parts, like LibraryGeneration.createMeshAndControl.
+           None if there is no template to use
+
+  """
+  template = RigTemplates.get(name)
+  if template is None:
+    return None
+  if template['key'] != getTemplateKey(library, name, resolutionList) or not os.path.exists(template['path']):
+    print "The library mesh %s has changed, its rig is built again" % name
+    removeTemplate(name)
+    return None
+
+  # We import into a namespace first, so we can check nothing in the scene has the names of the rig
+  newNodes = cmds.file(template['path'], i=True, namespace=TemplateNamespace, returnNewNodes=True) or []
+  importedRoots = cmds.ls(newNodes, assemblies=True)
+  if not importedRoots:
+    return None
+  namespace = importedRoots[0].rpartition(":")[0]
+  importedNames = [node.rpartition(":")[2] for node in cmds.ls(newNodes, dag=True)]
+  clashes = [node for node in importedNames if cmds.objExists(node)]
+  if clashes:
+    print "The scene already has %s, the rig of %s is built again" % (", ".join(clashes[:5]), name)
+    cmds.namespace(removeNamespace=namespace, deleteNamespaceContent=True)
+    return None
+
+  # The parts are given the shaders of the scene, so separating the mesh by its shaders still works afterwards
+  LibraryGeneration.createShaders()
+  for shadingGroup in cmds.ls(newNodes, type="shadingEngine"):
+    sceneShadingGroup = shadingGroup.rpartition(":")[2]
+    if not cmds.objExists(sceneShadingGroup):
+      continue
+    members = cmds.sets(shadingGroup, q=True)
+    if members:
+      cmds.sets(members, edit=True, forceElement=sceneShadingGroup)
+    shaders = cmds.listConnections("%s.surfaceShader" % shadingGroup) or []
+    cmds.delete([shadingGroup] + shaders)
+  cmds.namespace(removeNamespace=namespace, mergeNamespaceWithRoot=True)
+
+  Objects = list(template['Objects'])
+  MeshTopology.buildTopology(Objects)
+  print "Rig of %s loaded from its template" % name
+  return [list(relationship) for relationship in template['relationshipList']], Objects
@@ -0,0 +1,170 @@
+'''
+This script lines up rings of points and matches points to their nearest targets
+'''
+import numpy as np
+
+# scipy is not shipped with every Maya. Without it we fall back to comparing every pair of points
+try:
+  from scipy.spatial import cKDTree
+except ImportError:
+  cKDTree = None
+
+def getSignedArea(ring):
+  """
+  This function gets the signed area of a closed ring of points in the front view using the shoelace formula
+  Args:
+    ring: The (N, 3) array of points going around the ring
+
+  Returns: The signed area, positive if the ring goes anti-clockwise and negative if it goes clockwise
+
+  """
+  x = ring[:, 0]
+  y = ring[:, 1]
+  return 0.5 * (np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+def alignRings(controlRing, deformRing):
+  """
+  This function lines a ring of deformation points up with a ring of control points.
+  The deformation ring is first turned to go around the same way as the control ring. We then try every cyclic
+  shift of it at once and keep the one where the points lie closest to the control points
+  Args:
+    controlRing: The (N, 3) points of the control ring
+    deformRing: The (N, 3) points of the deformation ring
+
+  Returns: The deformation ring going the same way as the control ring, and the index of the deformation point
+           that goes with the first control point
+
+  """
+  controlRing = np.asarray(controlRing, dtype=np.float64)
+  deformRing = np.asarray(deformRing, dtype=np.float64)
+
+  # We fix the direction with the sign of the area the rings go around
+  if getSignedArea(controlRing) * getSignedArea(deformRing) < 0:
+    print "Circle Control and deformation are going in opposite direction"
+    print "Reversing Deformations"
+    deformRing = deformRing[::-1]
+
+  # We compare the shapes of the rings, so we center both of them on the middle of their bounding box
+  control = controlRing - (controlRing.min(axis=0) + controlRing.max(axis=0)) / 2.0
+  deform = deformRing - (deformRing.min(axis=0) + deformRing.max(axis=0)) / 2.0
+
+  # distance[i, j] is the distance from control point i to deformation point j. The summed distance of a shift
+  # is then a sum along a wrapped diagonal of it, which we gather for every shift in one go
+  distance = np.sqrt(((control[:, np.newaxis, :] - deform[np.newaxis, :, :]) ** 2).sum(axis=2))
+  points = len(control)
+  rows = np.arange(points)[:, np.newaxis]
+  shifts = (rows + np.arange(points)[np.newaxis, :]) % points
+  summedDistance = distance[rows, shifts].sum(axis=0)
+
+  return deformRing, int(summedDistance.argmin())
+
+def getNearestCandidates(queryPoints, targetPoints, count):
+  """
+  This function finds the closest target points of every query point, closest first
+  Args:
+    queryPoints: The (N, 3) array of points to search from
+    targetPoints: The (M, 3) array of points to search in
+    count: The number of closest target points to find for each query point
+
+  Returns: The (N, count) array of target indices
+
+  """
+  count = min(count, len(targetPoints))
+  if cKDTree is not None:
+    # The tree is built once over the targets and queried for every point at once
+    indices = cKDTree(targetPoints).query(queryPoints, k=count)[1]
+    return np.asarray(indices).reshape((len(queryPoints), count))
+
+  distance = ((queryPoints[:, np.newaxis, :] - targetPoints[np.newaxis, :, :]) ** 2).sum(axis=2)
+  # A stable sort keeps the lowest index first when two targets are the same distance away
+  return distance.argsort(axis=1, kind="mergesort")[:, :count]
+
+def matchPointsGreedy(queryPoints, targetPoints):
+  """
+  This function gives each query point, in order, the closest target point that has not been taken yet
+  Args:
+    queryPoints: The (N, 3) array of points to match
+    targetPoints: The (M, 3) array of points to match to
+
+  Returns: The list of target indices for each query point, -1 if there were no target points left
+
+  """
+  # Each query point can only lose its closest targets to the points before it,
+  # so the N closest targets always hold a free one
+  candidates = getNearestCandidates(queryPoints, targetPoints, len(queryPoints))
+  taken = set()
+  matches = []
+  for row in candidates:
+    match = -1
+    for index in row:
+      if index not in taken:
+        match = int(index)
+        taken.add(match)
+        break
+    matches.append(match)
+  return matches
+
+def matchPointsOptimal(queryPoints, targetPoints):
+  """
+  This function matches every query point to a different target point such that the summed distance is the lowest,
+  using the Hungarian algorithm
+  Args:
+    queryPoints: The (N, 3) array of points to match
+    targetPoints: The (M, 3) array of points to match to
+
+  Returns: The list of target indices for each query point, -1 if there were no target points left
+
+  """
+  rows = len(queryPoints)
+  columns = len(targetPoints)
+  if rows > columns:
+    # Not every point can be matched, so we leave the points at the end without a target like the greedy matching does
+    return matchPointsOptimal(queryPoints[:columns], targetPoints) + [-1] * (rows - columns)
+
+  cost = np.sqrt(((queryPoints[:, np.newaxis, :] - targetPoints[np.newaxis, :, :]) ** 2).sum(axis=2))
+
+  # Row and column potentials. Column 0 is a dummy column that holds the row being added
+  rowPotential = np.zeros(rows + 1)
+  columnPotential = np.zeros(columns + 1)
+  # The row matched to each column, 0 if the column is free. Rows are counted from 1
+  columnRow = np.zeros(columns + 1, dtype=int)
+  previousColumn = np.zeros(columns + 1, dtype=int)
+
+  for row in range(1, rows + 1):
+    columnRow[0] = row
+    currentColumn = 0
+    slack = np.empty(columns + 1)
+    slack.fill(np.inf)
+    used = np.zeros(columns + 1, dtype=bool)
+    # We grow a tree of tight edges from the new row until it reaches a free column
+    while True:
+      used[currentColumn] = True
+      currentRow = columnRow[currentColumn]
+      reducedCost = cost[currentRow - 1] - rowPotential[currentRow] - columnPotential[1:]
+      lower = ~used[1:] & (reducedCost < slack[1:])
+      slack[1:][lower] = reducedCost[lower]
+      previousColumn[1:][lower] = currentColumn
+
+      freeSlack = np.where(used, np.inf, slack)
+      nextColumn = int(freeSlack.argmin())
+      delta = freeSlack[nextColumn]
+
+      rowPotential[columnRow[used]] += delta
+      columnPotential[used] -= delta
+      slack[~used] -= delta
+
+      currentColumn = nextColumn
+      if columnRow[currentColumn] == 0:
+        break
+
+    # We then flip the matches along the path back to the dummy column
+    while currentColumn:
+      lastColumn = previousColumn[currentColumn]
+      columnRow[currentColumn] = columnRow[lastColumn]
+      currentColumn = lastColumn
+
+  matches = [-1] * rows
+  for column in range(1, columns + 1):
+    if columnRow[column]:
+      matches[columnRow[column] - 1] = column - 1
+  return matches
@@ -0,0 +1,648 @@
+'''
+This script scans the front and side images for the various body parts and turns them into 3D coordinates
+'''
+import numpy as np
+from TubxFaceCore import MayaAdapter
+reload(MayaAdapter)
+from TubxFaceCore import ImageIndexing
+reload(ImageIndexing)
+from TubxFaceCore import ScanResult
+reload(ScanResult)
+from TubxFaceCore import ScanCache
+reload(ScanCache)
+
+# The colours of sourceimages/ColourPalette.png that the body parts are drawn in
+EyeColour = [255, 0, 0]
+NoseBridgeColour = [255, 255, 0]
+NoseColour = [0, 255, 0]
+MouthColour = [0, 0, 255]
+MouthLoopColour = [255, 0, 255]
+EyebrowColour = [0, 255, 255]
+EarColour = [178, 77, 0]
+SideProfileColour = [0, 0, 0]
+FrontProfileColour = [0, 128, 128]
+ColourPalette = [EyeColour, NoseBridgeColour, NoseColour, MouthColour, MouthLoopColour,
+                 EyebrowColour, EarColour, SideProfileColour, FrontProfileColour]
+
+# The body parts in the order they are scanned, with the function that scans each and the entry of the
+# resolutionList it takes. The ear and the profiles have a fixed number of points
+FeatureScans = [("Eye", "getEyeCoord", 0),
+                ("NoseBridge", "getNoseBridgeCoord", 5),
+                ("Nose", "getNoseCoord", 3),
+                ("Mouth", "getMouthCoord", 1),
+                ("MouthLoop", "getMouthLoopCoord", 2),
+                ("Eyebrow", "getEyebrowCoord", 4),
+                ("Ear", "getEarCoord", None),
+                ("SideProfile", "getSideProfileCoord", None),
+                ("FrontProfile", "getFrontProfileCoord", None)]
+
+def orderGroups(scanResult):
+  """
+  This function orders the eyes and ears of a finished scan from right to left, the same way
+  reverseName renames their locators
+  Args:
+    scanResult: The ScanResult of the scan
+  """
+  scanResult.reverseGroups("Eye", 8)
+  scanResult.reverseGroups("Ear", 5)
+
+class FaceScan:
+  """
+  This class takes in the front and side image and gets the 3D coordinates
+  """
+  def __init__(self, frontImage, sideImage):
+    self.frontImage = frontImage
+    self.sideImage = sideImage
+    # The hashes of the pixels key the ScanCache, so the same sketches scanned again reuse their contours
+    self.frontHash = frontImage.getContentHash()
+    self.sideHash = sideImage.getContentHash()
+    # We segment the images into the palette colours and index the coloured regions, so each body part is
+    # a lookup into the label map rather than a rescan of the image. This is only done once a contour
+    # is not in the ScanCache
+    self.frontIndex = None
+    self.sideIndex = None
+
+  def getFrontIndex(self):
+    """
+    Get the index of the front image, building it the first time
+
+    Returns: The ImageIndex of the front image
+
+    """
+    if self.frontIndex is None:
+      self.frontIndex = ImageIndexing.ImageIndex(self.frontImage, ColourPalette)
+    return self.frontIndex
+
+  def getSideIndex(self):
+    """
+    Get the index of the side image, building it the first time
+
+    Returns: The ImageIndex of the side image
+
+    """
+    if self.sideIndex is None:
+      self.sideIndex = ImageIndexing.ImageIndex(self.sideImage, ColourPalette)
+    return self.sideIndex
+
+  #The calling functions
+  def scanCoord(self, resolutionList):
+    """
+    This function scans the image into plain data without creating anything in Maya
+    Args:
+      resolutionList: The resolutionList contains points for the resolution of the control
+                      resolutionList = [eye, mouth, mouthloop, nose, eyebrow, nosebridge]
+
+    Returns: The ScanResult of the scan, in the order the locators are named
+    """
+    scanResult = ScanResult.ScanResult()
+
+    for name, scanName, resolutionIndex in FeatureScans:
+      self.scanFeature(scanResult, name, resolutionList)
+
+    orderGroups(scanResult)
+    return scanResult
+
+  def scanFeature(self, scanResult, name, resolutionList):
+    """
+    This function scans one body part into the scanResult
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+      name: The name of the body part, one of ScanResult.FeatureNames
+      resolutionList: The resolutionList contains points for the resolution of the control
+    """
+    for featureName, scanName, resolutionIndex in FeatureScans:
+      if featureName != name:
+        continue
+      print "Scanning %s" % name
+      if resolutionIndex is None:
+        getattr(self, scanName)(scanResult)
+      else:
+        getattr(self, scanName)(scanResult, resolutionList[resolutionIndex])
+      print "Got %s Coord" % name
+      return
+    MayaAdapter.error("There is no body part called %s" % name)
+
+  #The functions
+  def getFrontCoord(self, colour, startCoord, rowDirection, columnDirection, arrangement, isLine, points):
+    """
+    This function scans the image for the front coordinate
+    Args:
+      colour: The colour to scan
+      startCoord: The coordinate to start
+      rowDirection: The row direction
+      columnDirection: The column direction
+      arrangement: How the scanned data should be arranged to have a common point
+      isLine: Whether the scan data is supposed to be a line or a circle
+      points: How many points makes up that object
+
+    Returns: The list of coordinates for the front view
+
+    """
+    print "Doing Front"
+    # We create a list to hold the front coordinates
+    meshFrontLocation = []
+
+    # The contours are traced at full resolution once and resampled to the number of points here
+    for CoordList in self.getContours(self.frontHash, self.getFrontIndex, self.frontImage, colour, startCoord, rowDirection, columnDirection):
+      # We start the coordlist from a certain arrangement so we can get the same starting point in front and side
+      start = self.rearrangeIndex(CoordList, arrangement)
+
+      # We check if it is a line or not. If it is a line, we half the coordinates
+      length = len(CoordList)
+      if isLine == 1:
+        length = length / 2
+
+      # We then take note of a certain number of points in the CoordList, counting from the start
+      # We add the coordinates to the meshFrontLocation list
+      sampleIndex = (start + self.getSampleIndices(length, points)) % len(CoordList)
+      meshFrontLocation.extend(CoordList[sampleIndex].tolist())
+
+    return meshFrontLocation
+
+  def getSideCoord(self, colour, startCoord, rowDirection, columnDirection, arrangement, isLine):
+    """
+    This function scans the image for the side coordinate
+    Args:
+      colour: The colour to scan
+      startCoord: The coordinate to start
+      rowDirection: The row direction
+      columnDirection: The column direction
+      arrangement: How the scanned data should be arranged to have a common point
+      isLine: Whether the scan data is supposed to be a line or a circle
+
+    Returns: The list of coordinates for the side view
+
+    """
+    print "Doing Side"
+    # We create a list to hold the side coordinates
+    meshSideLocation = []
+
+    for CoordList in self.getContours(self.sideHash, self.getSideIndex, self.sideImage, colour, startCoord, rowDirection, columnDirection):
+      # We start the coordlist from a certain arrangement so we can get the same starting point in front and side
+      start = self.rearrangeIndex(CoordList, arrangement)
+      # We check if it is a line or not. If it is a line, we half the coordinates
+      length = len(CoordList)
+      if isLine == 1:
+        length = length / 2
+
+      # We add the coordinates to the meshSideLocation list
+      sampleIndex = (start + np.arange(length)) % len(CoordList)
+      meshSideLocation.extend(CoordList[sampleIndex].tolist())
+
+    return meshSideLocation
+
+  def getContours(self, imageHash, getIndex, image, colour, startCoord, rowDirection, columnDirection):
+    """
+    This function traces every shape of a colour in an image at full resolution.
+    The contours are kept in the ScanCache, so tracing the same image again is a lookup
+    Args:
+      imageHash: The hash of the image pixels
+      getIndex: The function that gets the ImageIndex of the image
+      image: The image to trace
+      colour: The colour to trace
+      startCoord: The coordinate to start
+      rowDirection: The row direction
+      columnDirection: The column direction
+
+    Returns: The list of traced contours, each an (N, 2) array of coordinates
+
+    """
+    cachedContours = ScanCache.getContours(imageHash)
+    key = (tuple(colour), tuple(startCoord), rowDirection, columnDirection)
+    if key in cachedContours:
+      return cachedContours[key]
+
+    contours = []
+    index = getIndex()
+
+    # We create a mechanism that triggers when there is infinite loop
+    CountLoop = 0
+
+    # Loop the view till no intended colour is detected
+    while True:
+      # Trigger mechanism when there is infinite loop
+      CountLoop += 1
+      if CountLoop > 10000:
+        print "CountLoop is more then 10000, mechanism to prevent infinite loop during get3DCoord activated"
+        break
+
+      # Detect the colour pixel
+      PixelDetected = index.detectColourPixel(colour, startCoord, rowDirection, columnDirection)
+
+      # If no pixel is detected
+      if len(PixelDetected) == 0:
+        break
+
+      # traceContour(self, colour, StartCoord, rowScan, columnScan)
+      CoordList, startCoord = image.traceContour(colour, PixelDetected, rowDirection, columnDirection)
+      contours.append(CoordList)
+
+    cachedContours[key] = contours
+    return contours
+
+  def get3DCoord(self, colour, startCoord, rowDirection, columnDirection, points, isLine = 1, arrangement = "LowestY", nearestMatch = 0):
+    """
+    This function gets the 3D coordinates of a front and side view
+    Args:
+      colour: The colour to detect
+      startCoord: The start coordinates of the scan
+      rowDirection: The row direction
+      columnDirection: The column direction
+      points: The number of points to scan
+      isLine: Whether we are scanning a circle or a line
+      arrangement: How the data should be arranged to start from a common point
+      nearestMatch: Whether a front coordinate with no side coordinate of the same y takes the side coordinate
+                    with the nearest y instead of being skipped
+
+    Returns: The 3D coordinates
+
+    """
+    #The same feature of the same images at the same resolution is only matched once
+    cachedCoords = ScanCache.getCoords(self.frontHash, self.sideHash)
+    key = (tuple(colour), tuple(startCoord), rowDirection, columnDirection, points, isLine, arrangement, nearestMatch)
+    if key not in cachedCoords:
+      cachedCoords[key] = self.match3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement, nearestMatch)
+
+    mesh3DCoord = cachedCoords[key]
+    if mesh3DCoord is None:
+      return
+    #We hand out a copy so the caller cannot change the cached coordinates
+    return [list(coord) for coord in mesh3DCoord]
+
+  def match3DCoord(self, colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement, nearestMatch):
+    """
+    This function matches the front and side coordinates of a colour into 3D coordinates. It is called by get3DCoord
+    when the coordinates are not in the ScanCache yet
+    Args:
+      colour: The colour to detect
+      startCoord: The start coordinates of the scan
+      rowDirection: The row direction
+      columnDirection: The column direction
+      points: The number of points to scan
+      isLine: Whether we are scanning a circle or a line
+      arrangement: How the data should be arranged to start from a common point
+      nearestMatch: Whether a front coordinate with no side coordinate of the same y takes the nearest side coordinate
+
+    Returns: The 3D coordinates, or None if they could not be matched
+
+    """
+    #We create a list to store the coordinates results
+    #If the colour is not drawn in the front view there are no contours, and so nothing to scan
+    meshFrontLocation = self.getFrontCoord(colour, startCoord, rowDirection, columnDirection, arrangement, isLine, points)
+    print "mesh front location has %s points" % len(meshFrontLocation)
+
+    #We check if any colour is detected in the front view first before we scan side view
+    if len(meshFrontLocation) == 0:
+      return
+
+    #Reset the startCoord
+    meshSideLocation = self.getSideCoord(colour, startCoord, rowDirection, columnDirection, arrangement, isLine)
+
+
+    #We check if any colour is detected in the side view. If there is no colour, there is an error
+    if len(meshSideLocation) == 0:
+      print "Detected colour [%s, %s, %s] in front but not side. Please check" % (colour[0], colour[1], colour[2])
+      return
+
+    print "mesh side location has %s points" % len(meshSideLocation)
+
+    #We now fix the offset between the front and the side location
+    #We get the highest and lowest y value from the front and side location in one sweep each
+    FrontLowestX, FrontLowestY, FrontHighestX, FrontHighestY = self.getExtremes(meshFrontLocation)
+    SideLowestX, SideLowestY, SideHighestX, SideHighestY = self.getExtremes(meshSideLocation)
+
+    #We then get the middle y for the 2 views and get the offset
+    #We keep it to int as pixels doesn't exist as floats.
+    FrontMiddleY = (FrontLowestY + FrontHighestY) / 2
+    SideMiddleY = (SideLowestY + SideHighestY) / 2
+    MidOffset = FrontMiddleY - SideMiddleY
+
+    #We add the offset to the meshSideLocation
+    for i in range(0, len(meshSideLocation)):
+      meshSideLocation[i][1] += MidOffset
+
+    #We check if the front y range is bigger then the side y range
+    FrontRangeY = FrontHighestY - FrontLowestY
+    SideRangeY = SideHighestY - SideLowestY
+    if FrontRangeY > SideRangeY:
+      MayaAdapter.warning("The side image for colour [%s, %s, %s] range is smaller then front image. Not enough data to calculate 3D values" % (colour[0], colour[1], colour[2]))
+      MayaAdapter.warning("The range values are FrontRange: %s, SideRange: %s" % (FrontRangeY, SideRangeY))
+      MayaAdapter.warning("The frontHighest Y is %s and the frontLowestY is %s" % (FrontHighestY, FrontLowestY))
+      MayaAdapter.warning("The sideHighest Y is %s and the sideLowestY is %s" % (SideHighestY, SideLowestY))
+      return
+
+    #We then get the matching Y coordinates from the meshFrontLocation and the meshSideLocation
+    #We index the side coordinates by their y value, keeping the first one found for each y
+    sideXByY = {}
+    for sideX, sideY in meshSideLocation:
+      if sideY not in sideXByY:
+        sideXByY[sideY] = sideX
+    sortedSideY = np.array(sorted(sideXByY))
+
+    mesh3DCoord = []
+
+    for i in range(0, len(meshFrontLocation)):
+      frontY = meshFrontLocation[i][1]
+      if frontY in sideXByY:
+        mesh3DCoord.append([meshFrontLocation[i][0], frontY, sideXByY[frontY]])
+      elif nearestMatch == 1:
+        #We take the side coordinate with the closest y, preferring the lower one when two are as close
+        index = np.searchsorted(sortedSideY, frontY)
+        if index == len(sortedSideY) or (index > 0 and frontY - sortedSideY[index - 1] <= sortedSideY[index] - frontY):
+          index -= 1
+        mesh3DCoord.append([meshFrontLocation[i][0], frontY, sideXByY[int(sortedSideY[index])]])
+      else:
+        print "There is no match found for meshFrontLocation[i][1] = %s" % frontY
+        print "Ensure your side view has more pixels then front"
+
+
+    return mesh3DCoord
+
+  def rearrangeIndex(self, coords, type):
+    """
+    This function finds where the data should start based on its type
+    Args:
+      coords: The coordinates to rearrange
+      type: The factor to rearrange to
+
+    Returns: The index of the first coordinate with the lowest or highest x or y
+
+    """
+    coords = np.asarray(coords)
+    if len(coords) == 0:
+      return 0
+    if type == "LowestX":
+      return int(coords[:, 0].argmin())
+    elif type == "LowestY":
+      return int(coords[:, 1].argmin())
+    elif type == "HighestX":
+      return int(coords[:, 0].argmax())
+    elif type == "HighestY":
+      return int(coords[:, 1].argmax())
+    return 0
+
+  def rearrange(self, list, type):
+    """
+    This function rearranges the data based on its type
+    Args:
+      list: The list to rearrange
+      type: The factor to rearrange to
+
+    Returns: The rearranged coordinates as an array
+
+    """
+    coords = np.asarray(list)
+    index = self.rearrangeIndex(coords, type)
+    #We rotate the coordinates so the index comes first
+    return coords[np.r_[index:len(coords), 0:index]]
+
+  def getExtremes(self, coords):
+    """
+    This function gets the lowest and highest x and y of the coordinates in one sweep
+    Args:
+      coords: The coordinates
+
+    Returns: The lowest x, lowest y, highest x and highest y
+
+    """
+    coords = np.asarray(coords)
+    lowest = coords.min(axis=0)
+    highest = coords.max(axis=0)
+    return int(lowest[0]), int(lowest[1]), int(highest[0]), int(highest[1])
+
+  def getSampleIndices(self, length, points):
+    """
+    This function gets the indices of a number of points spread evenly along a list
+    Args:
+      length: The length of the list
+      points: The number of points to take
+
+    Returns: The indices of the points
+
+    """
+    stride = length / float(points)
+    # We add the stride one step at a time so the indices land where the old sampling loop put them
+    return np.add.accumulate(np.r_[0.0, np.full(points - 1, stride)]).astype(np.int64)
+
+  def getEyeCoord(self, scanResult, points = 16):
+    """
+    This function gets the eye coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+      points: The resolution points to detect
+    """
+    colour = EyeColour
+    startCoord = [0,0]
+    rowDirection = "DownUp"
+    columnDirection = "LeftRight"
+    #points = 16
+    isLine = 0
+    arrangement = "LowestY"
+
+    Eye3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not Eye3DCoord:
+      print "No eyes were detected"
+      return
+
+    #As the eyes come with 16 points each, each other 16 points is another eye
+    scanResult.addFeature("Eye", Eye3DCoord, points)
+
+  def getNoseBridgeCoord(self, scanResult, points = 4):
+    """
+    This function gets the nose bridge coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+      points: The resolution points to detect
+    """
+    colour = NoseBridgeColour
+    startCoord = [0,0]
+    rowDirection = "LeftRight"
+    columnDirection = "DownUp"
+    #points = 4
+    isLine = 1
+    arrangement = "LowestY"
+
+    NoseBridge3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not NoseBridge3DCoord:
+      print "No nosebridge were detected"
+      return
+
+    #As the nosebridge come with a certain number of points each, each other few points is another nosebridge
+    scanResult.addFeature("NoseBridge", NoseBridge3DCoord, points)
+
+  def getNoseCoord(self, scanResult, points = 8):
+    """
+      This function gets the nose coordinates
+      Args:
+        scanResult: The ScanResult that stores the scanned coordinates
+        points: The resolution points to detect
+      """
+
+    colour = NoseColour
+    startCoord = [0, 0]
+    rowDirection = "DownUp"
+    columnDirection = "LeftRight"
+    #points = 8
+    isLine = 1
+    arrangement = "HighestY"
+
+    Nose3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not Nose3DCoord:
+      print "No nose was detected"
+      return
+
+    # As the nose come with 8 points each, each other 8 points is another nose
+    scanResult.addFeature("Nose", Nose3DCoord, 8)
+
+  def getMouthCoord(self, scanResult, points = 24):
+    """
+    This function gets the mouth coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+      points: The resolution points to detect
+    """
+
+    colour = MouthColour
+    startCoord = [0, 0]
+    rowDirection = "LeftRight"
+    columnDirection = "DownUp"
+    #points = 24
+    isLine = 0
+    arrangement = "LowestY"
+
+    Mouth3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not Mouth3DCoord:
+      print "No mouth was detected"
+      return
+
+    # As the mouth come with 24 points each, each other 24 points is another mouth
+    scanResult.addFeature("Mouth", Mouth3DCoord, points)
+
+  def getMouthLoopCoord(self, scanResult, points = 16):
+    """
+    This function gets the mouth loop coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+      points: The resolution points to detect
+    """
+
+    colour = MouthLoopColour
+    startCoord = [0, 0]
+    rowDirection = "LeftRight"
+    columnDirection = "DownUp"
+    #points = 16
+    isLine = 1
+    arrangement = "HighestY"
+
+    MouthLoop3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not MouthLoop3DCoord:
+      print "No mouthLoop was detected"
+      return
+
+    # As the mouthLoop come with 16 points each, each other 16 points is another mouthLoop
+    scanResult.addFeature("MouthLoop", MouthLoop3DCoord, points)
+
+  def getEyebrowCoord(self, scanResult, points = 16):
+    """
+    This function gets the eyebrow coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+      points: The resolution points to detect
+    """
+
+    colour = EyebrowColour
+    startCoord = [0, 0]
+    rowDirection = "LeftRight"
+    columnDirection = "DownUp"
+    #points = 16
+    isLine = 1
+    arrangement = "LowestX"
+
+    Eyebrow3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not Eyebrow3DCoord:
+      print "No eyebrow was detected"
+      return
+
+    # As the eyebrow come with 16 points each, each other 16 points is another eyebrow
+    scanResult.addFeature("Eyebrow", Eyebrow3DCoord, points)
+
+  def getEarCoord(self, scanResult):
+    """
+    This function gets the ear coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+    """
+
+    colour = EarColour
+    startCoord = [0, 0]
+    rowDirection = "LeftRight"
+    columnDirection = "DownUp"
+    points = 5
+    isLine = 1
+    arrangement = "HighestY"
+
+    Ear3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not Ear3DCoord:
+      print "No ear was detected"
+      return
+
+    # As the ear come with 5 points each, each other 5 points is another ear
+    scanResult.addFeature("Ear", Ear3DCoord, points)
+
+  def getSideProfileCoord(self, scanResult):
+    """
+    This function gets the side profile coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+    """
+
+    colour = SideProfileColour
+    startCoord = [0,0]
+    rowDirection = "LeftRight"
+    columnDirection = "DownUp"
+    arrangement = "LowestY"
+    isLine = 0
+
+    SideProfileCoord = self.getSideCoord(colour, startCoord, rowDirection, columnDirection, arrangement, isLine)
+    if not SideProfileCoord:
+      print "No Side Profile Coord detected"
+      return
+
+    #For the sake of checking, lets limit to 96 points
+    points = 96
+    # We then take note of a certain number of points in the SideProfileCoord
+    RefinedSideProfileCoord = [SideProfileCoord[i] for i in self.getSampleIndices(len(SideProfileCoord), points)]
+
+    # The side profile lies on the yz plane
+    scanResult.addFeature("SideProfile", [[0, i[1], i[0]] for i in RefinedSideProfileCoord], points)
+
+  def getFrontProfileCoord(self, scanResult):
+    """
+    This function gets the front profile coordinates
+    Args:
+      scanResult: The ScanResult that stores the scanned coordinates
+    """
+
+    colour = FrontProfileColour
+    startCoord = [0, 0]
+    rowDirection = "LeftRight"
+    columnDirection = "DownUp"
+    points = 25
+    isLine = 1
+    arrangement = "LowestX"
+
+    FrontProfile3DCoord = self.get3DCoord(colour, startCoord, rowDirection, columnDirection, points, isLine, arrangement)
+
+    if not FrontProfile3DCoord:
+      print "No front profile was detected"
+      return
+
+    # As the front profile come with 25 points each, each other 25 points is another front profile
+    scanResult.addFeature("FrontProfile", FrontProfile3DCoord, points)
@@ -0,0 +1,724 @@
+'''
+This script stores the pixels of an image in a NumPy array and scans and traces the coloured shapes in it
+'''
+import hashlib
+import numpy as np
+from TubxFaceCore import ImageIndexing
+reload(ImageIndexing)
+from TubxFaceCore import ImageDecoders
+reload(ImageDecoders)
+from TubxFaceCore import ImageCache
+reload(ImageCache)
+
+# The moore neighbours of a pixel, starting from the bottom in an anti clockwise fashion
+# Bottom, Bottom Right, Right, Top Right, Top, Top Left, Left, Bottom Left
+MooreOffsetX = [0, 1, 1, 1, 0, -1, -1, -1]
+MooreOffsetY = [-1, -1, 0, 1, 1, 1, 0, -1]
+# The direction we came from after moving to each neighbour. 0 is Right, 1 is Up, 2 is Left and 3 is Down
+MooreDirection = [0, 0, 1, 1, 2, 2, 3, 3]
+# The neighbour to start checking from for each direction we came from
+MooreStartIndex = [6, 0, 2, 4]
+# The direction a trace starts with for each row scan direction
+TraceStartDirection = {"LeftRight": 0, "DownUp": 1, "RightLeft": 2, "UpDown": 3}
+
+class ImageBuffer:
+  """
+  This class allows the querying of image data held in memory
+  """
+  def __init__(self, pixels):
+    # The pixels are a (height, width, 4) array of RGBA unsigned chars, with the bottom row first like MImage
+    self.pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    self.m_height, self.m_width = self.pixels.shape[:2]
+    # A flat (width * height, 4) view of the same buffer so we can index the same way MImage does
+    self.flatPixels = self.pixels.reshape((-1, 4))
+
+    # The boolean colour masks we have built so far, keyed by the (r, g, b) colour
+    self.colourMasks = {}
+    # The padded masks the contour tracer walks on, keyed by the (r, g, b) colour
+    self.traceMasks = {}
+    # The palette label of every pixel, filled in by segmentPalette
+    self.labelMap = None
+    self.paletteLabels = {}
+    # The hash of the pixels, filled in by getContentHash
+    self.contentHash = None
+
+  def getContentHash(self):
+    """
+    Get a hash of the size and pixels of the image. Images with the same pixels have the same hash
+
+    Returns: The hex digest of the pixels
+
+    """
+    if self.contentHash is None:
+      digest = hashlib.sha1(str(self.pixels.shape))
+      digest.update(self.pixels)
+      self.contentHash = digest.hexdigest()
+    return self.contentHash
+
+  def getPixel(self, x, y):
+    """
+    Get the pixel at coordinates X,Y
+    Args:
+      x: The X Coordinate
+      y: The Y Coordinate
+
+    Returns: The RGBA values of the pixel
+
+    """
+    #Check the bounds to make sure we are still within the image
+    if x<0 or x>self.m_width:
+      print "Error x out of bounds\n"
+      return
+    if y < 0 or y > self.m_height:
+      print "Error y out of bounds\n"
+      return
+
+    #Calculate the index of the pixel
+    index = (y * self.m_width) + x
+    if index >= len(self.flatPixels):
+      print "Error pixel out of bounds\n"
+      return
+
+    #Finally we grab the pixels
+    red, green, blue, alpha = self.flatPixels[index].tolist()
+
+    return red,green,blue,alpha
+
+  def getRGB(self, x, y):
+    """
+    Get the RGB values of a pixel at coordinates x and y
+    Args:
+      x: the X coordinate
+      y: the Y coordinate
+
+    Returns: The r,g,b values
+
+    """
+    r,g,b,a = self.getPixel(x,y)
+    return r,g,b
+
+  def width(self):
+    """
+    Get the width of the image
+    Returns: The width of the image
+
+    """
+    return self.m_width
+
+  def height(self):
+    """
+    Get the height of the image
+    Returns: The height of the image
+    """
+
+    return self.m_height
+
+  def getColourMask(self, colour):
+    """
+    Get a boolean mask of the pixels matching a colour. The mask is built once per colour and reused
+    Args:
+      colour: The colour to match
+
+    Returns: A (height, width) boolean array which is True where the pixel is of the colour
+
+    """
+    key = (colour[0], colour[1], colour[2])
+    if key not in self.colourMasks:
+      if key in self.paletteLabels:
+        # The colour is in the segmented palette, so we read it from the label map
+        self.colourMasks[key] = self.labelMap == self.paletteLabels[key]
+      else:
+        self.colourMasks[key] = ((self.pixels[:, :, 0] == colour[0]) &
+                                 (self.pixels[:, :, 1] == colour[1]) &
+                                 (self.pixels[:, :, 2] == colour[2]))
+    return self.colourMasks[key]
+
+  def segmentPalette(self, palette):
+    """
+    This function labels every pixel with the palette colour it is drawn in, in a single pass over the image
+    Args:
+      palette: The list of [r, g, b] colours
+
+    Returns: A (height, width) array holding the palette index of each pixel, or -1 where the pixel is not a palette colour
+
+    """
+    # We pack each pixel into one integer so the whole palette can be matched at once
+    packed = ((self.pixels[:, :, 0].astype(np.int32) << 16) |
+              (self.pixels[:, :, 1].astype(np.int32) << 8) |
+              self.pixels[:, :, 2])
+    paletteKeys = np.array([(colour[0] << 16) | (colour[1] << 8) | colour[2] for colour in palette], dtype=np.int32)
+
+    # We look every pixel up in the sorted palette and keep the ones that match exactly
+    order = np.argsort(paletteKeys)
+    sortedKeys = paletteKeys[order]
+    position = np.searchsorted(sortedKeys, packed).clip(0, len(palette) - 1)
+    matched = sortedKeys[position] == packed
+    self.labelMap = np.where(matched, order[position], -1).astype(np.int8)
+
+    self.paletteLabels = {}
+    for i in range(0, len(palette)):
+      self.paletteLabels[(palette[i][0], palette[i][1], palette[i][2])] = i
+    # Any mask built before the segmentation is still valid, but we rebuild them from the label map from now on
+    self.colourMasks = {}
+    self.traceMasks = {}
+    return self.labelMap
+
+  def detectMaskLoop(self, mask, outerStart, outerEnd, outerIncrement, innerStart, innerEnd, innerIncrement, resetRow):
+    """
+    This function finds the first True value of a mask in the same order as two nested for loops would visit it,
+    without looping in python. The mask is flipped so both loops run forwards, and the first hit is found with argmax
+    Args:
+      mask: The boolean mask indexed as [outer, inner]
+      outerStart: The start of the outer loop
+      outerEnd: The end of the outer loop
+      outerIncrement: How much to increment the outer loop, +1 or -1
+      innerStart: The start of the inner loop for the first row
+      innerEnd: The end of the inner loop
+      innerIncrement: How much to increment the inner loop, +1 or -1
+      resetRow: Where the inner loop starts for every row after the first
+
+    Returns: The outer and inner index of the first hit, or -1, -1 if there is none
+
+    """
+    outerSize, innerSize = mask.shape
+
+    # We flip the mask so that both loops run forwards, and convert the loop bounds to the flipped view
+    if outerIncrement < 0:
+      mask = mask[::-1, :]
+      outerStart, outerEnd = outerSize - 1 - outerStart, outerSize - 1 - outerEnd
+    if innerIncrement < 0:
+      mask = mask[:, ::-1]
+      innerStart, innerEnd = innerSize - 1 - innerStart, innerSize - 1 - innerEnd
+      resetRow = innerSize - 1 - resetRow
+
+    # A reset of the width or height is one past the edge of the image, so the row effectively starts at the edge
+    outerStart = max(outerStart, 0)
+    outerEnd = min(outerEnd, outerSize)
+    innerStart = max(innerStart, 0)
+    innerEnd = min(innerEnd, innerSize)
+    resetRow = max(resetRow, 0)
+
+    if outerStart >= outerEnd:
+      return -1, -1
+
+    # We first check the remainder of the row we are starting from
+    Hits = np.flatnonzero(mask[outerStart, innerStart:innerEnd])
+    if len(Hits) != 0:
+      outer, inner = outerStart, innerStart + Hits[0]
+    else:
+      # If there is nothing there, we find the first row with a hit and the first hit within that row
+      Rest = mask[outerStart + 1:outerEnd, resetRow:innerEnd]
+      RowHits = Rest.any(axis=1)
+      if not RowHits.any():
+        return -1, -1
+      row = RowHits.argmax()
+      outer, inner = outerStart + 1 + row, resetRow + Rest[row].argmax()
+
+    # We convert the indices back to the original orientation of the image
+    if outerIncrement < 0:
+      outer = outerSize - 1 - outer
+    if innerIncrement < 0:
+      inner = innerSize - 1 - inner
+
+    return int(outer), int(inner)
+
+  def detectHColourLoop(self, yStart, yEnd, yIncrement, xStart, xEnd, xIncrement, resetRow, colour):
+    """
+    This function scans the image if its row direction is horizontal
+    Args:
+      yStart: The start of the y coordinate
+      yEnd: The end of the y coordinate
+      yIncrement: How much to increment Y
+      xStart: The start of the x coordinate
+      xEnd: The end of the x coordinate
+      xIncrement: How much to increment X
+      resetRow: In the case we are starting from a middle of a row, when we move to the next row, it is the width of the image
+      colour: The colour to detect
+
+    Returns: The coordinates of the detected pixel
+
+    """
+    # Rows are the y coordinate and columns the x coordinate, which is how the mask is already stored
+    mask = self.getColourMask(colour)
+    DetectedY, DetectedX = self.detectMaskLoop(mask, yStart, yEnd, yIncrement, xStart, xEnd, xIncrement, resetRow)
+
+    return DetectedX, DetectedY
+
+  def detectVColourLoop(self, xStart, xEnd, xIncrement, yStart, yEnd, yIncrement, resetRow, colour):
+    """
+      This function scans the image if its row direction is vertical
+      Args:
+        xStart: The start of the x coordinate
+        xEnd: The end of the x coordinate
+        xIncrement: How much to increment X
+        yStart: The start of the y coordinate
+        yEnd: The end of the y coordinate
+        yIncrement: How much to increment Y
+        resetRow: In the case we are starting from a middle of a row, when we move to the next row, it is the height of the image
+        colour: The colour to detect
+
+      Returns: The coordinates of the detected pixel
+
+      """
+    # The outer loop runs over x, so we scan a transposed view of the mask
+    mask = self.getColourMask(colour).T
+    DetectedX, DetectedY = self.detectMaskLoop(mask, xStart, xEnd, xIncrement, yStart, yEnd, yIncrement, resetRow)
+
+    return DetectedX, DetectedY
+
+  def detectColourPixel(self, colour, StartCoord, rowDirection, columnDirection):
+    """
+    Get the coordinates of a pixel with the intended colour
+    Args:
+      colour: The intended colour to detect
+      StartCoord: The starting coordinates to scan from
+      rowDirection: The row direction of the scan
+      columnDirection: The column direction of the scan
+
+    Returns: The coordinates of the detected pixel
+
+    """
+
+    #We split the start coordinates for easy reference
+    xStart = StartCoord[0]
+    yStart = StartCoord[1]
+    DetectedX, DetectedY = -1,-1
+
+    #We now scan based on the rows and columns specified
+    if rowDirection == "LeftRight":
+      if columnDirection == "DownUp":
+        resetRow = 0
+        DetectedX, DetectedY = self.detectHColourLoop(yStart, self.m_height, +1, xStart, self.m_width, +1, resetRow, colour)
+
+      elif columnDirection == "UpDown":
+        resetRow = 0
+        DetectedX, DetectedY = self.detectHColourLoop(yStart, -1, -1, xStart, self.m_width, +1, resetRow, colour)
+
+    elif rowDirection == "RightLeft":
+      if columnDirection == "DownUp":
+        resetRow = self.m_width
+        DetectedX, DetectedY = self.detectHColourLoop(yStart, self.m_height, +1, xStart, -1, -1, resetRow, colour)
+      if columnDirection == "UpDown":
+        resetRow = self.m_width
+        DetectedX, DetectedY = self.detectHColourLoop(yStart, -1, -1, xStart, -1, -1, resetRow, colour)
+
+    elif rowDirection == "UpDown":
+      if columnDirection == "LeftRight":
+        resetRow = self.m_height
+        DetectedX, DetectedY = self.detectVColourLoop(xStart, self.m_width, +1, yStart, -1, -1, resetRow, colour)
+      elif columnDirection == "RightLeft":
+        resetRow = self.m_height
+        DetectedX, DetectedY = self.detectVColourLoop(xStart, -1, -1, yStart, -1, -1, resetRow, colour)
+
+    elif rowDirection == "DownUp":
+      if columnDirection == "LeftRight":
+        resetRow = 0
+        DetectedX, DetectedY = self.detectVColourLoop(xStart, self.m_width, +1, yStart, self.m_height, +1, resetRow, colour)
+      elif columnDirection == "RightLeft":
+        resetRow = 0
+        DetectedX, DetectedY = self.detectVColourLoop(xStart, -1, -1, yStart, self.m_height, +1, resetRow, colour)
+
+
+    if DetectedX == -1 and DetectedY == -1:
+      # No pixel detected
+      PixelCoordinates = []
+      return PixelCoordinates
+    else:
+      PixelCoordinates = [DetectedX,DetectedY]
+      return PixelCoordinates
+
+  def getLastMostPixel(self, TraceX, TraceY, rowScan, columnScan, LastMostPixel):
+    """
+    This function get the last most pixel depending on the direction of the scan for the scanning stage to continue after
+    the tracing stage
+    Args:
+      TraceX: The current X trace
+      TraceY: The current Y trace
+      rowScan: The row scan direction
+      columnScan: The column scan direction
+      LastMostPixel: The starting pixel
+
+    Returns: The last most pixel
+
+    """
+    if rowScan == "LeftRight":
+      if columnScan == "DownUp":
+        if LastMostPixel[1] < TraceY:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[1] == TraceY:
+          if LastMostPixel[0] < TraceX:
+            LastMostPixel = [TraceX, TraceY]
+
+      elif columnScan == "UpDown":
+        if LastMostPixel[1] > TraceY:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[1] == TraceY:
+          if LastMostPixel[0] < TraceX:
+            LastMostPixel = [TraceX, TraceY]
+
+    elif rowScan == "RightLeft":
+      if columnScan == "DownUp":
+        if LastMostPixel[1] < TraceY:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[1] == TraceY:
+          if LastMostPixel[0] > TraceX:
+            LastMostPixel = [TraceX, TraceY]
+      if columnScan == "UpDown":
+        if LastMostPixel[1] > TraceY:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[1] == TraceY:
+          if LastMostPixel[0] > TraceX:
+            LastMostPixel = [TraceX, TraceY]
+
+    elif rowScan == "UpDown":
+      if columnScan == "LeftRight":
+        if LastMostPixel[0] < TraceX:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[0] == TraceX:
+          if LastMostPixel[1] > TraceY:
+            LastMostPixel = [TraceX, TraceY]
+
+      elif columnScan == "RightLeft":
+        if LastMostPixel[0] > TraceX:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[0] == TraceX:
+          if LastMostPixel[1] > TraceY:
+            LastMostPixel = [TraceX, TraceY]
+
+    elif rowScan == "DownUp":
+      if columnScan == "LeftRight":
+        if LastMostPixel[0] < TraceX:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[0] == TraceX:
+          if LastMostPixel[1] < TraceY:
+            LastMostPixel = [TraceX, TraceY]
+
+      elif columnScan == "RightLeft":
+        if LastMostPixel[0] > TraceX:
+          LastMostPixel = [TraceX, TraceY]
+        elif LastMostPixel[0] == TraceX:
+          if LastMostPixel[1] < TraceY:
+            LastMostPixel = [TraceX, TraceY]
+
+    return LastMostPixel
+
+  def checkValidMovement(self, LastMovement, CurrentMovement):
+    """
+    This function checks if a movement during tracing is valid. It is to prevent infinite loops
+    However, with the new implementation of moore-neightbours algorithm, this is not used
+    Args:
+      LastMovement: The last movement during the trace
+      CurrentMovement: The current movement during the trace
+
+    Returns: A boolean value determining if a movement is valid or not
+
+    """
+    if LastMovement == 0 and CurrentMovement == 4:
+      print "During tracing, pixel last Movement goes bottom and next movement goes top. Redundant so skip"
+      return 0
+    elif LastMovement == 1 and CurrentMovement == 5:
+      print "During tracing, pixel last Movement goes bottom right and next movement goes top left. Redundant so skip"
+      return 0
+    elif LastMovement == 2 and CurrentMovement == 6:
+      print "During tracing, pixel last Movement goes right and next movement goes left. Redundant so skip"
+      return 0
+    elif LastMovement == 3 and CurrentMovement == 7:
+      print "During tracing, pixel last Movement goes bottom top right and next movement goes bottom left. Redundant so skip"
+      return 0
+    elif LastMovement == 4 and CurrentMovement == 0:
+      print "During tracing, pixel last Movement goes top and next movement goes bottom. Redundant so skip"
+      return 0
+    elif LastMovement == 5 and CurrentMovement == 1:
+      print "During tracing, pixel last Movement goes top left and next movement goes bottom right. Redundant so skip"
+      return 0
+    elif LastMovement == 6 and CurrentMovement == 2:
+      print "During tracing, pixel last Movement goes left and next movement goes right. Redundant so skip"
+      return 0
+    elif LastMovement == 7 and CurrentMovement == 3:
+      print "During tracing, pixel last Movement goes bottom bottom left and next movement goes top right. Redundant so skip"
+      return 0
+    return 1
+
+  def traceLine2(self, colour, StartCoord, rowScan, columnScan):
+    """
+    This function traces the pixel shape.
+    This function is depricated and is not used. Instead, traceLine which implements moore-neighbours algorithm is used
+    Args:
+      colour: The colour to trace
+      StartCoord: The starting coordinate of the trace
+      rowScan: The row direction
+      columnScan: The column direction
+
+    Returns: The scanned list as well as the last most pixel to continue scanning
+
+    """
+    # Split and get the coordinates
+    TraceX = StartCoord[0]
+    TraceY = StartCoord[1]
+
+    # This list "LastMostPixel" stores the pixel to continue detection scanning after tracing
+    LastMostPixel = StartCoord
+    # This is to check if it is the first action of tracing. This is because the loop will break when we arrive
+    # back to the starting coordinates
+    FirstAction = 1
+    # This list stores the coordinates of the detected pixels
+    CoordinateList = []
+
+    #Last movement is a variable to check how the pixel last moved. This is to prevent any forward backward movement
+    #during the trace which would result in an infinite loop
+    LastMovement = 0
+
+
+    # This is to provide a mechanism to prevent infinite loop
+    CountLoop = 0
+
+    while(True):
+      CountLoop += 1
+      if CountLoop > 10000:
+        print "CountLoop is more then 10000, mechanism to prevent infinite loop during tracing activated"
+        break
+
+      #We check if we have arrived back to the starting pixel
+      if TraceX == StartCoord[0] and TraceY == StartCoord[1] and FirstAction != 1:
+        break
+
+      #Once we first enter the loop, we set FirstAction to 0 as the next loop would not be the first action
+      FirstAction = 0
+
+      #Check pixel to see if it is the intended colour. If it is not, break
+      r,g,b = self.getRGB(TraceX, TraceY)
+      if r!=colour[0] and g!=colour[1] and b!=colour[2]:
+        break
+
+      #We register the coordinates since it is of the intended colour
+      #########################################
+      CoordinateList.append([TraceX-(self.m_width/2),TraceY-(self.m_height/2)])
+      #CoordinateList.append([TraceX, self.m_height-TraceY])
+      #########################################
+
+
+      #Register last most pixel based on the direction of the scan to find the next starting pixel
+      LastMostPixel = self.getLastMostPixel(TraceX, TraceY, rowScan, columnScan, LastMostPixel)
+
+      #Now we check where to move
+      #We create a few lists to guide pixel movement
+      ColourPixelList = []
+      MoveXList = [0, 1, 1, 1, 0, -1, -1, -1]
+      MoveYList = [-1, -1, 0, 1, 1, 1, 0, -1]
+
+      #We check the neighbouring pixels starting from the bottom in an anti clockwise fashion
+      #Bottom (b)
+      rb,gb,bb = self.getRGB(TraceX, TraceY-1)
+      ColourPixelList.append([rb,gb,bb])
+      #Bottom Right (br)
+      rbr, gbr, bbr = self.getRGB(TraceX + 1, TraceY - 1)
+      ColourPixelList.append([rbr, gbr, bbr])
+      #Right (r)
+      rr, gr, br = self.getRGB(TraceX + 1, TraceY)
+      ColourPixelList.append([rr, gr, br])
+      #Top Right (tr)
+      rtr, gtr, btr = self.getRGB(TraceX + 1, TraceY + 1)
+      ColourPixelList.append([rtr, gtr, btr])
+      #Top (t)
+      rt, gt, bt = self.getRGB(TraceX, TraceY + 1)
+      ColourPixelList.append([rt, gt, bt])
+      #Top Left (tl)
+      rtl, gtl, btl = self.getRGB(TraceX - 1, TraceY + 1)
+      ColourPixelList.append([rtl, gtl, btl])
+      #Left (l)
+      rl, gl, bl = self.getRGB(TraceX - 1, TraceY)
+      ColourPixelList.append([rl, gl, bl])
+      #Bottom Left(bl)
+      rbl, gbl, bbl = self.getRGB(TraceX - 1, TraceY - 1)
+      ColourPixelList.append([rbl, gbl, bbl])
+
+      #Next we determine where to move
+      hasMoved = 0
+      #If former element is some other colour and next element is the colour we are tracing, we move.
+      for i in range(1, 8):
+        if ColourPixelList[i - 1] != [colour[0], colour[1], colour[2]] and ColourPixelList[i] == [colour[0], colour[1], colour[2]]:
+          # This means previous cell was some other colour and the next cell is the colour we are tracing
+          # We check the last movement call, if it is just going backwards, we continue
+          ValidMovement = self.checkValidMovement(LastMovement, i)
+          if ValidMovement == 1:
+            TraceX += MoveXList[i]
+            TraceY += MoveYList[i]
+            hasMoved = 1
+            LastMovement = i
+            break
+
+      if ColourPixelList[7] != [colour[0], colour[1], colour[2]] and ColourPixelList[0] == [colour[0], colour[1], colour[2]] and hasMoved == 0:
+        TraceX += MoveXList[0]
+        TraceY += MoveYList[0]
+        LastMovement = 0
+        hasMoved = 1
+
+      if hasMoved == 0:
+        print "Pixel has not moved"
+        print "TraceX and TraceY is at [%s,%s]" % (TraceX, TraceY)
+        print "Photoshop Coordinates is TraceX and TraceY is at [%s,%s]" % (TraceX, self.m_height - TraceY)
+        break
+
+    if CountLoop>10000:
+      print "Coordinate list len before is : ", len(CoordinateList)
+      #If CountLoop is more then 10000, that means something went wrong. The pixel may be looping
+      #Around and around and was unable to get back to the starting position.
+      #In this case, we remove the repeated elements to refine the list
+      unique = []
+      for i in CoordinateList:
+        if i not in unique:
+          unique.append(i)
+
+      CoordinateList = unique
+      print "Coordinate list len after is : ", len(CoordinateList)
+
+    # We then add one to to LastMostPixel depending on direction of scanning
+    if rowScan == "LeftRight":
+        LastMostPixel[0] += 1
+
+    elif rowScan == "RightLeft":
+        LastMostPixel[0] -=1
+
+    elif rowScan == "UpDown":
+        LastMostPixel[1] -=1
+
+    elif rowScan == "DownUp":
+      LastMostPixel[1] += 1
+
+    return CoordinateList, LastMostPixel
+
+  def getTraceMask(self, colour):
+    """
+    Get the mask of a colour laid out for the contour tracer. The mask is padded with a border of background
+    pixels and flattened, so every neighbour of an image pixel is a fixed offset away
+    Args:
+      colour: The colour of the mask
+
+    Returns: The flat padded mask and the width of a padded row
+
+    """
+    key = (colour[0], colour[1], colour[2])
+    if key not in self.traceMasks:
+      padded = np.zeros((self.m_height + 2, self.m_width + 2), dtype=np.uint8)
+      padded[1:-1, 1:-1] = self.getColourMask(colour)
+      self.traceMasks[key] = (bytearray(padded.tobytes()), self.m_width + 2)
+    return self.traceMasks[key]
+
+  def traceContour(self, colour, StartCoord, rowScan, columnScan):
+    """
+    This function traces the pixel shape on the colour mask.
+    It uses moore-neighbour tracing algorithm and gives the same result as the original traceLine
+    Args:
+      colour: The colour to trace
+      StartCoord: The starting coordinate of the trace
+      rowScan: The row direction
+      columnScan: The column direction
+
+    Returns: The traced coordinates as an (N, 2) int array relative to the image centre, as well as
+             the last most pixel to continue scanning
+
+    """
+    mask, rowWidth = self.getTraceMask(colour)
+    # The offset to each neighbour in the flat padded mask
+    offsets = [MooreOffsetY[i] * rowWidth + MooreOffsetX[i] for i in range(0, 8)]
+
+    start = (StartCoord[1] + 1) * rowWidth + (StartCoord[0] + 1)
+    direction = TraceStartDirection[rowScan]
+    TraceList = []
+    looped = False
+
+    #Check the starting pixel to see if it is the intended colour. If it is not, we have nothing to trace
+    r, g, b = self.getRGB(StartCoord[0], StartCoord[1])
+    if not (r != colour[0] and g != colour[1] and b != colour[2]):
+      # We stop once we arrive back to the starting pixel. A trace that never gets back to it has to end up
+      # going around a loop, which we know we are in once we enter a pixel in the same way as before (Jacob's stopping criterion)
+      visited = set()
+      position = start
+      while True:
+        state = position * 4 + direction
+        if state in visited:
+          print "Tracing entered pixel [%s,%s] the same way twice without returning to the start" % (
+            position % rowWidth - 1, position / rowWidth - 1)
+          looped = True
+          break
+        visited.add(state)
+        TraceList.append(position)
+
+        index = MooreStartIndex[direction]
+        for i in range(0, 8):
+          if mask[position + offsets[index]]:
+            break
+          index = (index + 1) & 7
+        else:
+          print "Pixel has not moved"
+          print "TraceX and TraceY is at [%s,%s]" % (position % rowWidth - 1, position / rowWidth - 1)
+          break
+
+        position += offsets[index]
+        direction = MooreDirection[index]
+        if position == start:
+          break
+
+    TraceArray = np.array(TraceList, dtype=np.int64)
+    if looped:
+      # We went around a loop that does not contain the starting pixel, so we remove the repeated pixels
+      print "Coordinate list len before is : ", len(TraceArray)
+      unique, firstIndex = np.unique(TraceArray, return_index=True)
+      TraceArray = TraceArray[np.sort(firstIndex)]
+      print "Coordinate list len after is : ", len(TraceArray)
+
+    TraceX = TraceArray % rowWidth - 1
+    TraceY = TraceArray / rowWidth - 1
+    Contour = np.column_stack((TraceX - self.m_width / 2, TraceY - self.m_height / 2)).astype(np.int64)
+
+    #The last most pixel is the traced pixel that comes last in the scan order
+    LastMostPixel = [StartCoord[0], StartCoord[1]]
+    if len(TraceArray) != 0:
+      lastIndex = ImageIndexing.getScanKeys(TraceX, TraceY, self.m_width, self.m_height, rowScan, columnScan).argmax()
+      LastMostPixel = [int(TraceX[lastIndex]), int(TraceY[lastIndex])]
+
+    # We then add one to to LastMostPixel depending on direction of scanning
+    if rowScan == "LeftRight":
+      LastMostPixel[0] += 1
+
+    elif rowScan == "RightLeft":
+      LastMostPixel[0] -= 1
+
+    elif rowScan == "UpDown":
+      LastMostPixel[1] -= 1
+
+    elif rowScan == "DownUp":
+      LastMostPixel[1] += 1
+
+    return Contour, LastMostPixel
+
+  def traceLine(self, colour, StartCoord, rowScan, columnScan):
+    """
+    This function traces the pixel shape.
+    It uses moore-neighbour tracing algorithm through traceContour
+    Args:
+      colour: The colour to trace
+      StartCoord: The starting coordinate of the trace
+      rowScan: The row direction
+      columnScan: The column direction
+
+    Returns: The scanned list as well as the last most pixel to continue scanning
+
+    """
+    Contour, LastMostPixel = self.traceContour(colour, StartCoord, rowScan, columnScan)
+    return Contour.tolist(), LastMostPixel
+
+def readImage(filename, decoder = None, cache = True):
+  """
+  This function reads an image file into an ImageBuffer without Maya
+  Args:
+    filename: The path of the image
+    decoder: The name of the decoder to use. If not given, the first available decoder is used
+    cache: Whether the decoded pixels are read from and stored in the ImageCache
+
+  Returns: The ImageBuffer of the image
+
+  """
+  if cache:
+    return ImageBuffer(ImageCache.readImage(filename, decoder))
+  return ImageBuffer(ImageDecoders.decodeImage(filename, decoder))
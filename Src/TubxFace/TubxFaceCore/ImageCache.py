@@ -0,0 +1,162 @@
+'''
+This script keeps the decoded images on disk as .npy files named by the hash of the image file. When the same
+sketches are scanned again, the pixels are memory mapped from the cache instead of being decoded again
+'''
+import os
+import hashlib
+import tempfile
+import numpy as np
+from TubxFaceCore import ImageDecoders
+reload(ImageDecoders)
+
+# The environment variable that names the cache directory
+CacheVariable = "TUBXFACE_IMAGE_CACHE"
+# The cache directory used when the environment variable is not set
+DefaultCacheDirectory = os.path.join(tempfile.gettempdir(), "TubxFaceImageCache")
+# The most bytes the cache keeps on disk. The images used least recently are removed first
+MaxCacheSize = 256 * 1024 * 1024
+
+# The content hash of each file we have read, keyed by the path, so unchanged files are not hashed again
+FileHashes = {}
+
+def getCacheDirectory():
+  """
+  This function gets the cache directory, creating it if it does not exist
+
+  Returns: The path of the cache directory
+
+  """
+  directory = os.environ.get(CacheVariable) or DefaultCacheDirectory
+  if not os.path.isdir(directory):
+    os.makedirs(directory)
+  return directory
+
+def hashFile(filename):
+  """
+  This function hashes the contents of a file. The hash is reused until the size or time stamp of the file changes
+  Args:
+    filename: The path of the file
+
+  Returns: The hex digest of the file contents
+
+  """
+  status = os.stat(filename)
+  stamp = (status.st_size, status.st_mtime)
+  cached = FileHashes.get(filename)
+  if cached is not None and cached[0] == stamp:
+    return cached[1]
+
+  digest = hashlib.sha1()
+  with open(filename, "rb") as imageFile:
+    while True:
+      block = imageFile.read(1 << 20)
+      if not block:
+        break
+      digest.update(block)
+  FileHashes[filename] = (stamp, digest.hexdigest())
+  return digest.hexdigest()
+
+def loadCachedImage(cachePath):
+  """
+  This function memory maps a cached image. A cache file that cannot be read or has the wrong layout is removed
+  Args:
+    cachePath: The path of the .npy file
+
+  Returns: The read only (height, width, 4) array, or None if the cache file is not usable
+
+  """
+  try:
+    pixels = np.load(cachePath, mmap_mode="r")
+  except (IOError, ValueError):
+    pixels = None
+  if pixels is None or pixels.dtype != np.uint8 or pixels.ndim != 3 or pixels.shape[2] != 4:
+    removeCacheFile(cachePath)
+    return None
+  return pixels
+
+def removeCacheFile(cachePath):
+  """
+  This function removes a file from the cache, ignoring files that are already gone
+  Args:
+    cachePath: The path of the .npy file
+  """
+  try:
+    os.remove(cachePath)
+  except OSError:
+    pass
+
+def readImage(filename, decoder = None):
+  """
+  This function reads an image through the cache. On a miss the image is decoded and stored
+  Args:
+    filename: The path of the image
+    decoder: The name of the decoder to use on a miss. If not given, the first available decoder is used
+
+  Returns: The (height, width, 4) array of RGBA unsigned chars, bottom row first, memory mapped from the cache
+
+  """
+  directory = getCacheDirectory()
+  cachePath = os.path.join(directory, "%s.npy" % hashFile(filename))
+
+  if os.path.exists(cachePath):
+    pixels = loadCachedImage(cachePath)
+    if pixels is not None:
+      # We touch the file so the least recently used images are the ones with the oldest time stamp
+      os.utime(cachePath, None)
+      return pixels
+
+  pixels = ImageDecoders.decodeImage(filename, decoder)
+
+  # We write to a temporary file first, so another session never maps a half written file
+  handle, temporaryPath = tempfile.mkstemp(suffix = ".tmp", dir = directory)
+  try:
+    with os.fdopen(handle, "wb") as cacheFile:
+      np.save(cacheFile, np.ascontiguousarray(pixels, dtype = np.uint8))
+    if os.path.exists(cachePath):
+      removeCacheFile(cachePath)
+    os.rename(temporaryPath, cachePath)
+  except (IOError, OSError):
+    removeCacheFile(temporaryPath)
+    return pixels
+
+  trimCache(MaxCacheSize, keep = cachePath)
+  cached = loadCachedImage(cachePath)
+  return cached if cached is not None else pixels
+
+def trimCache(maxSize = None, keep = None):
+  """
+  This function removes the least recently used images until the cache fits within the size
+  Args:
+    maxSize: The most bytes to keep. If not given, MaxCacheSize is used
+    keep: The path of a cache file that is never removed, like the one just written
+  """
+  if maxSize is None:
+    maxSize = MaxCacheSize
+  directory = getCacheDirectory()
+  entries = []
+  totalSize = 0
+  for cacheFile in os.listdir(directory):
+    if not cacheFile.endswith(".npy"):
+      continue
+    cachePath = os.path.join(directory, cacheFile)
+    try:
+      status = os.stat(cachePath)
+    except OSError:
+      continue
+    entries.append((status.st_mtime, cachePath, status.st_size))
+    totalSize += status.st_size
+
+  for mtime, cachePath, size in sorted(entries):
+    if totalSize <= maxSize:
+      break
+    if cachePath == keep:
+      continue
+    removeCacheFile(cachePath)
+    totalSize -= size
+
+def clearCache():
+  """
+  This function removes every image from the cache
+  """
+  trimCache(0)
+  FileHashes.clear()
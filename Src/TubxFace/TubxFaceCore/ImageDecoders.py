@@ -0,0 +1,278 @@
+'''
+This script decodes image files into the RGBA arrays ImageBuffer scans. There are several decoders and
+the first one that is available is used, so the same scan can run inside Maya, with Pillow, or on plain Python
+'''
+import os
+import struct
+import zlib
+import numpy as np
+from TubxFaceCore import MayaAdapter
+reload(MayaAdapter)
+
+# The environment variable that names the decoder to use, so each deployment can pick the fastest one
+DecoderVariable = "TUBXFACE_IMAGE_DECODER"
+
+PNGSignature = "\x89PNG\r\n\x1a\n"
+# The number of channels of each PNG colour type. 0 is grey, 2 is RGB, 3 is palette, 4 is grey alpha and 6 is RGBA
+PNGChannels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+class ImageDecoder:
+  """
+  This class is the interface of an image decoder. Every decoder returns the image as a (height, width, 4) array
+  of RGBA unsigned chars with the bottom row first, the same layout MImage gives us
+  """
+  name = ""
+
+  def isAvailable(self):
+    """
+    Check if the decoder can run in this session
+
+    Returns: True if the decoder can be used
+
+    """
+    return False
+
+  def canDecode(self, filename):
+    """
+    Check if the decoder can read the file
+    Args:
+      filename: The path of the image
+
+    Returns: True if the decoder can read the file
+
+    """
+    return True
+
+  def decode(self, filename):
+    """
+    This function reads the image file
+    Args:
+      filename: The path of the image
+
+    Returns: The (height, width, 4) array of RGBA unsigned chars, bottom row first
+
+    """
+    raise NotImplementedError
+
+class PillowDecoder(ImageDecoder):
+  """
+  This class decodes the image through Pillow. It reads PNG, TIFF and everything else Pillow supports
+  """
+  name = "Pillow"
+
+  def isAvailable(self):
+    try:
+      from PIL import Image
+    except ImportError:
+      return False
+    return True
+
+  def decode(self, filename):
+    from PIL import Image
+    image = Image.open(filename)
+    try:
+      pixels = np.asarray(image.convert("RGBA"), dtype=np.uint8)
+    finally:
+      image.close()
+    # Pillow gives us the top row first
+    return np.ascontiguousarray(pixels[::-1])
+
+class PNGDecoder(ImageDecoder):
+  """
+  This class decodes PNG files with zlib and NumPy only. It is the slowest decoder, but it needs nothing installed
+  """
+  name = "PNG"
+
+  def isAvailable(self):
+    return True
+
+  def canDecode(self, filename):
+    with open(filename, "rb") as imageFile:
+      return imageFile.read(len(PNGSignature)) == PNGSignature
+
+  def decode(self, filename):
+    with open(filename, "rb") as imageFile:
+      data = imageFile.read()
+    if data[:len(PNGSignature)] != PNGSignature:
+      MayaAdapter.error("%s is not a PNG file" % filename)
+
+    # We go through the chunks, keeping the header, the palette and all the compressed image data
+    header = None
+    palette = None
+    transparency = None
+    compressed = []
+    offset = len(PNGSignature)
+    while offset < len(data):
+      length, chunkType = struct.unpack(">I4s", data[offset:offset + 8])
+      chunk = data[offset + 8:offset + 8 + length]
+      offset += length + 12
+      if chunkType == "IHDR":
+        header = struct.unpack(">IIBBBBB", chunk)
+      elif chunkType == "PLTE":
+        palette = np.frombuffer(chunk, dtype=np.uint8).reshape((-1, 3))
+      elif chunkType == "tRNS":
+        transparency = chunk
+      elif chunkType == "IDAT":
+        compressed.append(chunk)
+      elif chunkType == "IEND":
+        break
+
+    if header is None:
+      MayaAdapter.error("%s has no PNG header" % filename)
+    width, height, bitDepth, colourType, compression, filterMethod, interlace = header
+    if colourType not in PNGChannels or bitDepth not in (1, 2, 4, 8, 16) or interlace != 0:
+      MayaAdapter.error("%s uses a PNG format the PNG decoder does not support" % filename)
+
+    channels = PNGChannels[colourType]
+    # The number of bytes of each filtered row, and the number of bytes the filters look back
+    rowBytes = (width * channels * bitDepth + 7) // 8
+    pixelBytes = max(1, channels * bitDepth // 8)
+    raw = np.frombuffer(zlib.decompress("".join(compressed)), dtype=np.uint8)
+    raw = raw[:height * (rowBytes + 1)].reshape((height, rowBytes + 1))
+    rows = unfilterRows(raw[:, 0], raw[:, 1:], pixelBytes)
+
+    # We unpack the rows into one sample per channel
+    if bitDepth == 16:
+      # Only the high byte is kept, like the 8 bit images MImage gives us
+      samples = rows.reshape((height, -1, 2))[:, :, 0]
+    elif bitDepth < 8:
+      samples = np.unpackbits(rows, axis=1).reshape((height, -1, bitDepth))
+      weights = 1 << np.arange(bitDepth - 1, -1, -1)
+      samples = (samples * weights).sum(axis=2).astype(np.uint8)
+    else:
+      samples = rows
+    samples = samples[:, :width * channels].reshape((height, width, channels))
+
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    pixels[:, :, 3] = 255
+    if colourType == 3:
+      if palette is None:
+        MayaAdapter.error("%s has no PNG palette" % filename)
+      indices = samples[:, :, 0]
+      pixels[:, :, :3] = palette[indices]
+      if transparency is not None:
+        alpha = np.full(256, 255, dtype=np.uint8)
+        alpha[:len(transparency)] = np.frombuffer(transparency, dtype=np.uint8)
+        pixels[:, :, 3] = alpha[indices]
+    else:
+      colour = samples[:, :, :channels - 1] if colourType in (4, 6) else samples
+      if bitDepth < 8:
+        # Grey below 8 bits is scaled up to the full range
+        colour = (colour.astype(np.uint16) * 255 // ((1 << bitDepth) - 1)).astype(np.uint8)
+      pixels[:, :, :3] = colour
+      if colourType in (4, 6):
+        pixels[:, :, 3] = samples[:, :, channels - 1]
+      elif transparency is not None:
+        # A single colour of grey and RGB images can be marked as transparent
+        key = np.array(struct.unpack(">%dH" % (len(transparency) // 2), transparency))
+        if bitDepth == 16:
+          key = key >> 8
+        pixels[:, :, 3][(samples == key).all(axis=2)] = 0
+
+    # PNG stores the top row first
+    return np.ascontiguousarray(pixels[::-1])
+
+def unfilterRows(filterTypes, rows, pixelBytes):
+  """
+  This function undoes the PNG filter of every row
+  Args:
+    filterTypes: The filter type of each row
+    rows: The (height, rowBytes) array of filtered rows
+    pixelBytes: The number of bytes the filters look back
+
+  Returns: The (height, rowBytes) array of unfiltered rows
+
+  """
+  result = np.empty(rows.shape, dtype=np.uint8)
+  previous = np.zeros(rows.shape[1], dtype=np.uint8)
+  for y in range(0, rows.shape[0]):
+    filterType = filterTypes[y]
+    row = rows[y]
+    if filterType == 0:
+      current = row.copy()
+    elif filterType == 1:
+      # Each byte adds the byte one pixel to the left. Adding up each channel with wrap around does that at once
+      padding = (-len(row)) % pixelBytes
+      current = np.cumsum(np.append(row, np.zeros(padding, dtype=np.uint8)).reshape((-1, pixelBytes)), axis=0, dtype=np.uint8).ravel()[:len(row)]
+    elif filterType == 2:
+      current = row + previous
+    elif filterType == 3 or filterType == 4:
+      # The average and paeth filters depend on the byte just unfiltered, so they go byte by byte
+      current = bytearray(row.tobytes())
+      above = bytearray(previous.tobytes())
+      for i in range(0, len(current)):
+        left = current[i - pixelBytes] if i >= pixelBytes else 0
+        if filterType == 3:
+          current[i] = (current[i] + ((left + above[i]) >> 1)) & 255
+        else:
+          upperLeft = above[i - pixelBytes] if i >= pixelBytes else 0
+          estimate = left + above[i] - upperLeft
+          distanceLeft = abs(estimate - left)
+          distanceAbove = abs(estimate - above[i])
+          distanceUpperLeft = abs(estimate - upperLeft)
+          if distanceLeft <= distanceAbove and distanceLeft <= distanceUpperLeft:
+            predictor = left
+          elif distanceAbove <= distanceUpperLeft:
+            predictor = above[i]
+          else:
+            predictor = upperLeft
+          current[i] = (current[i] + predictor) & 255
+      current = np.frombuffer(bytes(current), dtype=np.uint8)
+    else:
+      MayaAdapter.error("Unknown PNG filter type %s" % filterType)
+    result[y] = current
+    previous = result[y]
+  return result
+
+# The decoders in the order they are tried
+Decoders = [PillowDecoder(), PNGDecoder()]
+
+def registerDecoder(decoder, first = False):
+  """
+  This function adds a decoder, replacing any decoder with the same name
+  Args:
+    decoder: The ImageDecoder to add
+    first: Whether the decoder is tried before all the others
+  """
+  for existing in Decoders[:]:
+    if existing.name == decoder.name:
+      Decoders.remove(existing)
+  if first:
+    Decoders.insert(0, decoder)
+  else:
+    Decoders.append(decoder)
+
+def getDecoder(filename, name = None):
+  """
+  This function picks the decoder for a file. If no name is given, the TUBXFACE_IMAGE_DECODER environment
+  variable is used, and failing that the first available decoder that can read the file
+  Args:
+    filename: The path of the image
+    name: The name of the decoder to use
+
+  Returns: The ImageDecoder
+
+  """
+  if name is None:
+    name = os.environ.get(DecoderVariable) or None
+  for decoder in Decoders:
+    if name is not None and decoder.name != name:
+      continue
+    if decoder.isAvailable() and decoder.canDecode(filename):
+      return decoder
+  if name is not None:
+    MayaAdapter.error("The image decoder %s is not available for %s" % (name, filename))
+  else:
+    MayaAdapter.error("No image decoder is available for %s" % filename)
+
+def decodeImage(filename, name = None):
+  """
+  This function reads an image file into an RGBA array
+  Args:
+    filename: The path of the image
+    name: The name of the decoder to use. If not given, the decoder is picked by getDecoder
+
+  Returns: The (height, width, 4) array of RGBA unsigned chars, bottom row first
+
+  """
+  return getDecoder(filename, name).decode(filename)
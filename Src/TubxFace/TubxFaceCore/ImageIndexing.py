@@ -0,0 +1,264 @@
+'''
+This script indexes the coloured regions of a maya image
+'''
+import numpy as np
+from TubxFaceCore import PartSegmentation
+reload(PartSegmentation)
+
+# The neighbouring pixels that connect to a pixel. We only need the forward half of the 8 neighbours,
+# as every connection is found from one of its two ends
+ForwardNeighbours = [(1, 0), (-1, 1), (0, 1), (1, 1)]
+
+def getScanKeys(x, y, width, height, rowDirection, columnDirection):
+  """
+  This function converts pixel coordinates into their position in the order detectColourPixel visits them.
+  A pixel with a smaller key is visited before a pixel with a bigger key
+  Args:
+    x: The x coordinates
+    y: The y coordinates
+    width: The width of the image
+    height: The height of the image
+    rowDirection: The row direction of the scan
+    columnDirection: The column direction of the scan
+
+  Returns: The scan order keys
+
+  """
+  if rowDirection == "LeftRight" or rowDirection == "RightLeft":
+    # The rows run horizontally, so y is the outer loop and x is the inner loop
+    if rowDirection == "RightLeft":
+      x = width - 1 - x
+    if columnDirection == "UpDown":
+      y = height - 1 - y
+    return y * width + x
+
+  # The rows run vertically, so x is the outer loop and y is the inner loop
+  if rowDirection == "UpDown":
+    y = height - 1 - y
+  if columnDirection == "RightLeft":
+    x = width - 1 - x
+  return x * height + y
+
+def getScanCoord(key, width, height, rowDirection, columnDirection):
+  """
+  This function converts a scan order key back into pixel coordinates
+  Args:
+    key: The scan order key
+    width: The width of the image
+    height: The height of the image
+    rowDirection: The row direction of the scan
+    columnDirection: The column direction of the scan
+
+  Returns: The x and y coordinates
+
+  """
+  if rowDirection == "LeftRight" or rowDirection == "RightLeft":
+    y, x = divmod(key, width)
+    if rowDirection == "RightLeft":
+      x = width - 1 - x
+    if columnDirection == "UpDown":
+      y = height - 1 - y
+    return x, y
+
+  x, y = divmod(key, height)
+  if rowDirection == "UpDown":
+    y = height - 1 - y
+  if columnDirection == "RightLeft":
+    x = width - 1 - x
+  return x, y
+
+def labelComponents(labelMap):
+  """
+  This function labels the 8-connected components of a label map. Two neighbouring pixels are connected
+  when they carry the same label, so every colour of a segmented image is labelled in one go.
+  It works on the list of labelled pixels only, joining neighbouring pixels with a vectorized union find
+  Args:
+    labelMap: The (height, width) integer label map, where a negative label is the background
+
+  Returns: The y and x coordinates of the labelled pixels, their label in the map, and the component label of each one
+
+  """
+  height, width = labelMap.shape
+  ys, xs = np.nonzero(labelMap >= 0)
+  pixelCount = len(ys)
+  if pixelCount == 0:
+    return ys, xs, np.zeros(0, dtype=labelMap.dtype), np.zeros(0, dtype=np.int64)
+  pixelLabels = labelMap[ys, xs]
+
+  # We number the labelled pixels so we can find a neighbour's number from its coordinates
+  pixelNumber = np.full(labelMap.shape, -1, dtype=np.int64)
+  pixelNumber[ys, xs] = np.arange(pixelCount)
+
+  # We collect every pair of neighbouring pixels with the same label
+  EdgeA = []
+  EdgeB = []
+  for dx, dy in ForwardNeighbours:
+    nx = xs + dx
+    ny = ys + dy
+    inside = (nx >= 0) & (nx < width) & (ny < height)
+    neighbour = np.full(pixelCount, -1, dtype=np.int64)
+    neighbour[inside] = pixelNumber[ny[inside], nx[inside]]
+    connected = np.flatnonzero(neighbour >= 0)
+    connected = connected[pixelLabels[neighbour[connected]] == pixelLabels[connected]]
+    EdgeA.append(connected)
+    EdgeB.append(neighbour[connected])
+  EdgeA = np.concatenate(EdgeA)
+  EdgeB = np.concatenate(EdgeB)
+
+  # The pixels are joined the same way the vertices of a mesh are, through the pairs of neighbours
+  parent = PartSegmentation.labelConnectedVertices(pixelCount, EdgeA, EdgeB)
+
+  # We renumber the roots so the labels run from 0
+  roots, labels = np.unique(parent, return_inverse=True)
+  return ys, xs, pixelLabels, labels
+
+class ColourComponent:
+  """
+  This class stores the information of one connected region of a colour
+  """
+  def __init__(self, boundingBox, pixelCount, scanKey):
+    # The bounding box is [minX, minY, maxX, maxY]
+    self.boundingBox = boundingBox
+    self.pixelCount = pixelCount
+    # The scan order key of the first pixel of the component for the default scan of LeftRight and DownUp
+    self.scanKey = scanKey
+
+class ImageIndex:
+  """
+  This class indexes the connected components of every palette colour of a maya image.
+  Scanning for a colour is then a lookup into the index rather than a rescan of the image
+  """
+  def __init__(self, image, palette):
+    """
+    This function builds the index
+    Args:
+      image: The MayaImage to index
+      palette: The list of [r, g, b] colours to index
+    """
+    self.image = image
+    self.m_width = image.width()
+    self.m_height = image.height()
+
+    # The components of each colour, keyed by the (r, g, b) colour
+    self.components = {}
+    # The coordinates of the pixels of each colour
+    self.pixelCoords = {}
+    # The sorted scan order keys of the pixels of each colour, keyed by colour and scan direction
+    self.scanKeys = {}
+
+    # We segment the image into the palette colours in a single pass and label the components of
+    # every colour together. Each colour is then a slice of the labelled pixels
+    ys, xs, pixelLabels, labels = labelComponents(image.segmentPalette(palette))
+    order = np.argsort(pixelLabels, kind='mergesort')
+    starts = np.searchsorted(pixelLabels[order], np.arange(len(palette) + 1))
+    for i in range(0, len(palette)):
+      colourPixels = order[starts[i]:starts[i + 1]]
+      self.storeComponents(palette[i], xs[colourPixels], ys[colourPixels], labels[colourPixels])
+
+  def indexColour(self, colour):
+    """
+    This function labels the components of a colour that is not in the palette and stores their information
+    Args:
+      colour: The colour to index
+    """
+    mask = self.image.getColourMask(colour)
+    ys, xs, pixelLabels, labels = labelComponents(np.where(mask, 0, -1).astype(np.int8))
+    self.storeComponents(colour, xs, ys, labels)
+
+  def storeComponents(self, colour, xs, ys, labels):
+    """
+    This function stores the pixels and component information of a colour
+    Args:
+      colour: The colour
+      xs: The x coordinates of the pixels of the colour
+      ys: The y coordinates of the pixels of the colour
+      labels: The component label of each pixel
+    """
+    key = (colour[0], colour[1], colour[2])
+    self.pixelCoords[key] = (xs, ys)
+
+    ComponentList = []
+    if len(labels) != 0:
+      # We sort the pixels by their label so each component is one slice
+      order = np.argsort(labels, kind='mergesort')
+      starts = np.flatnonzero(np.r_[1, np.diff(labels[order])])
+      sortedX = xs[order]
+      sortedY = ys[order]
+      sortedKeys = getScanKeys(sortedX, sortedY, self.m_width, self.m_height, "LeftRight", "DownUp")
+
+      minX = np.minimum.reduceat(sortedX, starts)
+      minY = np.minimum.reduceat(sortedY, starts)
+      maxX = np.maximum.reduceat(sortedX, starts)
+      maxY = np.maximum.reduceat(sortedY, starts)
+      firstKey = np.minimum.reduceat(sortedKeys, starts)
+      pixelCount = np.diff(np.r_[starts, len(order)])
+
+      for i in range(0, len(starts)):
+        ComponentList.append(ColourComponent([int(minX[i]), int(minY[i]), int(maxX[i]), int(maxY[i])],
+                                             int(pixelCount[i]), int(firstKey[i])))
+
+      # We keep the components in the order the default scan would find them
+      ComponentList.sort(key=lambda component: component.scanKey)
+
+    self.components[key] = ComponentList
+
+  def getComponents(self, colour):
+    """
+    Get the connected components of a colour
+    Args:
+      colour: The colour
+
+    Returns: The list of components in scan order
+
+    """
+    key = (colour[0], colour[1], colour[2])
+    if key not in self.components:
+      self.indexColour(colour)
+    return self.components[key]
+
+  def getSortedScanKeys(self, colour, rowDirection, columnDirection):
+    """
+    Get the sorted scan order keys of every pixel of a colour for a scan direction
+    Args:
+      colour: The colour
+      rowDirection: The row direction of the scan
+      columnDirection: The column direction of the scan
+
+    Returns: The sorted keys
+
+    """
+    key = (colour[0], colour[1], colour[2])
+    if key not in self.pixelCoords:
+      self.indexColour(colour)
+    scanKey = (key, rowDirection, columnDirection)
+    if scanKey not in self.scanKeys:
+      xs, ys = self.pixelCoords[key]
+      self.scanKeys[scanKey] = np.sort(getScanKeys(xs, ys, self.m_width, self.m_height, rowDirection, columnDirection))
+    return self.scanKeys[scanKey]
+
+  def detectColourPixel(self, colour, StartCoord, rowDirection, columnDirection):
+    """
+    Get the coordinates of the first pixel with the intended colour from a start coordinate.
+    This gives the same result as MayaImage.detectColourPixel
+    Args:
+      colour: The intended colour to detect
+      StartCoord: The starting coordinates to scan from
+      rowDirection: The row direction of the scan
+      columnDirection: The column direction of the scan
+
+    Returns: The coordinates of the detected pixel
+
+    """
+    if not self.getComponents(colour):
+      return []
+
+    # The first pixel found is the one with the smallest key that is not before the start coordinate
+    sortedKeys = self.getSortedScanKeys(colour, rowDirection, columnDirection)
+    startKey = getScanKeys(StartCoord[0], StartCoord[1], self.m_width, self.m_height, rowDirection, columnDirection)
+    index = np.searchsorted(sortedKeys, startKey)
+    if index == len(sortedKeys):
+      # No pixel detected
+      return []
+
+    DetectedX, DetectedY = getScanCoord(int(sortedKeys[index]), self.m_width, self.m_height, rowDirection, columnDirection)
+    return [DetectedX, DetectedY]
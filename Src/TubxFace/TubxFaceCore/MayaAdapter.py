@@ -0,0 +1,38 @@
+'''
+This script is the only place the core talks to Maya. Outside of Maya the messages are printed instead
+'''
+try:
+  from maya import cmds
+except ImportError:
+  cmds = None
+
+def hasMaya():
+  """
+  Check if we are running inside Maya
+
+  Returns: True if maya.cmds could be imported
+
+  """
+  return cmds is not None
+
+def warning(message):
+  """
+  This function shows a warning in Maya, or prints it outside of Maya
+  Args:
+    message: The warning to show
+  """
+  if cmds is not None:
+    cmds.warning(message)
+  else:
+    print "Warning: %s" % message
+
+def error(message):
+  """
+  This function raises an error through Maya, or a RuntimeError outside of Maya
+  Args:
+    message: The error to raise
+  """
+  if cmds is not None:
+    cmds.error(message)
+  else:
+    raise RuntimeError(message)
@@ -0,0 +1,93 @@
+'''
+This script reads and writes the binary mesh payload of a library mesh. The payload is a small JSON header
+followed by raw little endian arrays, so each array can be memory mapped straight from the file
+'''
+import os
+import json
+import struct
+import numpy as np
+
+PayloadMagic = "TUBXMESH"
+PayloadVersion = 1
+# Every array starts on a multiple of this many bytes
+PayloadAlignment = 16
+
+def alignOffset(offset):
+  """
+  This function rounds an offset up to the payload alignment
+  Args:
+    offset: The offset in bytes
+
+  Returns: The aligned offset
+
+  """
+  return (offset + PayloadAlignment - 1) // PayloadAlignment * PayloadAlignment
+
+def writePayload(path, arrays, info = None):
+  """
+  This function writes arrays to a payload file. It is written to a temporary file first, so a payload
+  that is being read is never half written
+  Args:
+    path: The path of the payload
+    arrays: The dictionary of NumPy arrays to write, keyed by their name
+    info: A dictionary of extra information that can be stored as JSON
+  """
+  # We lay the arrays out one after another, each on an aligned offset from the start of the data
+  entries = []
+  storedArrays = []
+  offset = 0
+  for name in sorted(arrays):
+    array = np.ascontiguousarray(arrays[name])
+    array = array.astype(array.dtype.newbyteorder("<"), copy = False)
+    offset = alignOffset(offset)
+    entries.append({"name": name, "dtype": array.dtype.str, "shape": list(array.shape), "offset": offset})
+    storedArrays.append((offset, array))
+    offset += array.nbytes
+
+  header = json.dumps({"info": info or {}, "arrays": entries})
+  dataStart = alignOffset(len(PayloadMagic) + 8 + len(header))
+
+  temporaryPath = "%s.tmp" % path
+  with open(temporaryPath, "wb") as payloadFile:
+    payloadFile.write(PayloadMagic)
+    payloadFile.write(struct.pack("<II", PayloadVersion, len(header)))
+    payloadFile.write(header)
+    for arrayOffset, array in storedArrays:
+      payloadFile.write("\0" * (dataStart + arrayOffset - payloadFile.tell()))
+      payloadFile.write(array.tobytes())
+  if os.path.exists(path):
+    os.remove(path)
+  os.rename(temporaryPath, path)
+
+def readPayload(path):
+  """
+  This function reads a payload file. The arrays are memory mapped read only, nothing is copied until they are used
+  Args:
+    path: The path of the payload
+
+  Returns: The info dictionary and the dictionary of arrays keyed by their name
+
+  """
+  with open(path, "rb") as payloadFile:
+    if payloadFile.read(len(PayloadMagic)) != PayloadMagic:
+      raise ValueError("%s is not a mesh payload" % path)
+    version, headerLength = struct.unpack("<II", payloadFile.read(8))
+    if version != PayloadVersion:
+      raise ValueError("%s is a version %s mesh payload, only version %s can be read" % (path, version, PayloadVersion))
+    header = json.loads(payloadFile.read(headerLength))
+  dataStart = alignOffset(len(PayloadMagic) + 8 + headerLength)
+  fileSize = os.path.getsize(path)
+
+  arrays = {}
+  for entry in header["arrays"]:
+    dtype = np.dtype(str(entry["dtype"]))
+    shape = tuple(entry["shape"])
+    offset = dataStart + entry["offset"]
+    if offset + dtype.itemsize * int(np.prod(shape)) > fileSize:
+      raise ValueError("The array %s of %s is cut short" % (entry["name"], path))
+    if np.prod(shape) == 0:
+      # An empty file region cannot be memory mapped
+      arrays[str(entry["name"])] = np.zeros(shape, dtype = dtype)
+    else:
+      arrays[str(entry["name"])] = np.memmap(path, dtype = dtype, mode = "r", offset = offset, shape = shape)
+  return header["info"], arrays
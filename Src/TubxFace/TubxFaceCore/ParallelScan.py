@@ -0,0 +1,146 @@
+'''
+This script scans the body parts of a front and side image in parallel, one body part per worker process.
+The images are decoded once into the ImageCache and every worker memory maps the same cache files
+'''
+import os
+import sys
+import multiprocessing
+from TubxFaceCore import ImageCache
+reload(ImageCache)
+from TubxFaceCore import ImageBuffer
+reload(ImageBuffer)
+from TubxFaceCore import FaceScan
+reload(FaceScan)
+from TubxFaceCore import ScanResult
+reload(ScanResult)
+
+# concurrent.futures comes with Python 3. On Python 2 it needs the futures backport,
+# without it the body parts are scanned one after another
+try:
+  from concurrent import futures
+except ImportError:
+  futures = None
+
+# The FaceScan each worker process builds for its image pair, so the body parts after the first reuse its indexes
+WorkerScans = {}
+
+def hasPool():
+  """
+  Check if body parts can be scanned in parallel
+
+  Returns: True if concurrent.futures could be imported
+
+  """
+  return futures is not None
+
+def isInteractiveMaya():
+  """
+  Check if we run inside the Maya application rather than mayapy or another Python.
+  Inside Maya sys.executable is Maya itself, maya.exe, maya.bin or Maya
+
+  Returns: True inside the Maya application
+
+  """
+  name, extension = os.path.splitext(os.path.basename(sys.executable))
+  return name.lower() == "maya"
+
+def canForkWorkers():
+  """
+  Check if worker processes can be started from this process. Outside Windows the workers are forked from this
+  process, and forking the Maya application with its interface and render threads can hang or crash it.
+  So inside the Maya application the body parts are only scanned in parallel on Windows, where the workers
+  are started as new mayapy processes
+
+  Returns: True if worker processes can be started
+
+  """
+  return sys.platform == "win32" or not isInteractiveMaya()
+
+def getPythonExecutable():
+  """
+  This function gets the Python the worker processes are started with.
+  Inside Maya sys.executable is Maya itself, so we start mayapy from the same directory instead
+
+  Returns: The path of the Python executable
+
+  """
+  directory, executable = os.path.split(sys.executable)
+  if isInteractiveMaya():
+    name, extension = os.path.splitext(executable)
+    return os.path.join(directory, "mayapy" + extension)
+  return sys.executable
+
+def scanFeature(frontImagePath, sideImagePath, decoder, name, resolutionList):
+  """
+  This function scans one body part in a worker process
+  Args:
+    frontImagePath: The path of the front image
+    sideImagePath: The path of the side image
+    decoder: The name of the image decoder
+    name: The name of the body part
+    resolutionList: The resolutionList contains points for the resolution of the control
+
+  Returns: The list of point groups of the body part
+
+  """
+  key = (frontImagePath, sideImagePath, decoder)
+  scan = WorkerScans.get(key)
+  if scan is None:
+    WorkerScans.clear()
+    scan = FaceScan.FaceScan(ImageBuffer.readImage(frontImagePath, decoder), ImageBuffer.readImage(sideImagePath, decoder))
+    WorkerScans[key] = scan
+  scanResult = ScanResult.ScanResult()
+  scan.scanFeature(scanResult, name, resolutionList)
+  return scanResult.getGroups(name)
+
+def scanCoord(frontImagePath, sideImagePath, resolutionList, decoder = None, workers = None):
+  """
+  This function scans the images the same way FaceScan.scanCoord does, with the body parts spread over a process pool.
+  The results are merged in the order the body parts are scanned, so they do not depend on which worker finishes first.
+  The parallel scan is meant for mayapy and batch use. Inside the Maya application on Linux and macOS the body parts
+  are scanned one after another, as the workers would be forked from Maya. Each worker has its own ScanCache,
+  so a parallel scan does not reuse the contours the serial scans of this session cached
+  Args:
+    frontImagePath: The path of the front image
+    sideImagePath: The path of the side image
+    resolutionList: The resolutionList contains points for the resolution of the control
+                    resolutionList = [eye, mouth, mouthloop, nose, eyebrow, nosebridge]
+    decoder: The name of the image decoder. If not given, the first available decoder is used
+    workers: The number of worker processes. If not given, one per core up to one per body part
+
+  Returns: The ScanResult of the scan
+
+  """
+  if workers is None:
+    workers = min(multiprocessing.cpu_count(), len(FaceScan.FeatureScans))
+
+  if futures is None or workers <= 1 or not canForkWorkers():
+    print "Scanning the body parts one after another"
+    scan = FaceScan.FaceScan(ImageBuffer.readImage(frontImagePath, decoder), ImageBuffer.readImage(sideImagePath, decoder))
+    return scan.scanCoord(resolutionList)
+
+  # We decode the images here, so the workers only map the cache files instead of each decoding them again
+  ImageCache.readImage(frontImagePath, decoder)
+  ImageCache.readImage(sideImagePath, decoder)
+
+  if sys.platform == "win32":
+    # Windows starts the workers as new processes rather than forking this one
+    multiprocessing.set_executable(getPythonExecutable())
+  print "Scanning the body parts on %s processes" % workers
+  pool = futures.ProcessPoolExecutor(max_workers = workers)
+  try:
+    jobs = []
+    for name, scanName, resolutionIndex in FaceScan.FeatureScans:
+      jobs.append(pool.submit(scanFeature, frontImagePath, sideImagePath, decoder, name, list(resolutionList)))
+
+    scanResult = ScanResult.ScanResult()
+    for i in range(0, len(jobs)):
+      name = FaceScan.FeatureScans[i][0]
+      for group in jobs[i].result():
+        scanResult.addFeature(name, group, len(group))
+      print "Got %s Coord" % name
+  finally:
+    pool.shutdown()
+
+  FaceScan.orderGroups(scanResult)
+  return scanResult
@@ -0,0 +1,196 @@
+'''
+This script splits the arrays of a library mesh into its parts, the same way separating the mesh by its part
+shaders does in Maya. Every connected piece of faces with the same part shader becomes a mesh part of its own
+'''
+import numpy as np
+
+def labelConnectedVertices(vertexCount, EdgeA, EdgeB):
+  """
+  This function labels the vertices that are connected through a list of edges.
+  TubxFaceCore.ImageIndexing.labelComponents uses it to join neighbouring pixels as well
+  Args:
+    vertexCount: The number of vertices
+    EdgeA: The first vertex of each edge
+    EdgeB: The second vertex of each edge
+
+  Returns: The root vertex of every vertex. Connected vertices share the same root
+
+  """
+  # Every vertex starts as its own component. We repeatedly hook the bigger root of each edge onto the smaller one
+  # and then flatten the trees, until both ends of every edge share the same root
+  parent = np.arange(vertexCount)
+  if len(EdgeA) == 0:
+    return parent
+  while True:
+    rootA = parent[EdgeA]
+    rootB = parent[EdgeB]
+    if (rootA == rootB).all():
+      break
+    np.minimum.at(parent, np.maximum(rootA, rootB), np.minimum(rootA, rootB))
+    while True:
+      grandparent = parent[parent]
+      if (grandparent == parent).all():
+        break
+      parent = grandparent
+  return parent
+
+def getCornerFaces(faceCounts):
+  """
+  This function gets the face of every face corner, in the order the corners are listed in the face connects
+  Args:
+    faceCounts: The number of vertices of each face
+
+  Returns: The array of face indices
+
+  """
+  return np.repeat(np.arange(len(faceCounts)), faceCounts)
+
+def getFaceShells(faceCounts, faceConnects, faceParts, vertexCount):
+  """
+  This function splits the faces into shells. A shell is a piece of faces of the same part that are joined
+  through their vertices. The shells are ordered by their part, and within a part by their first face
+  Args:
+    faceCounts: The number of vertices of each face
+    faceConnects: The vertices of every face, one face after another
+    faceParts: The part of each face, -1 for faces that are not in any part
+    vertexCount: The number of vertices of the mesh
+
+  Returns: The shell of each face, -1 for faces that are not in any part, and the part of each shell
+
+  """
+  faceCounts = np.asarray(faceCounts, dtype=np.int64)
+  faceConnects = np.asarray(faceConnects, dtype=np.int64)
+  faceParts = np.asarray(faceParts, dtype=np.int64)
+  faceShells = np.full(len(faceCounts), -1, dtype=np.int32)
+  if len(faceCounts) == 0 or (faceParts < 0).all():
+    return faceShells, np.zeros(0, dtype=np.int32)
+
+  # A vertex that is shared by 2 parts belongs to both, so we give every part its own copy of the vertices
+  cornerFaces = getCornerFaces(faceCounts)
+  cornerParts = faceParts[cornerFaces]
+  cornerNodes = np.maximum(cornerParts, 0) * vertexCount + faceConnects
+
+  # Each corner is joined to the next corner of its face
+  firstCorners = np.r_[0, np.cumsum(faceCounts)[:-1]]
+  nextCorners = np.arange(len(faceConnects)) + 1
+  nextCorners[firstCorners + faceCounts - 1] = firstCorners
+  inPart = cornerParts >= 0
+  roots = labelConnectedVertices((faceParts.max() + 1) * vertexCount, cornerNodes[inPart], cornerNodes[nextCorners][inPart])
+
+  # The shell of a face is the root of its first corner. We number the shells by part and then by first face
+  partFaces = np.flatnonzero(faceParts >= 0)
+  faceRoots = roots[cornerNodes[firstCorners[partFaces]]]
+  shellRoots, firstIndex, inverse = np.unique(faceRoots, return_index=True, return_inverse=True)
+  shellFirstFaces = partFaces[firstIndex]
+  shellParts = faceParts[shellFirstFaces]
+  order = np.lexsort((shellFirstFaces, shellParts))
+  shellNumbers = np.empty(len(order), dtype=np.int32)
+  shellNumbers[order] = np.arange(len(order))
+  faceShells[partFaces] = shellNumbers[inverse]
+  return faceShells, shellParts[order].astype(np.int32)
+
+def getShellNames(shellParts, partNames):
+  """
+  This function names the shells the way seperateMeshParts names the mesh parts, counting from 1 within each part
+  Args:
+    shellParts: The part of each shell
+    partNames: The name of each part
+
+  Returns: The list of "<part>_geo_<number>" names
+
+  """
+  names = []
+  counts = {}
+  for part in shellParts.tolist():
+    counts[part] = counts.get(part, 0) + 1
+    names.append("%s_geo_%s" % (partNames[part], counts[part]))
+  return names
+
+def extractShell(arrays, shell):
+  """
+  This function takes the arrays of one shell out of the arrays of the whole mesh. The vertices and UVs of the
+  shell keep the order they have in the whole mesh
+  Args:
+    arrays: The dictionary of mesh arrays, with the shell of each face in 'faceShells'
+    shell: The index of the shell
+
+  Returns: The dictionary of mesh arrays of the shell, and the whole mesh index of each shell vertex
+
+  """
+  faceCounts = np.asarray(arrays['faceCounts'])
+  faceShells = np.asarray(arrays['faceShells'])
+  inShell = faceShells == shell
+
+  cornerInShell = inShell[getCornerFaces(faceCounts)]
+  vertexIds, localConnects = np.unique(np.asarray(arrays['faceConnects'])[cornerInShell], return_inverse=True)
+
+  uvCounts = np.asarray(arrays['uvCounts'])
+  uvCornerInShell = inShell[getCornerFaces(uvCounts)] if len(uvCounts) == len(faceCounts) else np.zeros(0, dtype=bool)
+  uvIds, localUvIds = np.unique(np.asarray(arrays['uvIds'])[uvCornerInShell], return_inverse=True)
+
+  # The hard edges with both vertices in the shell are moved to the shell vertex indices
+  hardEdges = np.asarray(arrays['hardEdges']).reshape((-1, 2))
+  hardInShell = np.in1d(hardEdges[:, 0], vertexIds) & np.in1d(hardEdges[:, 1], vertexIds)
+  localHardEdges = np.searchsorted(vertexIds, hardEdges[hardInShell])
+
+  shellArrays = {'points': np.asarray(arrays['points'])[vertexIds],
+                 'faceCounts': faceCounts[inShell].astype(np.int32),
+                 'faceConnects': localConnects.astype(np.int32),
+                 'us': np.asarray(arrays['us'])[uvIds],
+                 'vs': np.asarray(arrays['vs'])[uvIds],
+                 'uvCounts': uvCounts[inShell].astype(np.int32) if len(uvCornerInShell) else np.zeros(0, dtype=np.int32),
+                 'uvIds': localUvIds.astype(np.int32),
+                 'hardEdges': localHardEdges.astype(np.int32).reshape((-1, 2))}
+  return shellArrays, vertexIds
+
+def getBorderVertices(faceCounts, faceConnects):
+  """
+  This function finds the border vertices of a mesh from its arrays. Those are the vertices of the edges that only
+  one face uses, the same vertices MeshTopology finds for a mesh in the scene
+  Args:
+    faceCounts: The number of vertices of each face
+    faceConnects: The vertices of every face, one face after another
+
+  Returns: The sorted array of border vertices
+
+  """
+  faceCounts = np.asarray(faceCounts, dtype=np.int64)
+  faceConnects = np.asarray(faceConnects, dtype=np.int64)
+  if len(faceConnects) == 0:
+    return np.zeros(0, dtype=np.int64)
+
+  # Every corner makes an edge with the next corner of its face
+  firstCorners = np.r_[0, np.cumsum(faceCounts)[:-1]]
+  nextCorners = np.arange(len(faceConnects)) + 1
+  nextCorners[firstCorners + faceCounts - 1] = firstCorners
+  edges = np.sort(np.c_[faceConnects, faceConnects[nextCorners]], axis=1)
+  edgeKeys = edges[:, 0] * (faceConnects.max() + 1) + edges[:, 1]
+  keys, firstIndex, faceUses = np.unique(edgeKeys, return_index=True, return_counts=True)
+  return np.unique(edges[firstIndex[faceUses == 1]])
+
+def findVertexShell(arrays, vertices, preferredPart = None):
+  """
+  This function finds the shell that has all the given vertices of the whole mesh
+  Args:
+    arrays: The dictionary of mesh arrays, with the shell of each face in 'faceShells' and the part of each shell in 'shellParts'
+    vertices: The list of vertices of the whole mesh
+    preferredPart: The part to pick if more than one shell has all the vertices
+
+  Returns: The shell and the indices of the vertices within the shell. None if no shell has all the vertices
+
+  """
+  faceConnects = np.asarray(arrays['faceConnects'])
+  cornerShells = np.asarray(arrays['faceShells'])[getCornerFaces(arrays['faceCounts'])]
+  shells = None
+  for vertex in vertices:
+    vertexShells = set(cornerShells[faceConnects == vertex].tolist())
+    vertexShells.discard(-1)
+    shells = vertexShells if shells is None else shells & vertexShells
+  if not shells:
+    return None
+
+  shellParts = np.asarray(arrays['shellParts'])
+  preferred = [shell for shell in sorted(shells) if shellParts[shell] == preferredPart]
+  shell = preferred[0] if preferred else min(shells)
+  vertexIds = np.unique(faceConnects[cornerShells == shell])
+  return shell, np.searchsorted(vertexIds, vertices).tolist()
@@ -0,0 +1,55 @@
+'''
+This script hashes vertex positions into a grid, so vertices at the same place can be found without comparing every pair
+'''
+import math
+
+# Border vertices closer together than this are treated as the same position
+PositionTolerance = 1e-5
+
+def getPositionKey(position):
+  """
+  This function gets the grid cell of a position, with cells the size of the position tolerance
+  Args:
+    position: The [x, y, z] position
+
+  Returns: The (x, y, z) tuple of the cell
+
+  """
+  return tuple(int(math.floor(value / PositionTolerance + 0.5)) for value in position)
+
+def hashPositions(vertices, positions):
+  """
+  This function puts the vertices into the grid cells of their positions
+  Args:
+    vertices: The list of vertices
+    positions: The list of [x, y, z] positions of the vertices
+
+  Returns: The dictionary of vertices and positions, keyed by the grid cell
+
+  """
+  cells = {}
+  for vert, position in zip(vertices, positions):
+    cells.setdefault(getPositionKey(position), []).append([vert, position])
+  return cells
+
+def findMatchingVertex(cells, position):
+  """
+  This function finds a vertex in the grid that is at the same position, within the position tolerance
+  Args:
+    cells: The grid cells from hashPositions
+    position: The [x, y, z] position to look for
+
+  Returns: The matching vertex, or None if there is none
+
+  """
+  # A matching vertex can sit just across a cell border, so we look in the neighbouring cells as well
+  x, y, z = getPositionKey(position)
+  for offsetX in (0, -1, 1):
+    for offsetY in (0, -1, 1):
+      for offsetZ in (0, -1, 1):
+        for vert, otherPosition in cells.get((x + offsetX, y + offsetY, z + offsetZ), []):
+          if (abs(position[0] - otherPosition[0]) <= PositionTolerance and
+              abs(position[1] - otherPosition[1]) <= PositionTolerance and
+              abs(position[2] - otherPosition[2]) <= PositionTolerance):
+            return vert
+  return None
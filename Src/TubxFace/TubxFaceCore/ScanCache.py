@@ -0,0 +1,63 @@
+'''
+This script remembers the traced contours and the 3D coordinates of the images scanned in this session, keyed by
+the hash of the image pixels. Scanning the same sketches again with a different resolution then only resamples
+the contours that were already traced
+'''
+from collections import OrderedDict
+
+# The most images and image pairs we keep. The ones used least recently are forgotten first
+MaxCachedImages = 8
+
+# The full resolution contours of each image, keyed by the image hash and then by the trace settings
+ContourCache = OrderedDict()
+# The 3D coordinates of each front and side image pair, keyed by the image hashes and then by the feature settings
+CoordCache = OrderedDict()
+
+def getEntry(cache, key):
+  """
+  This function gets the entry of an image or image pair, creating it if it does not exist.
+  The entry is moved to the end, so the least recently used entries are the first ones
+  Args:
+    cache: The ContourCache or the CoordCache
+    key: The image hash or the pair of image hashes
+
+  Returns: The dict of cached data of the entry
+
+  """
+  entry = cache.pop(key, None)
+  if entry is None:
+    entry = {}
+  cache[key] = entry
+  while len(cache) > MaxCachedImages:
+    cache.popitem(last = False)
+  return entry
+
+def getContours(imageHash):
+  """
+  Get the cached contours of an image
+  Args:
+    imageHash: The hash of the image pixels
+
+  Returns: The dict of contour lists, keyed by (colour, startCoord, rowDirection, columnDirection)
+
+  """
+  return getEntry(ContourCache, imageHash)
+
+def getCoords(frontHash, sideHash):
+  """
+  Get the cached 3D coordinates of a front and side image pair
+  Args:
+    frontHash: The hash of the front image pixels
+    sideHash: The hash of the side image pixels
+
+  Returns: The dict of 3D coordinate lists, keyed by the feature settings and the number of points
+
+  """
+  return getEntry(CoordCache, (frontHash, sideHash))
+
+def clearScanCache():
+  """
+  This function forgets every cached contour and coordinate
+  """
+  ContourCache.clear()
+  CoordCache.clear()
@@ -0,0 +1,127 @@
+'''
+This script stores the scanned 3D coordinates of the body parts as plain data
+'''
+import numpy as np
+
+# The body parts in the order they are scanned. The scan points of each are named "<part>_Coord<number>"
+FeatureNames = ["Eye", "NoseBridge", "Nose", "Mouth", "MouthLoop", "Eyebrow", "Ear", "SideProfile", "FrontProfile"]
+
+# The size a scan locator reaches out from its position. The locator shape is part of the bounding box of the
+# locator group, so we pad the data by the same amount to scale it the same way
+LocatorSize = 1.0
+
+class ScanResult:
+  """
+  This class stores the scanned 3D coordinates of every body part without creating anything in Maya.
+  Each body part holds a list of point groups, one for each eye, ear, mouth and so on that was scanned
+  """
+  def __init__(self):
+    # The point groups of each body part, keyed by the name of the body part
+    self.features = {}
+
+  def addFeature(self, name, coords, points):
+    """
+    This function splits the scanned coordinates of a body part into its point groups and stores them
+    Args:
+      name: The name of the body part
+      coords: The list of [x, y, z] coordinates
+      points: The number of points in each group
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape((-1, 3))
+    groupCount = len(coords) / points
+    if groupCount * points != len(coords):
+      print "%s has %s points which is not a multiple of %s. The last points are left out" % (name, len(coords), points)
+
+    groups = self.features.setdefault(name, [])
+    for i in range(0, groupCount):
+      groups.append(coords[i * points:(i + 1) * points])
+
+  def getGroups(self, name):
+    """
+    Get the point groups of a body part
+    Args:
+      name: The name of the body part
+
+    Returns: The list of (points, 3) arrays, empty if the body part was not scanned
+
+    """
+    return self.features.get(name, [])
+
+  def getPoints(self, name):
+    """
+    Get all the points of a body part in one array
+    Args:
+      name: The name of the body part
+
+    Returns: The (N, 3) array of points
+
+    """
+    groups = self.getGroups(name)
+    if not groups:
+      return np.zeros((0, 3))
+    return np.concatenate(groups)
+
+  def getAllPoints(self):
+    """
+    Get the points of every body part in one array, in the order the body parts are scanned
+
+    Returns: The (N, 3) array of points
+
+    """
+    allPoints = [self.getPoints(name) for name in FeatureNames]
+    return np.concatenate(allPoints)
+
+  def reverseGroups(self, name, points):
+    """
+    This function reverses the order of the points of a body part, a number of points at a time, so that
+    the body parts run from right to left like the mesh curves in Maya. Points that do not fill a whole group are left out
+    Args:
+      name: The name of the body part
+      points: The number of points to move together
+    """
+    allPoints = self.getPoints(name)
+    if len(allPoints) <= points:
+      return
+
+    # We keep the original group size so the body part splits up the same way afterwards
+    groupSize = len(self.getGroups(name)[0])
+    chunkCount = len(allPoints) / points
+    chunks = [allPoints[i * points:(i + 1) * points] for i in range(chunkCount - 1, -1, -1)]
+    self.features[name] = []
+    self.addFeature(name, np.concatenate(chunks), groupSize)
+
+  def getBoundingBox(self):
+    """
+    Get the bounding box of the scan points, including the size of the locators that would show them
+
+    Returns: The bounding box as [minX, minY, minZ, maxX, maxY, maxZ]
+
+    """
+    allPoints = self.getAllPoints()
+    lowest = allPoints.min(axis=0) - LocatorSize
+    highest = allPoints.max(axis=0) + LocatorSize
+    return lowest.tolist() + highest.tolist()
+
+  def scaleToUnitVolume(self):
+    """
+    The function scales the points to fit within a 1x1x1 volume, the same way ImageScan.scaleToUnitVolume
+    scales the locator group about the origin
+
+    Returns: The scale factor, or None if the scan is not 3D
+
+    """
+    if len(self.getAllPoints()) == 0:
+      print "There are no scan points to scale"
+      return
+
+    BoundingBox = self.getBoundingBox()
+    lengths = [BoundingBox[3] - BoundingBox[0], BoundingBox[4] - BoundingBox[1], BoundingBox[5] - BoundingBox[2]]
+    if 0 in lengths:
+      print "Division by zero. The scanned image is not 3D"
+      return
+
+    # Next we need to find the longest length and scale in down such that the longest length fits within the unit Cube
+    scaleFactor = 1.0 / max(lengths)
+    for name in self.features:
+      self.features[name] = [group * scaleFactor for group in self.features[name]]
+    return scaleFactor
@@ -0,0 +1,5 @@
+'''
+TubxFaceCore
+  The image reading, scanning and fitting math of TubxFace. Nothing in this package imports Maya,
+  so it can run and be benchmarked on plain Python with NumPy. The Maya side of the tool builds on it
+'''
@@ -12,6 +12,10 @@ import DeformLibrary
 reload(DeformLibrary)
 import CreateRelationships
 reload(CreateRelationships)
+import LibraryThumbnails
+reload(LibraryThumbnails)
+import RigTemplate
+reload(RigTemplate)
 
 from maya import cmds
 from functools import partial
@@ -38,6 +42,14 @@ class TubxFaceUI(QtGui.QDialog):
     self.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
     #Create the file import export class
     self.Tubxlibrary = ExportingData.TubxLibrary()
+    #The screenshots are loaded on their own thread pool, so the dialog opens before they are read
+    self.thumbnailPool = QtCore.QThreadPool()
+    #The library items whose screenshots have not been requested yet, keyed by the library name
+    self.pendingIcons = {}
+    #The loaders started for the current list, so they can be cancelled if the list is filled again
+    self.thumbnailLoaders = []
+    #Each populateUI is a new generation, so thumbnails of an older list are ignored
+    self.iconGeneration = 0
     #Build the UI
     self.buildUI()
     #Populate the library
@@ -71,6 +83,35 @@ class TubxFaceUI(QtGui.QDialog):
     self.deformLibraryTabWidget = QtGui.QWidget()
     TabLayoutWidget.addTab(self.deformLibraryTabWidget, "Deform Section")
     self.deformLibraryUI()
+    #The library list is only seen once its tab is opened, so that is when its screenshots are needed
+    TabLayoutWidget.currentChanged.connect(self.loadVisibleIcons)
+
+  def showEvent(self, event):
+    """
+    This function loads the screenshots in view once the dialog is shown
+    Args:
+      event: The QShowEvent
+    """
+    super(TubxFaceUI, self).showEvent(event)
+    self.loadVisibleIcons()
+
+  def resizeEvent(self, event):
+    """
+    This function loads the screenshots that come into view when the dialog is resized
+    Args:
+      event: The QResizeEvent
+    """
+    super(TubxFaceUI, self).resizeEvent(event)
+    self.loadVisibleIcons()
+
+  def closeEvent(self, event):
+    """
+    This function deletes the rig templates of this session when the dialog is closed
+    Args:
+      event: The QCloseEvent
+    """
+    RigTemplate.clearTemplates()
+    super(TubxFaceUI, self).closeEvent(event)
 
   def populateUI(self):
     """
@@ -78,18 +119,59 @@ class TubxFaceUI(QtGui.QDialog):
     """
     #Clear list widget content
     self.listScreenshotWidget.clear()
+    #Screenshots that were requested for the old list but have not started loading are dropped
+    for loader in self.thumbnailLoaders:
+      loader.cancelled = True
+    self.thumbnailLoaders = []
+    self.pendingIcons = {}
+    self.iconGeneration += 1
 
     self.Tubxlibrary.find()
 
+    #We only add the names here. The icons are loaded once their items scroll into view
     for name, info in self.Tubxlibrary.items():
       TubxGeo = QtGui.QListWidgetItem(name)
       self.listScreenshotWidget.addItem(TubxGeo)
 
       screenshot = info.get('screenshot')
       if screenshot:
-        """!"""
-        icon = QtGui.QIcon(screenshot)
-        TubxGeo.setIcon(icon)
+        self.pendingIcons[name] = (TubxGeo, screenshot)
+
+    self.loadVisibleIcons()
+
+  def loadVisibleIcons(self, *args):
+    """
+    This function starts loading the screenshots of the library items that are in view
+    Args:
+      *args: The values of the signals that call this function, which are not needed
+    """
+    if not self.pendingIcons:
+      return
+    viewRect = self.listScreenshotWidget.viewport().rect()
+    for name in self.pendingIcons.keys():
+      TubxGeo, screenshot = self.pendingIcons[name]
+      if not self.listScreenshotWidget.visualItemRect(TubxGeo).intersects(viewRect):
+        continue
+      del self.pendingIcons[name]
+      loader = LibraryThumbnails.ThumbnailLoader(self.iconGeneration, name, screenshot)
+      loader.signals.loaded.connect(self.setLibraryIcon)
+      self.thumbnailLoaders.append(loader)
+      self.thumbnailPool.start(loader)
+
+  def setLibraryIcon(self, generation, name, image):
+    """
+    This function sets the icon of a library item once its thumbnail has loaded
+    Args:
+      generation: The generation of the library list the thumbnail was loaded for
+      name: The name of the library mesh
+      image: The QImage of the thumbnail
+    """
+    if generation != self.iconGeneration:
+      return
+    items = self.listScreenshotWidget.findItems(name, QtCore.Qt.MatchExactly)
+    if items:
+      """!"""
+      items[0].setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
 
   def createLibraryUI(self):
     """
@@ -185,6 +267,10 @@ class TubxFaceUI(QtGui.QDialog):
     self.listScreenshotWidget.setResizeMode(QtGui.QListWidget.Adjust)
     self.listScreenshotWidget.setGridSize(QtCore.QSize(screenShotSize+buffersize, screenShotSize+buffersize))
     layout.addWidget(self.listScreenshotWidget)
+    #Scrolling or resizing the list brings other items into view, so we load their screenshots then
+    self.listScreenshotWidget.verticalScrollBar().valueChanged.connect(self.loadVisibleIcons)
+    self.listScreenshotWidget.horizontalScrollBar().valueChanged.connect(self.loadVisibleIcons)
+    self.listScreenshotWidget.verticalScrollBar().rangeChanged.connect(self.loadVisibleIcons)
 
     #Add a refresh button to refresh the listScreenshotWidget
     refreshButton = QtGui.QPushButton("Refresh")
@@ -502,12 +588,7 @@ class TubxFaceUI(QtGui.QDialog):
     if not currentTubxItem or not currentFrontImage or not currentSideImage:
       return
 
-    #We first load the geometry back in with the shaders
     self.mesh = currentTubxItem.text()
-    self.Tubxlibrary.load(self.mesh)
-
-    #We then recreate shaders in the case where shaders was missing from the import. This is to prevent valueError
-    LibraryGeneration.createShaders()
 
     #We get the list for resolution
     eyeRes = self.eyeResolutionWidget.value()
@@ -519,19 +600,45 @@ class TubxFaceUI(QtGui.QDialog):
 
     self.ResolutionList = [eyeRes,mouthRes,mouthLoopRes,noseRes,eyebrowRes,noseBridgeRes]
 
-    #We then separate the head out and create the controls and relationships
-    self.relationshipList, self.Objects = LibraryGeneration.createMeshAndControl(self.mesh, self.ResolutionList)
+    #If the head was already rigged this session with the same library mesh and resolution, we import that rig again
+    rig = RigTemplate.loadTemplate(self.Tubxlibrary, self.mesh, self.ResolutionList)
+    if rig is not None:
+      self.relationshipList, self.Objects = rig
+    else:
+      sceneRoots = RigTemplate.getSceneRoots()
 
-    #We now get the additional data from the json file and create the extra controls
-    dataGrp = self.Tubxlibrary.loadExtraData(self.mesh)
-    LibraryGeneration.createDataMeshAndControl(dataGrp)
+      #We first load the geometry back in with the shaders
+      #If the parts and relationships were saved with the library mesh, only the parts are created
+      parts = self.Tubxlibrary.load(self.mesh, parts = True)
 
-    #Now we load the image data and convert it into 3D coordinates
-    MyImage = ScanningImage.ImageScan(currentFrontImage, currentSideImage)
-    self.LocatorGrp = MyImage.generateCoord(self.ResolutionList)
+      #We then recreate shaders in the case where shaders was missing from the import. This is to prevent valueError
+      LibraryGeneration.createShaders()
+
+      #We then separate the head out and create the controls and relationships
+      if parts is None:
+        self.relationshipList, self.Objects = LibraryGeneration.createMeshAndControl(self.mesh, self.ResolutionList)
+        #We now get the additional data from the json file
+        dataGrp = self.Tubxlibrary.loadExtraData(self.mesh)
+      else:
+        Objects, relationshipList, dataGrp = parts
+        self.relationshipList, self.Objects = LibraryGeneration.createMeshAndControl(self.mesh, self.ResolutionList, (Objects, relationshipList))
+
+      #We create the extra controls from the additional data
+      LibraryGeneration.createDataMeshAndControl(dataGrp)
+
+      #We keep the rig as a template for the next sketches
+      RigTemplate.saveTemplate(self.Tubxlibrary, self.mesh, self.ResolutionList, sceneRoots, self.Objects, self.relationshipList)
 
     #We then check if the checkbox of whether the user wants to take a look at the scan is checked
     CheckScan = self.checkBeforeCleanUp.checkState()
+
+    #Now we load the image data and convert it into 3D coordinates
+    #The locators are only created if the user wants to look at the scan. Otherwise we deform straight from the scanned data
+    MyImage = ScanningImage.ImageScan(currentFrontImage, currentSideImage)
+    if CheckScan:
+      self.LocatorGrp = MyImage.generateCoord(self.ResolutionList)
+    else:
+      self.LocatorGrp = MyImage.generateCoord(self.ResolutionList, createLocators = 0)
     if not CheckScan:
       #This means the user do not want to check
       self.deformGeometry()